@@ -0,0 +1,157 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Batch mode : add the tabs to STL / 3MF files without Cura
+#
+# Same placement and tab meshes as the automatic addition of the tool. The tabs are written
+# as support mesh objects in a 3MF file, the files are processed in a process pool.
+# Run from the plugin folder :
+#     python -m TabCore.TabBatch part1.stl plate.3mf --size 8 --capsule --jobs 4
+#--------------------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import time
+
+import numpy
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from . import TabFiles, TabMesh, TabPlacement
+
+# Files are Z up, the placement works in the Cura space (Y up) : (x, y, z) -> (x, z, -y)
+FILE_TO_CURA = numpy.array([[1, 0, 0, 0],
+                            [0, 0, 1, 0],
+                            [0, -1, 0, 0],
+                            [0, 0, 0, 1]], dtype=numpy.float64)
+
+
+def tabMesh(options: argparse.Namespace) -> TabMesh.MeshArrays:
+    """ Tab mesh of the options, bottom at the origin (Cura space) """
+    height = (options.layer_height_0 * 1.2) + (options.layer_height * (options.nb_layer - 1))
+    line_width = options.line_width * 1.2
+    diameter = options.size + (height * 6 if options.capsule else 0)
+    segments = TabMesh.segmentCount(diameter, line_width * 0.1, 12, 120)
+    if options.capsule:
+        return TabMesh.capsuleMesh(options.size, segments, 0, height, line_width, options.nb_layer)
+    return TabMesh.pastilleMesh(options.size, segments, 0, height)
+
+
+def tabSettings(options: argparse.Namespace) -> List[Tuple[str, str]]:
+    """ Cura per object settings of the tab objects, as set by the tool """
+    return [("support_mesh", "True"), ("support_mesh_drop_down", "False"), ("support_xy_distance", str(options.offset))]
+
+
+def processFile(path: str, options: argparse.Namespace) -> Tuple[str, str, int, int]:
+    """ Add the tabs to one file.
+
+    param path: STL or 3MF file.
+    param options: command line options.
+    return: (source, output, number of objects, number of tabs)
+    """
+    objects = TabFiles.readModel(path)
+    vertices, _, indices = tabMesh(options)
+    spacing = options.size * 0.7
+    tab_index = TabPlacement.TabSpatialIndex(options.min_distance if options.min_distance > 0 else spacing)
+
+    # Support meshes already in the file (tabs of a previous run ...) : a merged support mesh holds
+    # several tabs, the points of its outline are indexed instead of its centre
+    for model_object in objects:
+        if model_object.isSupportMesh():
+            for x, y in numpy.unique(numpy.round(model_object.vertices[:, :2], 1), axis=0).tolist():
+                tab_index.insert(x, -y)
+
+    tabs = []
+    parts = []
+    nb_tabs = 0
+    for model_object in objects:
+        if model_object.isSupportMesh():
+            continue
+        if options.footprint:
+            positions = TabPlacement.footprintTabPositions(model_object.vertices, None, FILE_TO_CURA, spacing)
+        else:
+            positions = TabPlacement.meshTabPositions(model_object.vertices, FILE_TO_CURA, 0.0, spacing)
+        positions = tab_index.filterPositions(positions)
+        nb_tabs += len(positions)
+        # Tabs on the bottom of the object
+        bottom = model_object.vertices[:, 2].min()
+        object_tabs = []
+        for x, z in positions:
+            # Back to the file space : (x, y, z) -> (x, -z, y)
+            tab = numpy.empty_like(vertices, dtype=numpy.float64)
+            tab[:, 0] = vertices[:, 0] + x
+            tab[:, 1] = -(vertices[:, 2] + z)
+            tab[:, 2] = vertices[:, 1] + bottom
+            object_tabs.append((tab, vertices, indices))
+        if options.merged and object_tabs:
+            merged_vertices, _, merged_indices = TabMesh.mergeMeshes(object_tabs)
+            tabs.append((merged_vertices, merged_indices))
+        else:
+            tabs += [(tab, tab_indices) for tab, _, tab_indices in object_tabs]
+        parts.append(model_object)
+
+    output = os.path.join(options.output or os.path.dirname(os.path.abspath(path)),
+                          os.path.splitext(os.path.basename(path))[0] + options.suffix + ".3mf")
+    TabFiles.write3mf(output, path, parts, tabs, tabSettings(options))
+    return path, output, len(objects), nb_tabs
+
+
+def parseArguments(arguments: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog = "python -m TabCore.TabBatch",
+                                     description = "Add anti warping tabs to STL / 3MF files, written as Cura support meshes in 3MF files.")
+    parser.add_argument("files", nargs = "+", help = "STL or 3MF files")
+    parser.add_argument("--size", type = float, default = 10.0, help = "tab diameter in mm (default 10)")
+    parser.add_argument("--offset", type = float, default = 0.16, help = "X/Y distance of the tabs in mm (default 0.16)")
+    parser.add_argument("--capsule", action = "store_true", help = "capsule tabs instead of cylinders")
+    parser.add_argument("--nb-layer", type = int, default = 1, help = "number of layers of the tabs (default 1)")
+    parser.add_argument("--layer-height-0", type = float, default = 0.2, help = "initial layer height in mm (default 0.2)")
+    parser.add_argument("--layer-height", type = float, default = 0.2, help = "layer height in mm (default 0.2)")
+    parser.add_argument("--line-width", type = float, default = 0.4, help = "line width in mm (default 0.4)")
+    parser.add_argument("--footprint", action = "store_true", help = "place the tabs on the first layer outline instead of the convex hull")
+    parser.add_argument("--min-distance", type = float, default = 0.0, help = "minimum distance between two tabs in mm (default size x 0.7)")
+    parser.add_argument("--merged", action = "store_true", help = "one support mesh with all the tabs of an object")
+    parser.add_argument("--output", default = None, help = "output folder (default folder of the source)")
+    parser.add_argument("--suffix", default = "_tabs", help = "suffix of the output files (default _tabs)")
+    parser.add_argument("--jobs", type = int, default = os.cpu_count() or 1, help = "number of processes")
+    options = parser.parse_args(arguments)
+    if options.size <= 0 or options.nb_layer < 1:
+        parser.error("size must be > 0 and nb-layer >= 1")
+    return options
+
+
+def main(arguments: List[str] = None) -> int:
+    options = parseArguments(sys.argv[1:] if arguments is None else arguments)
+    if options.output:
+        os.makedirs(options.output, exist_ok = True)
+
+    start_time = time.perf_counter()
+    errors = 0
+    if options.jobs > 1 and len(options.files) > 1:
+        with ProcessPoolExecutor(max_workers = options.jobs) as pool:
+            futures = [(path, pool.submit(processFile, path, options)) for path in options.files]
+            results = []
+            for path, future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    errors += 1
+                    print("{} : {}".format(path, e), file = sys.stderr)
+    else:
+        results = []
+        for path in options.files:
+            try:
+                results.append(processFile(path, options))
+            except Exception as e:
+                errors += 1
+                print("{} : {}".format(path, e), file = sys.stderr)
+
+    for path, output, nb_objects, nb_tabs in results:
+        print("{} : {} objects, {} tabs -> {}".format(path, nb_objects, nb_tabs, output))
+    print("{} files in {:.2f} s".format(len(results), time.perf_counter() - start_time))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
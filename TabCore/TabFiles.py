@@ -0,0 +1,236 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# STL / 3MF files for the batch mode
+#
+# Meshes are read as triangle soups in the coordinates of the file (Z up, millimeters).
+# The tabs are written in a 3MF file as extra objects with the Cura per object settings
+# of a support mesh, like the tabs created in Cura.
+#--------------------------------------------------------------------------------------------
+
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy
+
+from typing import List, Optional, Tuple
+
+CORE_NAMESPACE = "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"
+CURA_NAMESPACE = "http://software.ultimaker.com/xml/cura/3mf/2015/10"
+MODEL_PATH = "3D/3dmodel.model"
+
+_UNITS = {"micron": 0.001, "millimeter": 1.0, "centimeter": 10.0, "inch": 25.4, "foot": 304.8, "meter": 1000.0}
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml" />
+<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml" />
+</Types>
+"""
+
+_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel" />
+</Relationships>
+"""
+
+
+class ModelObject:
+    """ Mesh of a part of a file : triangle soup in millimeters, Z up """
+
+    def __init__(self, name: str, vertices: numpy.ndarray, settings: Optional[dict] = None) -> None:
+        self.name = name
+        self.vertices = vertices
+        # Cura per object settings (3MF metadata "cura:<key>")
+        self.settings = settings or {}
+
+    def isSupportMesh(self) -> bool:
+        return str(self.settings.get("support_mesh", "")).lower() == "true"
+
+
+def _tag(name: str) -> str:
+    return "{%s}%s" % (CORE_NAMESPACE, name)
+
+
+def _readAsciiStl(data: bytes) -> numpy.ndarray:
+    """ Vertices of the facets of an ASCII STL, (n, 3) """
+    text = data.decode("ascii", errors="ignore")
+    values = re.findall(r"vertex\s+(\S+)\s+(\S+)\s+(\S+)", text)
+    vertices = numpy.array(values, dtype=numpy.float64).reshape(-1, 3)
+    return vertices[:len(vertices) - len(vertices) % 3]
+
+
+def readStl(path: str) -> List[ModelObject]:
+    """ Binary or ASCII STL file.
+
+    An ASCII file starts with "solid". A binary file has the number of facets after its
+    header of 80 bytes, the header can start with "solid" too and the file can have extra
+    bytes after the facets.
+
+    param path: file path.
+    return: one ModelObject
+    """
+    with open(path, "rb") as stream:
+        data = stream.read()
+    name = re.sub(r"\.stl$", "", path.replace("\\", "/").split("/")[-1], flags = re.IGNORECASE)
+
+    count = int(numpy.frombuffer(data, dtype="<u4", count=1, offset=80)[0]) if len(data) >= 84 else -1
+    binary = count >= 0 and len(data) >= 84 + count * 50
+    if data.lstrip()[:5].lower() == b"solid":
+        vertices = _readAsciiStl(data)
+        if len(vertices) or (not binary and b"endsolid" in data.lower()):
+            return [ModelObject(name, vertices)]
+    if binary:
+        record = numpy.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+        facets = numpy.frombuffer(data, dtype=record, count=count, offset=84)
+        return [ModelObject(name, facets["vertices"].reshape(-1, 3).astype(numpy.float64))]
+    raise ValueError("{} is neither a binary nor an ASCII STL file".format(path))
+
+
+def _itemMatrix(transform: Optional[str]) -> numpy.ndarray:
+    """ 4x4 matrix (column vectors) of a 3MF transform attribute """
+    matrix = numpy.identity(4)
+    if transform:
+        values = numpy.array(transform.split(), dtype=numpy.float64).reshape(4, 3)
+        matrix[:3, :3] = values[:3].T
+        matrix[:3, 3] = values[3]
+    return matrix
+
+
+def _objectSettings(element: ET.Element) -> dict:
+    settings = {}
+    group = element.find(_tag("metadatagroup"))
+    if group is not None:
+        for metadata in group.iter(_tag("metadata")):
+            name = metadata.get("name", "")
+            if name.startswith("cura:"):
+                settings[name[5:]] = metadata.text
+    return settings
+
+
+def _objectMeshes(objects: dict, object_id: str, matrix: numpy.ndarray) -> List[numpy.ndarray]:
+    """ Transformed triangle soups of an object and of its components """
+    element = objects[object_id]
+    meshes = []
+    mesh = element.find(_tag("mesh"))
+    if mesh is not None:
+        vertices = numpy.array([[float(v.get("x")), float(v.get("y")), float(v.get("z"))]
+                                for v in mesh.find(_tag("vertices")).iter(_tag("vertex"))])
+        triangles = numpy.array([[int(t.get("v1")), int(t.get("v2")), int(t.get("v3"))]
+                                 for t in mesh.find(_tag("triangles")).iter(_tag("triangle"))], dtype=numpy.int64)
+        if len(vertices) and len(triangles):
+            soup = vertices[triangles.reshape(-1)]
+            meshes.append(soup.dot(matrix[:3, :3].T) + matrix[:3, 3])
+    components = element.find(_tag("components"))
+    if components is not None:
+        for component in components.iter(_tag("component")):
+            meshes += _objectMeshes(objects, component.get("objectid"), matrix.dot(_itemMatrix(component.get("transform"))))
+    return meshes
+
+
+def read3mf(path: str) -> List[ModelObject]:
+    """ Build items of a 3MF file, in the coordinates of the build.
+
+    param path: file path.
+    return: one ModelObject per build item
+    """
+    with zipfile.ZipFile(path) as archive:
+        root = ET.fromstring(archive.read(MODEL_PATH))
+    scale = _UNITS.get(root.get("unit", "millimeter"), 1.0)
+    objects = {element.get("id"): element for element in root.find(_tag("resources")).iter(_tag("object"))}
+
+    result = []
+    for item in root.find(_tag("build")).iter(_tag("item")):
+        object_id = item.get("objectid")
+        meshes = _objectMeshes(objects, object_id, _itemMatrix(item.get("transform")))
+        if meshes:
+            name = objects[object_id].get("name") or "Object {}".format(object_id)
+            result.append(ModelObject(name, numpy.concatenate(meshes) * scale, _objectSettings(objects[object_id])))
+    return result
+
+
+def readModel(path: str) -> List[ModelObject]:
+    if path.lower().endswith(".3mf"):
+        return read3mf(path)
+    return readStl(path)
+
+
+def _registerNamespaces(data: bytes) -> None:
+    """ Keep the prefixes of the source file when the model is written again """
+    ET.register_namespace("", CORE_NAMESPACE)
+    ET.register_namespace("cura", CURA_NAMESPACE)
+    for _, (prefix, uri) in ET.iterparse(io.BytesIO(data), events=("start-ns",)):
+        if prefix:
+            ET.register_namespace(prefix, uri)
+
+
+def _addMeshObject(resources: ET.Element, object_id: int, name: str, vertices: numpy.ndarray,
+                   indices: numpy.ndarray, settings: List[Tuple[str, str]]) -> None:
+    element = ET.SubElement(resources, _tag("object"), {"id": str(object_id), "name": name, "type": "model"})
+    if settings:
+        group = ET.SubElement(element, _tag("metadatagroup"))
+        for key, value in settings:
+            metadata = ET.SubElement(group, _tag("metadata"), {"name": "cura:" + key, "preserve": "true"})
+            metadata.text = value
+    mesh = ET.SubElement(element, _tag("mesh"))
+    vertices_element = ET.SubElement(mesh, _tag("vertices"))
+    for x, y, z in vertices.tolist():
+        ET.SubElement(vertices_element, _tag("vertex"), {"x": "%.4f" % x, "y": "%.4f" % y, "z": "%.4f" % z})
+    triangles_element = ET.SubElement(mesh, _tag("triangles"))
+    for v1, v2, v3 in indices.tolist():
+        ET.SubElement(triangles_element, _tag("triangle"), {"v1": str(v1), "v2": str(v2), "v3": str(v3)})
+
+
+def write3mf(path: str, source: str, objects: List[ModelObject], tabs: List[Tuple[numpy.ndarray, numpy.ndarray]],
+             settings: List[Tuple[str, str]]) -> None:
+    """ Write the tabs in a 3MF file.
+
+    A 3MF source is copied with the tabs added to its model, the objects of an STL source
+    are written in a new 3MF file.
+
+    param path: output file.
+    param source: source file.
+    param objects: objects read from the source.
+    param tabs: (vertices, indices) of the tabs, in the coordinates of the file.
+    param settings: Cura settings of the tab objects as (key, value).
+    """
+    entries = {}
+    if source.lower().endswith(".3mf"):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                entries[info.filename] = archive.read(info.filename)
+        _registerNamespaces(entries[MODEL_PATH])
+        root = ET.fromstring(entries[MODEL_PATH])
+        # The tabs are in millimeters
+        scale = _UNITS.get(root.get("unit", "millimeter"), 1.0)
+        resources = root.find(_tag("resources"))
+        build = root.find(_tag("build"))
+        ids = [int(element.get("id")) for element in resources if element.get("id", "").isdigit()]
+        next_id = max(ids, default=0) + 1
+    else:
+        _registerNamespaces(b"<model/>")
+        entries["[Content_Types].xml"] = _CONTENT_TYPES.encode("utf-8")
+        entries["_rels/.rels"] = _RELS.encode("utf-8")
+        scale = 1.0
+        root = ET.Element(_tag("model"), {"unit": "millimeter", "{http://www.w3.org/XML/1998/namespace}lang": "en-US"})
+        resources = ET.SubElement(root, _tag("resources"))
+        build = ET.SubElement(root, _tag("build"))
+        next_id = 1
+        for model_object in objects:
+            # Triangle soup, the vertices are not merged
+            indices = numpy.arange(len(model_object.vertices)).reshape(-1, 3)
+            _addMeshObject(resources, next_id, model_object.name, model_object.vertices, indices, [])
+            ET.SubElement(build, _tag("item"), {"objectid": str(next_id)})
+            next_id += 1
+
+    for number, (vertices, indices) in enumerate(tabs):
+        _addMeshObject(resources, next_id, "RoundTab {}".format(number + 1), vertices / scale, indices, settings)
+        ET.SubElement(build, _tag("item"), {"objectid": str(next_id)})
+        next_id += 1
+
+    entries[MODEL_PATH] = ET.tostring(root, encoding="utf-8", xml_declaration=True)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
@@ -0,0 +1,257 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# First layer footprint of a mesh
+#
+# The triangles are cut by a horizontal plane just above the bottom of the mesh, the cut
+# segments are chained in closed loops and the outer loops give the real contact outline
+# of the object on the build plate (Y is the vertical axis as in Cura).
+#--------------------------------------------------------------------------------------------
+
+import numpy
+
+from typing import List, Optional
+
+# Height of the cut plane above the bottom of the mesh in mm
+DEFAULT_TOLERANCE = 0.05
+
+# Endpoints closer than this distance are merged when the segments are chained
+_MERGE_DISTANCE = 1e-4
+
+# Loops with a smaller area (mm²) are ignored
+_MIN_AREA = 0.01
+
+
+def sliceSegments(vertices: numpy.ndarray, indices: Optional[numpy.ndarray], matrix: numpy.ndarray,
+                  tolerance: float = DEFAULT_TOLERANCE) -> numpy.ndarray:
+    """ Segments of the cut of a mesh by the plane Y = bottom + tolerance.
+
+    Only the Y coordinate of the vertices is transformed for all the vertices, the full
+    transformation is applied to the vertices of the cut triangles.
+
+    param vertices: (n, 3) vertices in the local space of the node.
+    param indices: (t, 3) triangles, None if the vertices are a triangle soup.
+    param matrix: 4x4 world transformation of the node.
+    param tolerance: height of the cut above the bottom of the mesh.
+    return: (m, 2, 2) X / Z segments
+    """
+    if vertices is None or len(vertices) == 0:
+        return numpy.zeros((0, 2, 2))
+    matrix = numpy.asarray(matrix, dtype=numpy.float64)
+    if indices is None:
+        indices = numpy.arange(len(vertices) - len(vertices) % 3).reshape(-1, 3)
+
+    height = vertices.dot(matrix[1, :3]) + matrix[1, 3]
+    plane = height.min() + tolerance
+    above = height > plane
+
+    # Triangles with vertices on both sides of the plane
+    tri_above = above[indices]
+    count = tri_above.sum(axis=1)
+    cut = (count == 1) | (count == 2)
+    indices = indices[cut]
+    tri_above = tri_above[cut]
+    if indices.shape[0] == 0:
+        return numpy.zeros((0, 2, 2))
+
+    tri_height = height[indices]
+    tri_xz = vertices[indices].dot(matrix[[0, 2], :3].T) + matrix[[0, 2], 3]
+
+    # Every cut triangle has 2 edges crossing the plane
+    points = []
+    crossing = []
+    for a, b in ((0, 1), (1, 2), (2, 0)):
+        ha, hb = tri_height[:, a], tri_height[:, b]
+        # Edges without crossing give nan points, they are not selected
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            t = (plane - ha) / (hb - ha)
+            points.append(tri_xz[:, a] + (tri_xz[:, b] - tri_xz[:, a]) * t[:, None])
+        crossing.append(tri_above[:, a] != tri_above[:, b])
+    points = numpy.stack(points, axis=1)
+    crossing = numpy.stack(crossing, axis=1)
+
+    # Index of the two crossing edges of every triangle
+    edges = numpy.argsort(~crossing, axis=1, kind="stable")[:, :2]
+    rows = numpy.arange(points.shape[0])[:, None]
+    return points[rows, edges]
+
+
+def _mergePoints(points: numpy.ndarray) -> tuple:
+    """ Merge the points closer than _MERGE_DISTANCE.
+
+    param points: (n, 2) points.
+    return: ((p, 2) coordinates of the first point of every group, (n) index of the group of the points)
+    """
+    keys = numpy.round(points / _MERGE_DISTANCE).astype(numpy.int64)
+    # Stable sort : the first point of a group is the first in the array
+    order = numpy.lexsort((keys[:, 1], keys[:, 0]))
+    keys = keys[order]
+    new_group = numpy.ones(order.size, dtype=bool)
+    new_group[1:] = (keys[1:] != keys[:-1]).any(axis=1)
+    point_id = numpy.empty(order.size, dtype=numpy.int64)
+    point_id[order] = numpy.cumsum(new_group) - 1
+    return points[order[new_group]], point_id
+
+
+def _walkLoops(point_id: numpy.ndarray, coords: numpy.ndarray) -> List[tuple]:
+    """ Loops of the segments by a walk from point to point, for the points without
+    exactly two neighbours (open chains, edges shared by more than 2 triangles).
+
+    param point_id: (m, 2) segments as point indices.
+    param coords: point coordinates.
+    return: list of (start point, (k, 2) loop)
+    """
+    neighbours = {}
+    for a, b in point_id.tolist():
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+
+    loops = []
+    visited = set()
+    for start in neighbours:
+        if start in visited:
+            continue
+        loop = [start]
+        visited.add(start)
+        previous, current = None, start
+        closed = False
+        while True:
+            following = [p for p in neighbours[current] if p != previous]
+            if len(loop) > 2 and start in following:
+                closed = True
+                break
+            following = [p for p in following if p not in visited]
+            if not following:
+                break
+            previous, current = current, following[0]
+            visited.add(current)
+            loop.append(current)
+        if closed:
+            loops.append((start, coords[loop]))
+    return loops
+
+
+def chainSegments(segments: numpy.ndarray) -> List[numpy.ndarray]:
+    """ Chain segments in closed loops.
+
+    The segments are half-edges (a -> b and b -> a) and the next half-edge of a -> b is
+    the other half-edge leaving b : the loops of the points with two neighbours are the
+    cycles of this permutation, found with pointer jumping (log2 of the loop size numpy
+    steps). The other points are chained by a walk (open meshes, non manifold edges).
+    A loop starts on the first point of its first segment, towards the other point.
+
+    param segments: (m, 2, 2) segments.
+    return: list of (k, 2) loops, the open chains are dropped
+    """
+    if segments.shape[0] == 0:
+        return []
+    coords, point_id = _mergePoints(segments.reshape(-1, 2))
+    point_id = point_id.reshape(-1, 2)
+    # Degenerated segments
+    point_id = point_id[point_id[:, 0] != point_id[:, 1]]
+    if point_id.shape[0] == 0:
+        return []
+
+    # Half-edge 2 * i is a -> b of the segment i, 2 * i + 1 is b -> a
+    source = point_id.reshape(-1)
+    target = point_id[:, ::-1].reshape(-1)
+    nb_half = source.size
+    nb_points = coords.shape[0]
+
+    # First two half-edges leaving every point (the points of degenerated segments have none)
+    out = numpy.argsort(source, kind="stable")
+    degree = numpy.bincount(source, minlength=nb_points)
+    first_out = numpy.cumsum(degree) - degree
+    out0, out1 = out[numpy.minimum(first_out, nb_half - 1)], out[numpy.minimum(first_out + 1, nb_half - 1)]
+    regular = (degree == 2) & (target[out0] != target[out1])
+
+    # Next half-edge, a half-edge ending on an other point is its own next (end of chain)
+    half = numpy.arange(nb_half)
+    after0, after1 = out0[target], out1[target]
+    following = numpy.where(target[after0] != source, after0, after1)
+    following = numpy.where(regular[target], following, half)
+    end = following == half
+
+    # Smallest half-edge of the cycle of every half-edge, and the half-edges of a chain with an end
+    label = half.copy()
+    open_chain = end.copy()
+    jump = following.copy()
+    steps = 1
+    while steps < nb_half:
+        label = numpy.minimum(label, label[jump])
+        open_chain |= open_chain[jump]
+        jump = jump[jump]
+        steps *= 2
+
+    # One cycle per loop : the one of the half-edge a -> b of its first segment
+    in_loop = ~open_chain & (label % 2 == 0)
+    loops = []
+    cycle = numpy.flatnonzero(in_loop)
+    if cycle.size:
+        # Position in the cycle : distance to the half-edge before the first one
+        last = in_loop & (following == label)
+        distance = numpy.where(last, 0, 1)
+        jump = numpy.where(last, half, following)
+        steps = 1
+        while steps < nb_half:
+            distance = distance + distance[jump]
+            jump = jump[jump]
+            steps *= 2
+        cycle = cycle[numpy.lexsort((-distance[cycle], label[cycle]))]
+        bounds = numpy.flatnonzero(numpy.diff(label[cycle])) + 1
+        for half_edges in numpy.split(cycle, bounds):
+            if half_edges.size > 2:
+                loops.append((half_edges[0], coords[source[half_edges]]))
+
+    # Other points
+    walked = open_chain.reshape(-1, 2).any(axis=1)
+    if walked.any():
+        # Order of the loops : first half-edge of the start point (stable sort of out)
+        loops += [(out0[start], loop) for start, loop in _walkLoops(point_id[walked], coords)]
+
+    loops.sort(key=lambda item: item[0])
+    return [loop for _, loop in loops]
+
+
+def _signedArea(loop: numpy.ndarray) -> float:
+    x, z = loop[:, 0], loop[:, 1]
+    return 0.5 * float(numpy.dot(x, numpy.roll(z, -1)) - numpy.dot(numpy.roll(x, -1), z))
+
+
+def _contains(loop: numpy.ndarray, point: numpy.ndarray) -> bool:
+    """ Even-odd point in polygon test """
+    x, z = loop[:, 0], loop[:, 1]
+    nx, nz = numpy.roll(x, -1), numpy.roll(z, -1)
+    straddle = (z > point[1]) != (nz > point[1])
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        cross_x = x + (point[1] - z) * (nx - x) / (nz - z)
+    return bool(numpy.count_nonzero(straddle & (point[0] < cross_x)) % 2)
+
+
+def outerLoops(loops: List[numpy.ndarray]) -> List[numpy.ndarray]:
+    """ Loops which are not inside an other loop (the holes and the islands in holes are dropped).
+
+    param loops: closed loops.
+    return: outer loops, clockwise as the Cura hulls
+    """
+    loops = [loop for loop in loops if abs(_signedArea(loop)) >= _MIN_AREA]
+    # Largest first : a loop can only be inside a larger loop
+    loops.sort(key=lambda loop: -abs(_signedArea(loop)))
+    outer = []
+    for loop in loops:
+        if not any(_contains(other, loop[0]) for other in outer):
+            outer.append(loop if _signedArea(loop) < 0 else loop[::-1])
+    return outer
+
+
+def footprintLoops(vertices: numpy.ndarray, indices: Optional[numpy.ndarray], matrix: numpy.ndarray,
+                   tolerance: float = DEFAULT_TOLERANCE) -> List[numpy.ndarray]:
+    """ Outer loops of the first layer of a mesh.
+
+    param vertices: (n, 3) vertices in the local space of the node.
+    param indices: (t, 3) triangles, None if the vertices are a triangle soup.
+    param matrix: 4x4 world transformation of the node.
+    param tolerance: height of the cut above the bottom of the mesh.
+    return: list of (k, 2) X / Z loops
+    """
+    return outerLoops(chainSegments(sliceSegments(vertices, indices, matrix, tolerance)))
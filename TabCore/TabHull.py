@@ -0,0 +1,119 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Outline of an object on the build plate
+#
+# Same steps as the 2D convex hull of Cura (ConvexHullDecorator._compute2DConvexHull) :
+# vertices in world space, projection on X / Z, rounding to 0.1 mm, convex hull and
+# horizontal expansion. Only numpy is used and the arrays are not shared, so the hulls
+# of several objects can be computed in worker threads. The hull has no per point Python
+# loop : numpy releases the GIL in the array operations.
+#--------------------------------------------------------------------------------------------
+
+import numpy
+
+
+def _cross(a: numpy.ndarray, b: numpy.ndarray, points: numpy.ndarray) -> numpy.ndarray:
+    """ Cross product (b - a) x (p - a) of the points p, < 0 on the right of a -> b """
+    return (b[:, 0] - a[:, 0]) * (points[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (points[:, 0] - a[:, 0])
+
+
+def convexHull(points: numpy.ndarray) -> numpy.ndarray:
+    """ 2D convex hull (quickhull).
+
+    All the edges of the hull are split at the same time : one iteration finds the farthest
+    point outside of every edge, so the number of Python iterations is the depth of the
+    recursion (about log2 of the hull size) and not the number of points.
+
+    param points: (n, 2) points.
+    return: (m, 2) hull points, clockwise as the Cura hulls, starting on the smallest X
+    """
+    points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 2)
+    # Sorted on X then Z without the duplicates (numpy.unique with axis is much slower)
+    points = points[numpy.lexsort((points[:, 1], points[:, 0]))]
+    distinct = numpy.ones(points.shape[0], dtype=bool)
+    distinct[1:] = (points[1:] != points[:-1]).any(axis=1)
+    points = points[distinct]
+    if points.shape[0] < 3:
+        return points
+
+    # The first and the last points are on the hull. Counter-clockwise edges, the outside of an edge is on its right.
+    starts = numpy.array([0, points.shape[0] - 1])
+    ends = starts[::-1].copy()
+    candidates = numpy.arange(1, points.shape[0] - 1)
+    side = _cross(points[:1], points[-1:], points[candidates])
+    edges = numpy.where(side < 0, 0, 1)
+    outside = side != 0
+    candidates, edges, distances = candidates[outside], edges[outside], numpy.abs(side[outside])
+
+    while candidates.size:
+        # Farthest point of every edge with points outside (any of them if several are at the same distance)
+        order = numpy.argsort(edges)
+        sorted_edges, sorted_distances = edges[order], distances[order]
+        first = numpy.flatnonzero(numpy.concatenate(([True], sorted_edges[1:] != sorted_edges[:-1])))
+        maximum = numpy.maximum.reduceat(sorted_distances, first)
+        is_farthest = sorted_distances == numpy.repeat(maximum, numpy.diff(numpy.append(first, order.size)))
+        split_edges = sorted_edges[first]
+        farthest = numpy.full(starts.size, -1)
+        farthest[sorted_edges[is_farthest]] = candidates[order[is_farthest]]
+
+        # a -> b becomes a -> f, f -> b
+        is_split = farthest >= 0
+        new_index = numpy.arange(starts.size) + numpy.cumsum(is_split) - is_split
+        new_starts = numpy.empty(starts.size + split_edges.size, dtype=starts.dtype)
+        new_ends = numpy.empty_like(new_starts)
+        new_starts[new_index] = starts
+        new_ends[new_index] = numpy.where(is_split, farthest, ends)
+        new_starts[new_index[is_split] + 1] = farthest[is_split]
+        new_ends[new_index[is_split] + 1] = ends[is_split]
+
+        # The points of a split edge go to one of the two new edges or are inside the hull
+        keep = is_split[edges] & (candidates != farthest[edges])
+        candidates, edges = candidates[keep], edges[keep]
+        pivot = points[farthest[edges]]
+        left = _cross(points[starts[edges]], pivot, points[candidates])
+        right = _cross(pivot, points[ends[edges]], points[candidates])
+        on_left = left < 0
+        on_right = ~on_left & (right < 0)
+        outside = on_left | on_right
+        distances = numpy.where(on_left, -left, -right)[outside]
+        edges = (new_index[edges] + on_right)[outside]
+        candidates = candidates[outside]
+        starts, ends = new_starts, new_ends
+
+    hull = points[starts]
+    # Rounding of the cross products : drop the vertices without a strict left turn (collinear points)
+    while hull.shape[0] >= 3:
+        previous, following = numpy.roll(hull, 1, axis=0), numpy.roll(hull, -1, axis=0)
+        turn = (hull[:, 0] - previous[:, 0]) * (following[:, 1] - previous[:, 1]) - (hull[:, 1] - previous[:, 1]) * (following[:, 0] - previous[:, 0])
+        flat = turn <= 0
+        flat[0] = False
+        if not flat.any():
+            break
+        hull = hull[~flat]
+    if hull.shape[0] < 3:
+        return hull
+    # Counter-clockwise to clockwise, still starting on the first point
+    return numpy.concatenate((hull[:1], hull[:0:-1]))
+
+
+def buildPlateHull(vertices: numpy.ndarray, matrix: numpy.ndarray, offset: float = 0.0) -> numpy.ndarray:
+    """ Convex hull of a mesh projected on the build plate.
+
+    param vertices: (n, 3) mesh vertices in the local space of the node.
+    param matrix: 4x4 world transformation of the node.
+    param offset: horizontal expansion, the hull is grown by a square of +/- offset.
+    return: (m, 2) X / Z hull points
+    """
+    if vertices is None or len(vertices) == 0:
+        return numpy.zeros((0, 2))
+    matrix = numpy.asarray(matrix, dtype=numpy.float64)
+    # Only X and Z are needed
+    points = vertices.dot(matrix[[0, 2], :3].T) + matrix[[0, 2], 3]
+    points = numpy.round(points, 1)
+    points = points[numpy.isfinite(points).all(axis=1)]
+    if offset > 0:
+        square = numpy.array([[-offset, -offset], [-offset, offset], [offset, offset], [offset, -offset]])
+        points = convexHull(points)
+        points = (points[:, None, :] + square[None, :, :]).reshape(-1, 2)
+    return convexHull(points)
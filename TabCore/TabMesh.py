@@ -0,0 +1,214 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Tab mesh generation
+#
+# A tab is a set of surfaces of revolution : flat disks (fan around the axis) and
+# conical bands between two rings. Every surface is generated for the whole ring with
+# numpy broadcasting and shares its ring vertices between the adjacent triangles,
+# the normals are computed analytically per surface.
+#--------------------------------------------------------------------------------------------
+
+import math
+import numpy
+
+from functools import lru_cache
+
+from typing import List, Tuple
+
+MeshArrays = Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+
+
+@lru_cache(maxsize=16)
+def _ringDirections(segments: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """ Cos / Sin of the ring angles i * 360° / segments (shared, read only) """
+    ang = math.radians(360 / segments)
+    angles = numpy.arange(segments) * ang
+    cos_a, sin_a = numpy.cos(angles), numpy.sin(angles)
+    cos_a.flags.writeable = False
+    sin_a.flags.writeable = False
+    return cos_a, sin_a
+
+
+def _fan(radius: float, height: float, segments: int, up: bool) -> MeshArrays:
+    """ Flat disk at a given height : center vertex + one ring.
+
+    param radius: disk radius.
+    param height: disk height (Y).
+    param segments: number of angle segments on 360°.
+    param up: True if the disk is facing up.
+    return: (vertices, normals, indices)
+    """
+    cos_a, sin_a = _ringDirections(segments)
+    verts = numpy.zeros((segments + 1, 3), dtype=numpy.float32)
+    verts[1:, 0] = radius * cos_a
+    verts[:, 1] = height
+    verts[1:, 2] = radius * sin_a
+
+    normals = numpy.zeros((segments + 1, 3), dtype=numpy.float32)
+    normals[:, 1] = 1 if up else -1
+
+    ring = numpy.arange(segments, dtype=numpy.int32) + 1
+    indices = numpy.empty((segments, 3), dtype=numpy.int32)
+    indices[:, 0] = 0
+    if up:
+        indices[:, 1] = numpy.roll(ring, -1)
+        indices[:, 2] = ring
+    else:
+        indices[:, 1] = ring
+        indices[:, 2] = numpy.roll(ring, -1)
+    return verts, normals, indices
+
+
+def _band(p: Tuple[float, float], q: Tuple[float, float], segments: int, flip: bool) -> MeshArrays:
+    """ Conical band between the ring P and the ring Q.
+
+    param p: (radius, height) of the first ring.
+    param q: (radius, height) of the second ring.
+    param segments: number of angle segments on 360°.
+    param flip: reverse the orientation of the triangles.
+    return: (vertices, normals, indices)
+    """
+    cos_a, sin_a = _ringDirections(segments)
+    (rp, yp), (rq, yq) = p, q
+
+    verts = numpy.empty((2, segments, 3), dtype=numpy.float32)
+    verts[:, :, 0] = numpy.outer((rp, rq), cos_a)
+    verts[0, :, 1] = yp
+    verts[1, :, 1] = yq
+    verts[:, :, 2] = numpy.outer((rp, rq), sin_a)
+
+    # Normal of the triangles (P0, P1, Q1) of the band
+    sign = -1 if flip else 1
+    dr, dy = rq - rp, yq - yp
+    length = math.hypot(dr, dy)
+    normal = numpy.empty((segments, 3), dtype=numpy.float32)
+    normal[:, 0] = -dy * cos_a * sign / length
+    normal[:, 1] = dr * sign / length
+    normal[:, 2] = -dy * sin_a * sign / length
+    normals = numpy.concatenate((normal, normal))
+
+    p0 = numpy.arange(segments, dtype=numpy.int32)
+    p1 = numpy.roll(p0, -1)
+    q0 = p0 + segments
+    q1 = p1 + segments
+    if flip:
+        indices = numpy.concatenate((numpy.stack((p0, q1, p1), axis=1), numpy.stack((q1, p0, q0), axis=1)))
+    else:
+        indices = numpy.concatenate((numpy.stack((p0, p1, q1), axis=1), numpy.stack((q1, q0, p0), axis=1)))
+    return verts.reshape(-1, 3), normals, indices
+
+
+def mergeMeshes(parts: List[MeshArrays]) -> MeshArrays:
+    """ Concatenate indexed meshes in one indexed mesh.
+
+    param parts: list of (vertices, normals, indices).
+    return: (vertices, normals, indices)
+    """
+    offsets = numpy.cumsum([0] + [verts.shape[0] for verts, _, _ in parts[:-1]])
+    verts = numpy.concatenate([part[0] for part in parts])
+    normals = numpy.concatenate([part[1] for part in parts])
+    indices = numpy.concatenate([part[2] + offset for part, offset in zip(parts, offsets)]).astype(numpy.int32)
+    return verts, normals, indices
+
+
+def transformMesh(vertices: numpy.ndarray, normals: numpy.ndarray, matrix: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """ Apply a 4x4 transformation to vertices and normals.
+
+    param vertices: (n, 3) vertices.
+    param normals: (n, 3) normals.
+    param matrix: 4x4 transformation matrix.
+    return: (vertices, normals) as float32
+    """
+    linear = matrix[:3, :3]
+    verts = vertices.dot(linear.T) + matrix[:3, 3]
+    # Normals are transformed by the inverse transpose
+    norms = normals.dot(numpy.linalg.inv(linear))
+    norms /= numpy.linalg.norm(norms, axis=1)[:, None]
+    return verts.astype(numpy.float32), norms.astype(numpy.float32)
+
+
+def segmentCount(diameter: float, tolerance: float, min_segments: int, max_segments: int) -> int:
+    """ Number of angle segments needed to keep the chord error under a tolerance.
+
+    The chord error (sagitta) of a segment of angle 2*pi/n on a radius r is
+    r * (1 - cos(pi/n)).
+
+    param diameter: largest diameter of the tab.
+    param tolerance: maximum chord error in mm.
+    param min_segments: floor of the segment count.
+    param max_segments: ceiling of the segment count.
+    return: segment count
+    """
+    r = diameter / 2
+    if tolerance <= 0:
+        segments = max_segments
+    elif tolerance >= r:
+        segments = min_segments
+    else:
+        segments = math.ceil(math.pi / math.acos(1 - tolerance / r))
+    return int(min(max(segments, min_segments), max_segments))
+
+
+def capsuleMesh(size: float, segments: int, lg: float, He: float, lw: float, nb_layer: int) -> MeshArrays:
+    """ Capsule vertices, normals and indices.
+
+    param size: tab diameter in mm.
+    param segments: number of angle segments on 360°.
+    param lg: pick height, the bottom of the tab is set at -lg.
+    param He: first layer height.
+    param lw: line width.
+    param nb_layer: number of layers of the tab.
+    return: (vertices, normals, indices)
+    """
+    r = size / 2
+    # First layer length
+    sup = -lg + He
+    if nb_layer > 1:
+        sup_c = -lg + (He * 2)
+    else:
+        sup_c = -lg + (He * 3)
+    l = -lg
+
+    r_sup = math.tan(math.radians(45)) * (He * 3) + r
+    # Top inside radius
+    ri = r_sup - (1.8 * lw)
+    # Top radius
+    rit = r - (1.8 * lw)
+
+    return mergeMeshes([
+        # Top
+        _band((ri, sup_c), (r_sup, sup_c), segments, False),
+        # Side 1
+        _band((r_sup, sup_c), (r, l), segments, False),
+        # Side 2
+        _band((ri, sup_c), (rit, sup), segments, True),
+        # Bottom Top
+        _fan(rit, sup, segments, True),
+        # Bottom
+        _fan(r, l, segments, False),
+    ])
+
+
+def pastilleMesh(size: float, segments: int, lg: float, He: float) -> MeshArrays:
+    """ Cylinder vertices, normals and indices.
+
+    param size: tab diameter in mm.
+    param segments: number of angle segments on 360°.
+    param lg: pick height, the bottom of the tab is set at -lg.
+    param He: tab height.
+    return: (vertices, normals, indices)
+    """
+    r = size / 2
+    # First layer length
+    sup = -lg + He
+    l = -lg
+
+    return mergeMeshes([
+        # Top
+        _fan(r, sup, segments, True),
+        # Side
+        _band((r, sup), (r, l), segments, False),
+        # Bottom
+        _fan(r, l, segments, False),
+    ])
@@ -0,0 +1,143 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Tab placement on an outline
+#
+# Points are (n, 2) arrays of the X / Z coordinates of the outline on the build plate.
+#--------------------------------------------------------------------------------------------
+
+import numpy
+
+from typing import Optional
+
+from . import TabFootprint, TabHull
+
+# First search window of the spacing selection, doubled at every step
+_SEARCH_WINDOW = 64
+
+
+def _firstFarPoint(points: numpy.ndarray, start: int, reference: numpy.ndarray, spacing: float) -> int:
+    """ Index of the first point from start at a distance >= spacing of the reference, -1 if none """
+    window = _SEARCH_WINDOW
+    nb_pt = points.shape[0]
+    while start < nb_pt:
+        stop = min(nb_pt, start + window)
+        delta = points[start:stop] - reference
+        far = numpy.sqrt(numpy.einsum("ij,ij->i", delta, delta)) >= spacing
+        index = int(numpy.argmax(far))
+        if far[index]:
+            return start + index
+        start = stop
+        window *= 2
+    return -1
+
+
+def selectTabPositions(points: numpy.ndarray, spacing: float) -> numpy.ndarray:
+    """ Greedy selection of the tab positions along a closed outline.
+
+    A point is kept if it is at least at `spacing` of the previous kept point. The last
+    point must also be at `spacing` of the first point.
+
+    param points: (n, 2) outline points.
+    param spacing: minimum distance between two tabs.
+    return: (k, 2) array of the tab positions
+    """
+    points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 2)
+    nb_pt = points.shape[0]
+    if nb_pt == 0:
+        return points
+
+    selected = []
+    current = None
+    start = 0
+    while start < nb_pt:
+        if current is None:
+            index = start
+        else:
+            index = _firstFarPoint(points, start, current, spacing)
+            if index < 0:
+                break
+        start = index + 1
+        if index == nb_pt - 1 and numpy.linalg.norm(points[0] - points[index]) < spacing:
+            continue
+        selected.append(index)
+        current = points[index]
+
+    return points[selected]
+
+
+def meshTabPositions(vertices: numpy.ndarray, matrix: numpy.ndarray, offset: float, spacing: float) -> numpy.ndarray:
+    """ Tab positions on the build plate outline of a mesh.
+
+    param vertices: (n, 3) mesh vertices in the local space of the node.
+    param matrix: 4x4 world transformation of the node.
+    param offset: horizontal expansion of the outline.
+    param spacing: minimum distance between two tabs.
+    return: (k, 2) array of the tab positions
+    """
+    return selectTabPositions(TabHull.buildPlateHull(vertices, matrix, offset), spacing)
+
+
+def footprintTabPositions(vertices: numpy.ndarray, indices: Optional[numpy.ndarray], matrix: numpy.ndarray,
+                          spacing: float) -> numpy.ndarray:
+    """ Tab positions on the first layer outline of a mesh.
+    The convex hull is used if the first layer has no closed outline.
+
+    param vertices: (n, 3) mesh vertices in the local space of the node.
+    param indices: (t, 3) triangles, None if the vertices are a triangle soup.
+    param matrix: 4x4 world transformation of the node.
+    param spacing: minimum distance between two tabs.
+    return: (k, 2) array of the tab positions
+    """
+    loops = TabFootprint.footprintLoops(vertices, indices, matrix)
+    if not loops:
+        return meshTabPositions(vertices, matrix, 0.0, spacing)
+    return numpy.concatenate([selectTabPositions(loop, spacing) for loop in loops])
+
+
+class TabSpatialIndex:
+    """ Uniform grid of the tab centres placed on the build plate.
+
+    The cell size is the search distance, so a query only looks in the 3x3 cells
+    around the point : insert and query are O(1) on average.
+    """
+
+    def __init__(self, distance: float) -> None:
+        self._distance = distance
+        self._cell_size = max(distance, 1e-3)
+        self._cells = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _cell(self, x: float, z: float):
+        return (int(numpy.floor(x / self._cell_size)), int(numpy.floor(z / self._cell_size)))
+
+    def insert(self, x: float, z: float) -> None:
+        self._cells.setdefault(self._cell(x, z), []).append((float(x), float(z)))
+        self._count += 1
+
+    def hasNeighbour(self, x: float, z: float) -> bool:
+        """ True if a tab centre is closer than the index distance of (x, z) """
+        i, j = self._cell(x, z)
+        limit = self._distance * self._distance
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for px, pz in self._cells.get((i + di, j + dj), ()):
+                    if (px - x) * (px - x) + (pz - z) * (pz - z) < limit:
+                        return True
+        return False
+
+    def filterPositions(self, positions: numpy.ndarray) -> numpy.ndarray:
+        """ Drop the positions too close of an indexed tab, the kept positions are inserted.
+
+        param positions: (k, 2) tab positions.
+        return: (m, 2) kept positions
+        """
+        kept = []
+        for index, (x, z) in enumerate(positions):
+            if not self.hasNeighbour(x, z):
+                self.insert(x, z)
+                kept.append(index)
+        return positions[kept]
@@ -0,0 +1,98 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Timings and counters of the phases of the tab creation
+#
+# When the profiler is disabled, phase() returns a shared no-op context manager so the
+# instrumented code only pays one attribute lookup and one call.
+#--------------------------------------------------------------------------------------------
+
+import threading
+import time
+
+from typing import Dict, Tuple
+
+
+class _NoPhase:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args) -> bool:
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class _Phase:
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *args) -> bool:
+        self._profiler.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._phases = {}  # type: Dict[str, Tuple[float, int]]
+        self._counters = {}  # type: Dict[str, int]
+
+    def phase(self, name: str):
+        """ Context manager measuring a phase, the time of the phases with the same name is cumulated """
+        if not self.enabled:
+            return _NO_PHASE
+        return _Phase(self, name)
+
+    def wrap(self, name: str, function):
+        """ Function measured as a phase (for the jobs of the worker threads) """
+        if not self.enabled:
+            return function
+
+        def measured(*args, **kwargs):
+            with _Phase(self, name):
+                return function(*args, **kwargs)
+        return measured
+
+    def record(self, name: str, duration: float) -> None:
+        with self._lock:
+            total, calls = self._phases.get(name, (0.0, 0))
+            self._phases[name] = (total + duration, calls + 1)
+
+    def count(self, name: str, value: int = 1) -> None:
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._phases = {}
+            self._counters = {}
+
+    def getPhases(self) -> Dict[str, Tuple[float, int]]:
+        """
+        return: name -> (total time in s, number of calls)
+        """
+        with self._lock:
+            return dict(self._phases)
+
+    def getCounters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def summary(self) -> str:
+        """
+        return: one line per phase and one line for the counters, empty if nothing was measured
+        """
+        lines = ["{} : {:.1f} ms ({})".format(name, total * 1000, calls) for name, (total, calls) in self.getPhases().items()]
+        counters = self.getCounters()
+        if counters:
+            lines.append(", ".join("{} {}".format(name, value) for name, value in counters.items()))
+        return "\n".join(lines)
@@ -0,0 +1,8 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Geometry core of the Tab Plus plugin.
+#
+# The modules of this package only depend on numpy, they must not import Qt, UM or cura
+# so they can be used (and measured) outside of Cura.
+#--------------------------------------------------------------------------------------------
@@ -0,0 +1,169 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Merged tabs : all the tabs of one object in a single support mesh node
+#
+# The TabGroupDecorator keeps the list of the tabs of the node and rebuilds the merged
+# mesh when tabs are added or removed. Tabs are added / removed with undoable operations,
+# all the tabs of an operation at once : the mesh of the node is set once per operation.
+#--------------------------------------------------------------------------------------------
+
+import numpy
+
+from typing import List, Optional
+
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshData import MeshData
+from UM.Operations.Operation import Operation
+from UM.Scene.SceneNode import SceneNode
+from UM.Scene.SceneNodeDecorator import SceneNodeDecorator
+
+from .TabCore import TabMesh
+
+
+class Tab:
+    """ One tab of a merged support mesh, geometry in the local space of the node """
+
+    def __init__(self, center: numpy.ndarray, vertices: numpy.ndarray, normals: numpy.ndarray, indices: numpy.ndarray) -> None:
+        self.center = center
+        self.vertices = vertices
+        self.normals = normals
+        self.indices = indices
+
+
+class TabGroupDecorator(SceneNodeDecorator):
+    def __init__(self) -> None:
+        super().__init__()
+        self._tabs = []  # type: List[Tab]
+        self._vertices = None  # type: Optional[numpy.ndarray]
+        self._normals = None  # type: Optional[numpy.ndarray]
+        self._indices = None  # type: Optional[numpy.ndarray]
+
+    def isTabGroup(self) -> bool:
+        return True
+
+    def getTabs(self) -> List[Tab]:
+        return self._tabs[:]
+
+    def getTabCount(self) -> int:
+        return len(self._tabs)
+
+    def createTab(self, position: Vector, mesh_data: MeshData) -> Tab:
+        """
+        Create a tab at a world position from the shared tab mesh.
+        The tab is not added to the node, see addTab.
+
+        param position: world position of the tab (on the build plate).
+        param mesh_data: tab mesh, bottom at the origin.
+        return: Tab in the local space of the node
+        """
+        inverse = numpy.linalg.inv(self._node.getWorldTransformation().getData())
+        vertices = mesh_data.getVertices() + numpy.array([position.x, 0, position.z], dtype=numpy.float32)
+        vertices, normals = TabMesh.transformMesh(vertices, mesh_data.getNormals(), inverse)
+        center = inverse.dot([position.x, 0, position.z, 1])[:3]
+        return Tab(center, vertices, normals, mesh_data.getIndices())
+
+    def getTabWorldPositions(self) -> numpy.ndarray:
+        """
+        World position of the tabs.
+
+        return: (n, 3) array
+        """
+        if not self._tabs:
+            return numpy.zeros((0, 3))
+        matrix = self._node.getWorldTransformation().getData()
+        centers = numpy.array([tab.center for tab in self._tabs])
+        return centers.dot(matrix[:3, :3].T) + matrix[:3, 3]
+
+    def findTab(self, position: Vector) -> Optional[Tab]:
+        """
+        Nearest tab of a world position.
+
+        param position: world position.
+        return: Tab or None if the node has no tab
+        """
+        if not self._tabs:
+            return None
+        inverse = numpy.linalg.inv(self._node.getWorldTransformation().getData())
+        local = inverse.dot([position.x, position.y, position.z, 1])[:3]
+        centers = numpy.array([tab.center for tab in self._tabs])
+        distances = numpy.hypot(centers[:, 0] - local[0], centers[:, 2] - local[2])
+        return self._tabs[int(numpy.argmin(distances))]
+
+    def addTab(self, tab: Tab) -> None:
+        self.addTabs([tab])
+
+    def addTabs(self, tabs: List[Tab]) -> None:
+        if not tabs:
+            return
+        parts = [(tab.vertices, tab.normals, tab.indices) for tab in tabs]
+        if self._vertices is not None:
+            # Append the tabs to the merged buffers
+            parts.insert(0, (self._vertices, self._normals, self._indices))
+        if len(parts) == 1:
+            self._vertices, self._normals, self._indices = parts[0]
+        else:
+            self._vertices, self._normals, self._indices = TabMesh.mergeMeshes(parts)
+        self._tabs.extend(tabs)
+        self._updateMeshData()
+
+    def removeTab(self, tab: Tab) -> None:
+        self.removeTabs([tab])
+
+    def removeTabs(self, tabs: List[Tab]) -> None:
+        for tab in tabs:
+            self._tabs.remove(tab)
+        if self._tabs:
+            self._vertices, self._normals, self._indices = TabMesh.mergeMeshes(
+                [(t.vertices, t.normals, t.indices) for t in self._tabs])
+        else:
+            self._vertices = self._normals = self._indices = None
+        self._updateMeshData()
+
+    def _updateMeshData(self) -> None:
+        if self._node is None:
+            return
+        if self._vertices is None:
+            self._node.setMeshData(None)
+        else:
+            self._node.setMeshData(MeshData(vertices = self._vertices, normals = self._normals, indices = self._indices))
+
+    def __deepcopy__(self, memo):
+        copy = TabGroupDecorator()
+        copy._tabs = self._tabs[:]
+        copy._vertices, copy._normals, copy._indices = self._vertices, self._normals, self._indices
+        return copy
+
+
+class AddTabOperation(Operation):
+    """ Add tabs to a merged support mesh, the tabs of an operation are added at once """
+
+    def __init__(self, node: SceneNode, tabs: List[Tab]) -> None:
+        super().__init__()
+        self._node = node
+        self._tabs = list(tabs)
+
+    def addTab(self, tab: Tab) -> None:
+        """ Add an other tab to the operation, before it is pushed """
+        self._tabs.append(tab)
+
+    def undo(self) -> None:
+        self._node.callDecoration("removeTabs", self._tabs)
+
+    def redo(self) -> None:
+        self._node.callDecoration("addTabs", self._tabs)
+
+
+class RemoveTabOperation(Operation):
+    """ Remove tabs from a merged support mesh """
+
+    def __init__(self, node: SceneNode, tabs: List[Tab]) -> None:
+        super().__init__()
+        self._node = node
+        self._tabs = list(tabs)
+
+    def undo(self) -> None:
+        self._node.callDecoration("addTabs", self._tabs)
+
+    def redo(self) -> None:
+        self._node.callDecoration("removeTabs", self._tabs)
@@ -0,0 +1,62 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Cache of the automatic tab positions of the objects
+#
+# The positions of an object are stored with the key of the data used to compute them
+# (mesh, transformation, tab size, per object settings ...). The entry of an object is
+# removed when the object is moved or its mesh is changed.
+#--------------------------------------------------------------------------------------------
+
+import numpy
+
+from typing import Optional
+from weakref import WeakKeyDictionary, WeakSet
+
+from UM.Scene.SceneNode import SceneNode
+
+
+class PlacementCache:
+    def __init__(self) -> None:
+        self._entries = WeakKeyDictionary()  # SceneNode -> (key, positions)
+        self._connected = WeakSet()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, node: SceneNode, key: tuple) -> Optional[numpy.ndarray]:
+        """
+        Cached tab positions of an object.
+
+        param node: object.
+        param key: key of the data used for the placement.
+        return: (k, 2) positions or None if the entry is missing or was computed with another key
+        """
+        entry = self._entries.get(node)
+        if entry is not None and entry[0] == key:
+            self._hits += 1
+            return entry[1]
+        self._misses += 1
+        return None
+
+    def put(self, node: SceneNode, key: tuple, positions: numpy.ndarray) -> None:
+        if node not in self._connected:
+            node.transformationChanged.connect(self._onNodeChanged)
+            node.meshDataChanged.connect(self._onNodeChanged)
+            self._connected.add(node)
+        positions.flags.writeable = False
+        self._entries[node] = (key, positions)
+
+    def invalidate(self, node: SceneNode) -> None:
+        self._entries.pop(node, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def getStats(self) -> tuple:
+        """
+        return: (hits, misses) since the creation of the cache
+        """
+        return self._hits, self._misses
+
+    def _onNodeChanged(self, node: SceneNode) -> None:
+        self.invalidate(node)
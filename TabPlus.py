@@ -19,6 +19,24 @@
 # V1.1.3 13-02-2023    : Change CustomTap.qml into CustomTab.qml
 # V1.1.4 04-03-2023    : Test parameter Brim Replaces Support in 5.3
 # V1.1.5 13-03-2023    : Qml & resources location
+# V1.2.0 18-10-2026    : Tab meshes generated with numpy (TabCore)
+#                      : Tabs with the same geometry share one MeshData
+#                      : Indexed tab meshes with shared vertices
+#                      : Adaptive tessellation of the tabs
+#                      : Merged tab mode, one support mesh per object
+#                      : Automatic tabs too close of an other tab are dropped
+#                      : Hulls and tab positions computed in worker threads
+#                      : Cache of the automatic tab positions
+#                      : Settings resolved once per batch of tabs
+#                      : One scene change and one slice for the automatic addition / remove all
+#                      : Remove all in one undoable operation
+#                      : Registry of the tabs by object, rebuilt on a file load
+#                      : Automatic addition on the first layer outline (Footprint)
+#                      : Timings of the tab creation shown in the tool panel (tab_plus/profiling)
+#                      : Picking pass rendered again only if the view or the scene changed
+#                      : Drag to paint the tabs along an object, one operation per stroke
+#                      : Preview of the automatic addition, tabs created on confirm
+#                      : Tab positions applied when the worker threads are done, the interface is not blocked
 #------------------------------------------------------------------------------------------------------------------
 
 VERSION_QT5 = False
@@ -30,7 +48,7 @@ except ImportError:
     from PyQt5.QtWidgets import QApplication
     VERSION_QT5 = True
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from cura.CuraApplication import CuraApplication
 
@@ -41,9 +59,18 @@ from UM.Math.Vector import Vector
 from UM.Tool import Tool
 from UM.Event import Event, MouseEvent
 from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshData import MeshData
 
 from cura.PickingPass import PickingPass
 
+from .TabCore import TabMesh, TabPlacement
+from .TabCore.TabProfiler import Profiler
+from .TabGroup import Tab, TabGroupDecorator, AddTabOperation, RemoveTabOperation
+from .TabPlacementCache import PlacementCache
+from .TabSettings import TabSettingsSnapshot
+from .TabRegistry import TabRegistry, TAB_NODE_NAME
+from .TabPreview import TabPreviewNode, createDiscMesh
+
 from cura.CuraVersion import CuraVersion  # type: ignore
 from UM.Version import Version
 
@@ -63,10 +90,17 @@ from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
 from UM.Scene.ToolHandle import ToolHandle
 from UM.Tool import Tool
 
+import functools
 import os.path 
 import math
+import threading
+import time
 import numpy
 
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+
 from UM.Resources import Resources
 from UM.i18n import i18nCatalog
 
@@ -85,11 +119,53 @@ if catalog.hasTranslationLoaded():
     
     
 class TabPlus(Tool):
+    # Minimum time between two picks of a stroke (s)
+    _PAINT_INTERVAL = 0.02
+
     def __init__(self):
         super().__init__()
         
         # Stock Data  
         self._all_picked_node = []
+        # Tabs added to an existing merged support mesh : (node, tab)
+        self._all_picked_tab = []
+        # Tab nodes of the scene by object
+        self._registry = TabRegistry(self.getController().getScene().getRoot())
+        
+        # Tab meshes shared by the tabs with the same geometry
+        self._mesh_cache = {}
+        
+        # Merged tab nodes created in the current operation (parent, node)
+        self._op = None
+        self._pending_groups = []
+        # Tabs added to the merged tab nodes in the current operation : node -> AddTabOperation
+        self._pending_tabs = {}
+        
+        # Notifications postponed during a batch of tabs
+        self._batch_depth = 0
+        self._batch_node = None
+        self._batch_property_changed = False
+        
+        # Automatic tab positions of the objects
+        self._placement_cache = PlacementCache()
+        # Worker threads of the placement, created on the first automatic addition / preview
+        self._placement_pool = None
+        self._global_stack = None
+        
+        # Preview of the automatic addition, shown while the tool is active
+        self._preview_node = None
+        self._preview_disc = None
+        self._preview_size = None
+        self._tool_active = False
+        # A preview is computed, an other one is needed when it is done
+        self._preview_running = False
+        self._preview_again = False
+        # The preview is not measured : the timings of the panel are the ones of the tabs
+        self._preview_profiler = Profiler()
+        
+        # Timings of the last click / automatic addition
+        self._profiler = Profiler()
+        self._SProfile = ""
         
         
         # variable for menu dialog        
@@ -97,12 +173,20 @@ class TabPlus(Tool):
         self._UseOffset = 0.0
         self._AsCapsule = False
         self._AdhesionArea = False
+        self._Footprint = False
+        self._Preview = False
         self._Nb_Layer = 1
         self._SMsg = catalog.i18nc("@label", "Remove All") 
         self._Mesg1 = False
         self._Mesg2 = False
         self._Mesg3 = False
         self._Mesg4 = False
+        self._AdaptiveTessellation = True
+        self._ChordTolerance = 0.1
+        self._MinSegments = 12
+        self._MaxSegments = 120
+        self._MergedTabs = False
+        self._MinTabDistance = 0.0
 
 
         # Shortcut
@@ -115,7 +199,27 @@ class TabPlus(Tool):
 
         self._selection_pass = None
         
+        # Picking pass of the last click, rendered again when the view or the objects changed
+        self._picking_pass = None
+        self._picking_view = None
+        self._picking_dirty = True
+        # Node -> state (mesh, transformation, children without the tabs) when the pass was rendered
+        self._picking_states = {}
+        self._controller.getScene().sceneChanged.connect(self._onPickingSceneChanged)
+        self._controller.getScene().activeCameraChanged.connect(self._onPickingCameraChanged)
+        
+        # Tabs painted by a drag of the mouse, committed on the release
+        self._stroke_batch = None
+        self._stroke_parent = None
+        self._stroke_settings = None
+        self._stroke_last = None
+        self._stroke_time = 0.0
+        self._stroke_count = 0
+        self._stroke_start = 0.0
+        
         self._application = CuraApplication.getInstance()
+        # Undo / redo of the tabs or of the objects while the tool is active
+        self._application.getOperationStack().changed.connect(self._onOperationStackChanged)
 
         # Suggested solution from fieldOfView . in this discussion solved in Cura 4.9
         # https://github.com/5axes/Calibration-Shapes/issues/1
@@ -141,9 +245,11 @@ class TabPlus(Tool):
             except:
                 pass
         
-        self.setExposedProperties("SSize", "SOffset", "SCapsule", "NLayer", "SMsg" ,"SArea" )
+        self.setExposedProperties("SSize", "SOffset", "SCapsule", "NLayer", "SMsg" ,"SArea", "SFootprint", "SPreview", "SProfile" )
         
         CuraApplication.getInstance().globalContainerStackChanged.connect(self._updateEnabled)
+        CuraApplication.getInstance().globalContainerStackChanged.connect(self._onGlobalContainerStackChanged)
+        self._onGlobalContainerStackChanged()
         
          
         # Note: if the selection is cleared with this tool active, there is no way to switch to
@@ -176,24 +282,70 @@ class TabPlus(Tool):
         self._preferences.addPreference("tab_plus/adhesion_area", False)
         self._AdhesionArea = bool(self._preferences.getValue("tab_plus/adhesion_area"))   
 
+        self._preferences.addPreference("tab_plus/footprint", False)
+        self._Footprint = bool(self._preferences.getValue("tab_plus/footprint"))   
+
+        self._preferences.addPreference("tab_plus/preview", False)
+        self._Preview = bool(self._preferences.getValue("tab_plus/preview"))   
+
         self._preferences.addPreference("tab_plus/nb_layer", 1)
         # convert as float to avoid further issue
         self._Nb_Layer = int(self._preferences.getValue("tab_plus/nb_layer"))
+        
+        # Adaptive tessellation : chord error tolerance as a ratio of the line width
+        self._preferences.addPreference("tab_plus/adaptive_tessellation", True)
+        self._preferences.addPreference("tab_plus/chord_tolerance", 0.1)
+        self._preferences.addPreference("tab_plus/min_segments", 12)
+        self._preferences.addPreference("tab_plus/max_segments", 120)
+        # All the tabs of an object in one support mesh
+        self._preferences.addPreference("tab_plus/merged_tabs", False)
+        # Minimum distance between two automatic tabs, 0 : Size * 0.7
+        self._preferences.addPreference("tab_plus/min_tab_distance", 0.0)
+        # Timings of the tab creation in the tool panel and in the log
+        self._preferences.addPreference("tab_plus/profiling", False)
+        self._readAdvancedPreferences()
+        
+        self._preferences.preferenceChanged.connect(self._onPreferenceChanged)
         self._application.fileCompleted.connect(self._onFileCompleted)        
      
     def _onFileCompleted(self) -> None:
         # Reset Stock Data  
         self._all_picked_node = []
+        self._all_picked_tab = []
+        # Tabs of a loaded project
+        self._registry.rebuild(self._controller.getScene().getRoot())
         self._SMsg = catalog.i18nc("@label", "Remove All") 
         
     def event(self, event):
         super().event(event)
+        if event.type == Event.ToolActivateEvent:
+            self._tool_active = True
+            self._updatePreview()
+        elif event.type == Event.ToolDeactivateEvent:
+            self._tool_active = False
+            # The release of the stroke will not come to this tool
+            if self._stroke_batch is not None:
+                self._endStroke()
+            self._updatePreview()
+
         modifiers = QApplication.keyboardModifiers()
         if not VERSION_QT5:
             ctrl_is_active = modifiers & Qt.KeyboardModifier.ControlModifier
         else:
             ctrl_is_active = modifiers & Qt.ControlModifier
 
+        if self._stroke_batch is not None:
+            if event.type == Event.MouseMoveEvent:
+                try:
+                    self._paintStroke(event.x, event.y)
+                except Exception:
+                    # Keep the tabs already added, the batch must not stay open
+                    self._endStroke()
+                    raise
+                return
+            if event.type == Event.MouseReleaseEvent or event.type == Event.MousePressEvent:
+                self._endStroke()
+
         if event.type == Event.MousePressEvent and MouseEvent.LeftButton in event.buttons and self._controller.getToolsEnabled():
             if ctrl_is_active:
                 self._controller.setActiveTool("TranslateTool")
@@ -205,6 +357,7 @@ class TabPlus(Tool):
                 self._skip_press = False
                 return
 
+            self._profiler.reset()
             if self._selection_pass is None:
                 # The selection renderpass is used to identify objects in the current view
                 self._selection_pass = CuraApplication.getInstance().getRenderer().getRenderPass("selection")
@@ -219,65 +372,211 @@ class TabPlus(Tool):
             if node_stack:
             
                 if node_stack.getProperty("support_mesh", "value"):
-                    self._removeSupportMesh(picked_node)
+                    if picked_node.callDecoration("isTabGroup") and picked_node.callDecoration("getTabCount") > 1:
+                        # Merged support mesh : only remove the tab under the mouse
+                        # The tab can be newer than the cached picking pass
+                        picked_position = self._getPickedPosition(event.x, event.y, True)
+                        tab = picked_node.callDecoration("findTab", picked_position)
+                        RemoveTabOperation(picked_node, [tab]).push()
+                        if (picked_node, tab) in self._all_picked_tab:
+                            self._all_picked_tab.remove((picked_node, tab))
+                        self._notifySceneChanged(picked_node)
+                    else:
+                        self._removeSupportMesh(picked_node)
                     return
 
                 elif node_stack.getProperty("anti_overhang_mesh", "value") or node_stack.getProperty("infill_mesh", "value") or node_stack.getProperty("support_mesh", "value"):
                     # Only "normal" meshes can have support_mesh added to them
                     return
 
-            # Create a pass for picking a world-space location from the mouse location
-            active_camera = self._controller.getScene().getActiveCamera()
-            picking_pass = PickingPass(active_camera.getViewportWidth(), active_camera.getViewportHeight())
-            picking_pass.render()
-
-            picked_position = picking_pass.getPickedPosition(event.x, event.y)
+            picked_position = self._getPickedPosition(event.x, event.y)
 
             Logger.log('d', "X : {}".format(picked_position.x))
             Logger.log('d', "Y : {}".format(picked_position.y))
                             
-            # Add the support_mesh cube at the picked location
-            self._op = GroupedOperation()
-            self._createSupportMesh(picked_node, picked_position)
-            self._op.push() 
+            # Add the support_mesh cube at the picked location, a drag adds more tabs
+            self._startStroke(picked_node, picked_position)
 
-    def _createSupportMesh(self, parent: CuraSceneNode, position: Vector):
-        node = CuraSceneNode()
+    def _startStroke(self, parent: CuraSceneNode, position: Vector) -> None:
+        """
+        Add the tab of a click and start a stroke : while the button is held the tabs
+        are added along the mouse path on the same object, in the same operation.
+        
+        param parent: clicked object.
+        param position: world position of the click.
+        """
+        self._stroke_start = time.perf_counter()
+        self._stroke_batch = ExitStack()
+        self._stroke_batch.enter_context(self._batch())
+        try:
+            self._newOperation()
+            with self._profiler.phase("settings"):
+                self._stroke_settings = TabSettingsSnapshot(self._Nb_Layer)
+            self._stroke_parent = parent
+            self._stroke_last = (position.x, position.z)
+            self._stroke_time = self._stroke_start
+            self._stroke_count = 1
+            self._createSupportMesh(parent, position, self._stroke_settings)
+        except Exception:
+            # Nothing pushed, the batch is closed
+            self._closeStroke()
+            raise
+
+    def _paintStroke(self, x: float, y: float) -> None:
+        """
+        Mouse move of a stroke : a tab is added if the mouse is on the object of the stroke
+        and far enough of the previous tab. The picking is limited to one pick per
+        _PAINT_INTERVAL.
+        
+        param x: mouse x.
+        param y: mouse y.
+        """
+        now = time.perf_counter()
+        if now - self._stroke_time < self._PAINT_INTERVAL:
+            self._profiler.count("moves skipped")
+            return
+        self._stroke_time = now
 
-        node.setName("RoundTab")
-            
-        node.setSelectable(True)
+        if self._controller.getScene().findObject(self._selection_pass.getIdAtPosition(x, y)) is not self._stroke_parent:
+            return
+        position = self._getPickedPosition(x, y)
+        spacing = self._UseSize*0.7
+        if math.hypot(position.x - self._stroke_last[0], position.z - self._stroke_last[1]) < spacing:
+            return
+
+        self._stroke_last = (position.x, position.z)
+        self._stroke_count += 1
+        self._createSupportMesh(self._stroke_parent, position, self._stroke_settings)
+
+    def _endStroke(self) -> None:
+        """ Push the tabs of the stroke as one operation, the scene change is emitted once """
+        try:
+            with self._profiler.phase("push"):
+                self._op.push() 
+        finally:
+            self._closeStroke()
+        Logger.log('d', "Tab creation : {} tabs, {:.2f} ms".format(self._stroke_count, (time.perf_counter() - self._stroke_start) * 1000))
+        self._publishProfile("Tab creation")
+
+    def _closeStroke(self) -> None:
+        """ End of the batch of the stroke """
+        batch = self._stroke_batch
+        self._stroke_batch = None
+        self._stroke_parent = None
+        self._stroke_settings = None
+        batch.close()
+
+    def _getPickedPosition(self, x: float, y: float, refresh: bool = False) -> Vector:
+        """
+        World position under the mouse.
+        The picking pass is kept between the clicks and rendered again only if the camera,
+        the viewport or an object of the scene changed (sceneChanged, the camera is a node
+        of the scene). The tabs do not invalidate the pass, only the X/Z position of a new
+        tab is used : adding or removing a tab changes the children of its object, which
+        is not a change of the object for the pass.
         
-        # long=Support Height
-        _long=position.y
+        param x: mouse x.
+        param y: mouse y.
+        param refresh: render the pass even if nothing changed.
+        return: picked position
+        """
+        active_camera = self._controller.getScene().getActiveCamera()
+        width = active_camera.getViewportWidth()
+        height = active_camera.getViewportHeight()
+        # Zoom of the orthographic view and perspective switch do not move the camera node
+        view = (width, height, active_camera.getProjectionMatrix().getData().tobytes())
+
+        if self._picking_pass is None or self._picking_view is None or self._picking_view[:2] != view[:2]:
+            # Create a pass for picking a world-space location from the mouse location
+            self._picking_pass = PickingPass(width, height)
+            refresh = True
+        if refresh or self._picking_dirty or view != self._picking_view:
+            with self._profiler.phase("picking"):
+                self._picking_pass.render()
+                root = self._controller.getScene().getRoot()
+                self._picking_states = {node: self._pickingState(node) for node in DepthFirstIterator(root) if not self._isPickingIgnored(node)}
+            self._picking_view = view
+            self._picking_dirty = False
+        else:
+            self._profiler.count("picking reused")
 
-        # get layer_height_0 used to define pastille height
-        _id_ex=0
+        return self._picking_pass.getPickedPosition(x, y)
+
+    def _isPickingIgnored(self, node: SceneNode) -> bool:
+        # The tabs and the preview are not needed in the picking pass
+        return node is self._preview_node or bool(node.callDecoration("isTabPlusTab")) or bool(node.callDecoration("isTabGroup"))
+
+    def _pickingState(self, node: SceneNode) -> tuple:
+        """
+        What the picking pass depends on for a node.
         
-        # This function can be triggered in the middle of a machine change, so do not proceed if the machine change
-        # has not done yet.
-        global_container_stack = CuraApplication.getInstance().getGlobalContainerStack()
-        #extruder = global_container_stack.extruderList[int(_id_ex)] 
-        extruder_stack = CuraApplication.getInstance().getExtruderManager().getActiveExtruderStacks()[0]     
-        self._Extruder_count=global_container_stack.getProperty("machine_extruder_count", "value") 
-        #Logger.log('d', "Info Extruder_count --> " + str(self._Extruder_count))   
-        
-        _layer_h_i = extruder_stack.getProperty("layer_height_0", "value")
-        _layer_height = extruder_stack.getProperty("layer_height", "value")
-        _line_w = extruder_stack.getProperty("line_width", "value")
-        # Logger.log('d', 'layer_height_0 : ' + str(_layer_h_i))
-        _layer_h = (_layer_h_i * 1.2) + (_layer_height * (self._Nb_Layer -1) )
-        _line_w = _line_w * 1.2 
+        param node: node of the scene, not a tab.
+        return: mesh data, world transformation and children which are not tabs
+        """
+        children = tuple(child for child in node.getChildren() if not self._isPickingIgnored(child))
+        return (node.getMeshData(), node.getWorldTransformation().getData().tobytes(), children)
+
+    def _onPickingSceneChanged(self, node: SceneNode) -> None:
+        if self._picking_dirty or self._isPickingIgnored(node):
+            return
+        # The parent of a new / removed tab sends sceneChanged without any change for the pass
+        if self._picking_states.get(node) != self._pickingState(node):
+            self._picking_dirty = True
+
+    def _onPickingCameraChanged(self) -> None:
+        self._picking_dirty = True
+
+    def _createSupportMesh(self, parent: CuraSceneNode, position: Vector, settings: TabSettingsSnapshot):
+        """
+        Add a tab to the current operation.
         
-        if self._AsCapsule:
-             # Capsule creation Diameter , Increment angle 10°, length, layer_height_0*1.2 , line_width
-            mesh = self._createCapsule(self._UseSize,10,_long,_layer_h,_line_w)       
-        else:
-            # Cylinder creation Diameter , Increment angle 10°, length, layer_height_0*1.2
-            mesh = self._createPastille(self._UseSize,10,_long,_layer_h)
+        param parent: object of the tab.
+        param position: world position of the tab.
+        param settings: settings of the batch, the profile fix-ups are done on the first tab.
+        """
+        with self._profiler.phase("mesh"):
+            # Shared mesh, the tab is only positioned by the node transformation
+            mesh_data = self._getTabMeshData(settings.tab_height, settings.line_width)
+
+            group = self._findTabGroup(parent) if self._MergedTabs else None
+            if group is not None:
+                # Merged mode : the tab is added to the support mesh of the object
+                tab = group.callDecoration("createTab", position, mesh_data)
+                self._addTabOperation(group).addTab(tab)
+                self._all_picked_tab.append((group, tab))
+                node = group
+            else:
+                node = self._createTabNode(parent, position, mesh_data, settings)
+                self._all_picked_node.append(node)
+                self._registry.register(parent, node)
+        self._profiler.count("tabs")
+
+        if not settings.fixed:
+            with self._profiler.phase("settings"):
+                self._fixProfileSettings(settings)
+            settings.fixed = True
+
+        self._SMsg = catalog.i18nc("@label", "Remove Last") 
+        self._notifyPropertyChanged()
         
+        self._notifySceneChanged(node)
+
+    def _createTabNode(self, parent: CuraSceneNode, position: Vector, mesh_data: MeshData, snapshot: TabSettingsSnapshot) -> CuraSceneNode:
+        """
+        Create the support mesh node of a tab and add the operations to insert it in the scene.
+        In merged mode the node is the support mesh of all the tabs of the parent.
         
-        node.setMeshData(mesh.build())
+        param parent: object of the tab.
+        param position: world position of the tab.
+        param mesh_data: shared tab mesh.
+        param snapshot: settings of the batch.
+        return: new node
+        """
+        node = CuraSceneNode()
+
+        node.setName(TAB_NODE_NAME)
+            
+        node.setSelectable(True)
 
         active_build_plate = CuraApplication.getInstance().getMultiBuildPlateModel().activeBuildPlate
         node.addDecorator(BuildPlateDecorator(active_build_plate))
@@ -287,22 +586,90 @@ class TabPlus(Tool):
         settings = stack.getTop()
 
         # support_mesh type
-        definition = stack.getSettingDefinition("support_mesh")
+        definition = snapshot.definitions["support_mesh"]
         new_instance = SettingInstance(definition, settings)
         new_instance.setProperty("value", True)
         new_instance.resetState()  # Ensure that the state is not seen as a user state.
         settings.addInstance(new_instance)
 
-        definition = stack.getSettingDefinition("support_mesh_drop_down")
+        definition = snapshot.definitions["support_mesh_drop_down"]
         new_instance = SettingInstance(definition, settings)
         new_instance.setProperty("value", False)
         new_instance.resetState()  # Ensure that the state is not seen as a user state.
         settings.addInstance(new_instance)
  
+        # Define support_xy_distance
+        definition = snapshot.definitions["support_xy_distance"]
+        new_instance = SettingInstance(definition, settings)
+        new_instance.setProperty("value", self._UseOffset)
+        # new_instance.resetState()  # Ensure that the state is not seen as a user state.
+        settings.addInstance(new_instance)
+
+        #self._op = GroupedOperation()
+        # First add node to the scene at the correct position/scale, before parenting, so the support mesh does not get scaled with the parent
+        self._op.addOperation(AddSceneNodeOperation(node, self._controller.getScene().getRoot()))
+        self._op.addOperation(SetParentOperation(node, parent))
+        #op.push()
+        # The template mesh starts at Y=0, so the node is set on the build plate
+        node.setPosition(Vector(position.x, 0, position.z), CuraSceneNode.TransformSpace.World)
+
+        if self._MergedTabs:
+            # The merged mesh is set when the operation is pushed, with the other tabs of the operation
+            node.addDecorator(TabGroupDecorator())
+            self._addTabOperation(node).addTab(node.callDecoration("createTab", position, mesh_data))
+            self._pending_groups.append((parent, node))
+        else:
+            node.setMeshData(mesh_data)
+
+        return node
+
+    def _findTabGroup(self, parent: CuraSceneNode) -> Optional[CuraSceneNode]:
+        """
+        Merged support mesh of an object.
+        
+        param parent: object.
+        return: merged tab node or None
+        """
+        # Created in the current operation, not yet in the scene
+        for pending_parent, group in self._pending_groups:
+            if pending_parent is parent:
+                return group
+        for child in self._registry.getTabs(parent):
+            if child.callDecoration("isTabGroup"):
+                return child
+        return None
+
+    def _addTabOperation(self, group: CuraSceneNode) -> AddTabOperation:
+        """
+        Operation adding the tabs of the current operation to a merged support mesh.
+        
+        param group: merged tab node.
+        return: AddTabOperation of the node, added to the current operation on the first tab
+        """
+        operation = self._pending_tabs.get(group)
+        if operation is None:
+            operation = self._pending_tabs[group] = AddTabOperation(group, [])
+            self._op.addOperation(operation)
+        return operation
+
+    def _newOperation(self) -> None:
+        self._op = GroupedOperation()
+        self._pending_groups = []
+        self._pending_tabs = {}
+
+    def _fixProfileSettings(self, settings: TabSettingsSnapshot) -> None:
+        """
+        Fix some settings in Cura to get a better result.
+        
+        param settings: settings of the batch.
+        """
+        global_container_stack = settings.global_stack
+        extruder_stack = settings.extruder_stack
+        self._Extruder_count = settings.extruder_count
         # Define support_type
         if self._AsCapsule:
             key="support_type"
-            s_p = global_container_stack.getProperty(key, "value")
+            s_p = settings.support_type
             if s_p ==  'buildplate' and not self._Mesg1 :
                 definition_key=key + " label"
                 untranslated_label=extruder_stack.getProperty(key,"label")
@@ -314,23 +681,10 @@ class TabPlus(Tool):
                 global_container_stack.setProperty(key, "value", 'everywhere')
                 self._Mesg1 = True
                
-        # Define support_xy_distance
-        definition = stack.getSettingDefinition("support_xy_distance")
-        new_instance = SettingInstance(definition, settings)
-        new_instance.setProperty("value", self._UseOffset)
-        # new_instance.resetState()  # Ensure that the state is not seen as a user state.
-        settings.addInstance(new_instance)
-
-        # Fix some settings in Cura to get a better result
-        id_ex=0
-        global_container_stack = CuraApplication.getInstance().getGlobalContainerStack()
-        extruder_stack = CuraApplication.getInstance().getExtruderManager().getActiveExtruderStacks()[0]
-        #extruder = global_container_stack.extruderList[int(id_ex)]    
-        
         # Hop to fix it in a futur release
         # https://github.com/Ultimaker/Cura/issues/9882
         key="support_xy_distance"
-        _xy_distance = extruder_stack.getProperty(key, "value")
+        _xy_distance = settings.support_xy_distance
         if self._UseOffset !=  _xy_distance and not self._Mesg2 :        
             definition_key=key + " label"
             untranslated_label=extruder_stack.getProperty(key,"label")
@@ -348,7 +702,7 @@ class TabPlus(Tool):
  
         if self._Nb_Layer >1 :
             key="support_infill_rate"
-            s_p = int(extruder_stack.getProperty(key, "value"))
+            s_p = int(settings.support_infill_rate)
             Logger.log('d', 'support_infill_rate actual : ' + str(s_p))
             if s_p < 99 and not self._Mesg3 :
                 definition_key=key + " label"
@@ -370,7 +724,7 @@ class TabPlus(Tool):
         if (self.Major>=5 and self.Minor>=3) and not self._Mesg4 :
             
             key="brim_replaces_support"
-            s_b = bool(extruder_stack.getProperty(key, "value"))
+            s_b = bool(settings.brim_replaces_support)
             Logger.log('d', 'brim_replaces_support actual : {}'.format(s_b))
             if s_b :
                 definition_key=key + " label"
@@ -386,18 +740,144 @@ class TabPlus(Tool):
                     extruder_stack.setProperty("brim_replaces_support", "value", False)
                 
                 self._Mesg4 = True
-                
-        #self._op = GroupedOperation()
-        # First add node to the scene at the correct position/scale, before parenting, so the support mesh does not get scaled with the parent
-        self._op.addOperation(AddSceneNodeOperation(node, self._controller.getScene().getRoot()))
-        self._op.addOperation(SetParentOperation(node, parent))
-        #op.push()
-        node.setPosition(position, CuraSceneNode.TransformSpace.World)
-        self._all_picked_node.append(node)
-        self._SMsg = catalog.i18nc("@label", "Remove Last") 
-        self.propertyChanged.emit()
+
+    def _getTabMeshData(self, height: float, line_width: float) -> MeshData:
+        """
+        Return the tab mesh for the current tab parameters.
+        Tabs with the same geometry share one MeshData, the mesh is built with a pick height
+        of 0 so the bottom of the tab is at the origin of the node.
+        
+        param height: tab height in mm.
+        param line_width: line width in mm (Capsule only).
+        return: shared MeshData
+        """
+        segments = self._getSegmentCount(height, line_width)
+        key = (self._AsCapsule, self._UseSize, segments, height, line_width, self._Nb_Layer)
+        mesh_data = self._mesh_cache.get(key)
+        if mesh_data is None:
+            if self._AsCapsule:
+                # Capsule creation Diameter , Number of segments, length, layer_height_0*1.2 , line_width
+                mesh = self._createCapsule(self._UseSize, segments, 0, height, line_width)
+            else:
+                # Cylinder creation Diameter , Number of segments, length, layer_height_0*1.2
+                mesh = self._createPastille(self._UseSize, segments, 0, height)
+            mesh_data = mesh.build()
+            self._mesh_cache[key] = mesh_data
+        return mesh_data
+
+    def _getSegmentCount(self, height: float, line_width: float) -> int:
+        """
+        Number of angle segments of the tab.
+        In adaptive mode the count is defined by the tab diameter and a chord error
+        tolerance proportional to the line width, otherwise 36 segments (10°).
+        
+        param height: tab height in mm.
+        param line_width: line width in mm.
+        return: segment count
+        """
+        if not self._AdaptiveTessellation:
+            return 36
         
-        CuraApplication.getInstance().getController().getScene().sceneChanged.emit(node)
+        diameter = self._UseSize
+        if self._AsCapsule:
+            # Top of the capsule bevel
+            diameter += height * 6
+        return TabMesh.segmentCount(diameter, line_width * self._ChordTolerance, self._MinSegments, self._MaxSegments)
+
+    def _readAdvancedPreferences(self) -> None:
+        self._AdaptiveTessellation = bool(self._preferences.getValue("tab_plus/adaptive_tessellation"))
+        self._ChordTolerance = float(self._preferences.getValue("tab_plus/chord_tolerance"))
+        self._MinSegments = max(3, int(self._preferences.getValue("tab_plus/min_segments")))
+        self._MaxSegments = max(self._MinSegments, int(self._preferences.getValue("tab_plus/max_segments")))
+        self._MergedTabs = bool(self._preferences.getValue("tab_plus/merged_tabs"))
+        self._MinTabDistance = float(self._preferences.getValue("tab_plus/min_tab_distance"))
+        self._profiler.enabled = bool(self._preferences.getValue("tab_plus/profiling"))
+        if not self._profiler.enabled and self._SProfile:
+            self._SProfile = ""
+            self.propertyChanged.emit()
+
+    def _onPreferenceChanged(self, preference: str) -> None:
+        # Tab meshes built with the old values are not used anymore
+        if preference.startswith("tab_plus/"):
+            self._mesh_cache.clear()
+            self._readAdvancedPreferences()
+            # Live update of the preview with the options of the panel
+            if preference in ("tab_plus/p_size", "tab_plus/adhesion_area", "tab_plus/footprint", "tab_plus/preview", "tab_plus/min_tab_distance"):
+                self._updatePreview()
+
+    def _updatePreview(self) -> None:
+        """
+        Show the tab positions of the automatic addition as discs, without creating any node
+        of the print. The preview is hidden when the option is off or the tool is not active.
+        The positions are computed in the background, one computation at a time : the changes
+        made during a computation are shown by the next one.
+        """
+        if not self._Preview or not self._tool_active:
+            self._hidePreview()
+            return
+        if self._preview_running:
+            self._preview_again = True
+            return
+        self._preview_running = True
+        self._preview_again = False
+        self._computeAutoPositions(self._showPreview, self._preview_profiler)
+
+    def _onOperationStackChanged(self) -> None:
+        # Tabs or objects added, removed or moved, by the tool or by an undo / redo
+        if self._tool_active:
+            self._updatePreview()
+
+    def _hidePreview(self) -> None:
+        if self._preview_node is not None and self._preview_node.getParent() is not None:
+            self._preview_node.setParent(None)
+
+    def _showPreview(self, placements: List[tuple]) -> None:
+        """
+        param placements: list of (object, (k, 2) build plate positions) of _computeAutoPositions.
+        """
+        self._preview_running = False
+        if self._preview_again:
+            # Positions already out of date
+            self._updatePreview()
+            return
+        if not self._Preview or not self._tool_active:
+            self._hidePreview()
+            return
+
+        root = self._controller.getScene().getRoot()
+        placements = [kept for _, kept in placements]
+        positions = numpy.concatenate(placements) if placements else numpy.zeros((0, 2))
+        if self._preview_disc is None or self._preview_size != self._UseSize:
+            self._preview_disc = createDiscMesh(self._UseSize, 36)
+            self._preview_size = self._UseSize
+        if self._preview_node is None:
+            self._preview_node = TabPreviewNode()
+        self._preview_node.setTabs(self._preview_disc, positions)
+        if self._preview_node.getParent() is None:
+            self._preview_node.setParent(root)
+        else:
+            # Redraw
+            self._controller.getScene().sceneChanged.emit(self._preview_node)
+        Logger.log('d', "Preview : {} tabs".format(len(positions)))
+
+    def _onGlobalContainerStackChanged(self) -> None:
+        if self._global_stack:
+            self._global_stack.propertyChanged.disconnect(self._onStackPropertyChanged)
+            for extruder_stack in self._global_stack.extruderList:
+                extruder_stack.propertyChanged.disconnect(self._onStackPropertyChanged)
+        self._placement_cache.clear()
+
+        self._global_stack = CuraApplication.getInstance().getGlobalContainerStack()
+        if self._global_stack:
+            self._global_stack.propertyChanged.connect(self._onStackPropertyChanged)
+            for extruder_stack in self._global_stack.extruderList:
+                extruder_stack.propertyChanged.connect(self._onStackPropertyChanged)
+
+    def _onStackPropertyChanged(self, key: str, property_name: str) -> None:
+        # Hull offsets and adhesion area depend on the profile. The settings fixed
+        # by the tool during a batch of tabs (_fixProfileSettings) keep the cache.
+        if property_name == "value" and not self._batch_depth:
+            self._placement_cache.clear()
 
     def _removeSupportMesh(self, node: CuraSceneNode):
         parent = node.getParent()
@@ -406,11 +886,49 @@ class TabPlus(Tool):
 
         op = RemoveSceneNodeOperation(node)
         op.push()
+        # Only the undo stack keeps the removed node
+        if node in self._all_picked_node:
+            self._all_picked_node.remove(node)
+        self._all_picked_tab = [(group, tab) for group, tab in self._all_picked_tab if group is not node]
 
         if parent and not Selection.isSelected(parent):
             Selection.add(parent)
 
-        CuraApplication.getInstance().getController().getScene().sceneChanged.emit(node)
+        self._notifySceneChanged(node)
+
+    @contextmanager
+    def _batch(self):
+        """
+        Batch of tab additions / removals : the scene and property notifications are
+        postponed until the end of the batch, then one change is emitted so only one
+        slice is started.
+        """
+        if self._batch_depth == 0:
+            self._batch_node = None
+            self._batch_property_changed = False
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                if self._batch_property_changed:
+                    self.propertyChanged.emit()
+                if self._batch_node is not None:
+                    self._controller.getScene().sceneChanged.emit(self._batch_node)
+                self._batch_node = None
+
+    def _notifySceneChanged(self, node: SceneNode) -> None:
+        if self._batch_depth:
+            self._batch_node = node
+        else:
+            self._controller.getScene().sceneChanged.emit(node)
+
+    def _notifyPropertyChanged(self) -> None:
+        if self._batch_depth:
+            self._batch_property_changed = True
+        else:
+            self.propertyChanged.emit()
 
     def _updateEnabled(self):
         plugin_enabled = False
@@ -439,142 +957,93 @@ class TabPlus(Tool):
         self._had_selection = has_selection
  
     # Capsule creation
-    def _createCapsule(self, size, nb , lg, He, lw):
+    def _createCapsule(self, size, segments, lg, He, lw):
         mesh = MeshBuilder()
-        # Per-vertex normals require duplication of vertices
-        r = size / 2
-        # First layer length
-        sup = -lg + He
-        if self._Nb_Layer >1 :
-            sup_c = -lg + (He * 2)
-        else:
-            sup_c = -lg + (He * 3)
-        l = -lg
-        rng = int(360 / nb)
-        ang = math.radians(nb)
-
-        r_sup=math.tan(math.radians(45))*(He * 3)+r
-        # Top inside radius 
-        ri=r_sup-(1.8*lw)
-        # Top radius 
-        rit=r-(1.8*lw)
-            
-        verts = []
-        for i in range(0, rng):
-            # Top
-            verts.append([ri*math.cos(i*ang), sup_c, ri*math.sin(i*ang)])
-            verts.append([r_sup*math.cos((i+1)*ang), sup_c, r_sup*math.sin((i+1)*ang)])
-            verts.append([r_sup*math.cos(i*ang), sup_c, r_sup*math.sin(i*ang)])
-            
-            verts.append([ri*math.cos((i+1)*ang), sup_c, ri*math.sin((i+1)*ang)])
-            verts.append([r_sup*math.cos((i+1)*ang), sup_c, r_sup*math.sin((i+1)*ang)])
-            verts.append([ri*math.cos(i*ang), sup_c, ri*math.sin(i*ang)])
-
-            #Side 1a
-            verts.append([r_sup*math.cos(i*ang), sup_c, r_sup*math.sin(i*ang)])
-            verts.append([r_sup*math.cos((i+1)*ang), sup_c, r_sup*math.sin((i+1)*ang)])
-            verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
-            
-            #Side 1b
-            verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
-            verts.append([r*math.cos(i*ang), l, r*math.sin(i*ang)])
-            verts.append([r_sup*math.cos(i*ang), sup_c, r_sup*math.sin(i*ang)])
- 
-            #Side 2a
-            verts.append([rit*math.cos((i+1)*ang), sup, rit*math.sin((i+1)*ang)])
-            verts.append([ri*math.cos((i+1)*ang), sup_c, ri*math.sin((i+1)*ang)])
-            verts.append([ri*math.cos(i*ang), sup_c, ri*math.sin(i*ang)])
-            
-            #Side 2b
-            verts.append([ri*math.cos(i*ang), sup_c, ri*math.sin(i*ang)])
-            verts.append([rit*math.cos(i*ang), sup, rit*math.sin(i*ang)])
-            verts.append([rit*math.cos((i+1)*ang), sup, rit*math.sin((i+1)*ang)])
-                
-            #Bottom Top
-            verts.append([0, sup, 0])
-            verts.append([rit*math.cos((i+1)*ang), sup, rit*math.sin((i+1)*ang)])
-            verts.append([rit*math.cos(i*ang), sup, rit*math.sin(i*ang)])
-            
-            #Bottom 
-            verts.append([0, l, 0])
-            verts.append([r*math.cos(i*ang), l, r*math.sin(i*ang)])
-            verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)]) 
-            
-            
-        mesh.setVertices(numpy.asarray(verts, dtype=numpy.float32))
-
-        indices = []
-        # for every angle increment 24 Vertices
-        tot = rng * 24
-        for i in range(0, tot, 3): # 
-            indices.append([i, i+1, i+2])
-        mesh.setIndices(numpy.asarray(indices, dtype=numpy.int32))
-
-        mesh.calculateNormals()
+        # Indexed mesh, ring vertices are shared and normals are analytic
+        verts, normals, indices = TabMesh.capsuleMesh(size, segments, lg, He, lw, self._Nb_Layer)
+        mesh.setVertices(verts)
+        mesh.setNormals(normals)
+        mesh.setIndices(indices)
         return mesh
         
     # Cylinder creation
-    def _createPastille(self, size, nb , lg, He):
+    def _createPastille(self, size, segments, lg, He):
         mesh = MeshBuilder()
-        # Per-vertex normals require duplication of vertices
-        r = size / 2
-        # First layer length
-        sup = -lg + He
-        l = -lg
-        rng = int(360 / nb)
-        ang = math.radians(nb)
-        
-        verts = []
-        for i in range(0, rng):
-            # Top
-            verts.append([0, sup, 0])
-            verts.append([r*math.cos((i+1)*ang), sup, r*math.sin((i+1)*ang)])
-            verts.append([r*math.cos(i*ang), sup, r*math.sin(i*ang)])
-            #Side 1a
-            verts.append([r*math.cos(i*ang), sup, r*math.sin(i*ang)])
-            verts.append([r*math.cos((i+1)*ang), sup, r*math.sin((i+1)*ang)])
-            verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
-            #Side 1b
-            verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
-            verts.append([r*math.cos(i*ang), l, r*math.sin(i*ang)])
-            verts.append([r*math.cos(i*ang), sup, r*math.sin(i*ang)])
-            #Bottom 
-            verts.append([0, l, 0])
-            verts.append([r*math.cos(i*ang), l, r*math.sin(i*ang)])
-            verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])          
-            
-        mesh.setVertices(numpy.asarray(verts, dtype=numpy.float32))
-
-        indices = []
-        # for every angle increment 12 Vertices
-        tot = rng * 12
-        for i in range(0, tot, 3): # 
-            indices.append([i, i+1, i+2])
-        mesh.setIndices(numpy.asarray(indices, dtype=numpy.int32))
-
-        mesh.calculateNormals()
+        # Indexed mesh, ring vertices are shared and normals are analytic
+        verts, normals, indices = TabMesh.pastilleMesh(size, segments, lg, He)
+        mesh.setVertices(verts)
+        mesh.setNormals(normals)
+        mesh.setIndices(indices)
         return mesh
  
     def removeAllSupportMesh(self):
-        if self._all_picked_node:
-            for node in self._all_picked_node:
-                node_stack = node.callDecoration("getStack")
-                if node_stack.getProperty("support_mesh", "value"):
-                    self._removeSupportMesh(node)
+        with self._batch():
+            self._removeAllSupportMesh()
+
+    def _removeAllSupportMesh(self):
+        if self._all_picked_node or self._all_picked_tab:
+            # Remove Last : the nodes and the tabs added to the existing merged support meshes
+            nodes = self._all_picked_node
+            tabs = self._all_picked_tab
             self._all_picked_node = []
+            self._all_picked_tab = []
             self._SMsg = catalog.i18nc("@label", "Remove All") 
-            self.propertyChanged.emit()
-        else:        
-            for node in DepthFirstIterator(self._application.getController().getScene().getRoot()):
-                if node.callDecoration("isSliceable"):
-                    # N_Name=node.getName()
-                    # Logger.log('d', 'isSliceable : ' + str(N_Name))
-                    node_stack=node.callDecoration("getStack")           
-                    if node_stack:        
-                        if node_stack.getProperty("support_mesh", "value"):
-                            # N_Name=node.getName()
-                            # Logger.log('d', 'support_mesh : ' + str(N_Name)) 
-                            self._removeSupportMesh(node)
+            self._notifyPropertyChanged()
+        else:
+            nodes = self._registry.getTabs()
+            tabs = []
+        self._removeSupportMeshes(nodes, tabs)
+
+    def _removeSupportMeshes(self, nodes: List[CuraSceneNode], tabs: Optional[List[Tuple[CuraSceneNode, Tab]]] = None) -> None:
+        """
+        Remove tab nodes and tabs of merged support meshes in one undoable operation.
+        
+        param nodes: tab nodes, the nodes already removed from the scene are skipped.
+        param tabs: (node, tab) tabs of merged support meshes, skipped if the tab or its node is already removed.
+        """
+        root = self._controller.getScene().getRoot()
+        op = GroupedOperation()
+        parents = []
+        last_node = None
+
+        removed_nodes = set(nodes)
+        node_tabs = OrderedDict()
+        current_tabs = {}
+        for node, tab in tabs or []:
+            if node.getParent() is None or node in removed_nodes:
+                continue
+            if node not in current_tabs:
+                current_tabs[node] = set(node.callDecoration("getTabs"))
+            if tab in current_tabs[node]:
+                node_tabs.setdefault(node, []).append(tab)
+        for node, removed in node_tabs.items():
+            if len(removed) < node.callDecoration("getTabCount"):
+                op.addOperation(RemoveTabOperation(node, removed))
+            else:
+                # All the tabs of the merged support mesh : the node is removed
+                op.addOperation(RemoveSceneNodeOperation(node))
+            parent = node.getParent()
+            if parent != root and parent not in parents:
+                parents.append(parent)
+            last_node = node
+
+        for node in nodes:
+            parent = node.getParent()
+            if parent is None:
+                continue
+            op.addOperation(RemoveSceneNodeOperation(node))
+            if parent != root and parent not in parents:
+                parents.append(parent)
+            last_node = node
+        if last_node is None:
+            return
+        op.push()
+
+        for parent in parents:
+            if parent.getParent() is not None and not Selection.isSelected(parent):
+                Selection.add(parent)
+
+        self._notifySceneChanged(last_node)
  
     # Source code from MeshTools Plugin 
     # Copyright (c) 2020 Aldo Hoeben / fieldOfView
@@ -595,20 +1064,67 @@ class TabPlus(Tool):
         return []
 
     # Automatix creation    
-    def addAutoSupportMesh(self) -> int:
+    def addAutoSupportMesh(self) -> None:
+        # The tabs are added when the positions are computed
+        self._profiler.reset()
+        self._computeAutoPositions(functools.partial(self._onAutoPositions, time.perf_counter()), self._profiler)
+
+    def _onAutoPositions(self, start_time: float, placements: List[tuple]) -> None:
+        with self._batch():
+            self._addAutoSupportMesh(placements)
+            if self._profiler.enabled:
+                self._profiler.record("total", time.perf_counter() - start_time)
+            self._publishProfile("Automatic addition")
+
+    def _addAutoSupportMesh(self, placements: List[tuple]) -> int:
+        """
+        Add the tabs of the automatic addition in one operation.
+        
+        param placements: list of (object, (k, 2) build plate positions) of _computeAutoPositions.
+        return: number of tabs
+        """
         nb_Tab=0
-        act_position = Vector(99999.99,99999.99,99999.99)
-        first_pt=Vector
 
+        if self._all_picked_node or self._all_picked_tab:
+            self._all_picked_node = []
+            self._all_picked_tab = []
+            self._SMsg = catalog.i18nc("@label", "Remove All") 
+
+        self._newOperation()
+        settings = None
+        start_time = time.perf_counter()
+        for node, kept in placements:
+            if len(kept) and settings is None:
+                with self._profiler.phase("settings"):
+                    settings = TabSettingsSnapshot(self._Nb_Layer)
+            for point in kept:
+                self._createSupportMesh(node, Vector(point[0], 0, point[1]), settings)
+            nb_Tab += len(kept)
+
+        if nb_Tab:
+            Logger.log('d', "Tab creation : {} tabs, {:.2f} ms per tab".format(nb_Tab, (time.perf_counter() - start_time) * 1000 / nb_Tab))
+        with self._profiler.phase("push"):
+            self._op.push() 
+        return nb_Tab
+
+    def _computeAutoPositions(self, callback, profiler: Profiler) -> None:
+        """
+        Tab positions of the automatic addition, on the selected objects or on all the objects.
+        The hulls and the tab positions are computed in worker threads, the callback is called
+        later by the main thread when all the positions are computed : the interface is not
+        blocked during the computation.
+        
+        param callback: function called with the list of (object, (k, 2) build plate positions).
+        param profiler: timings and counters of the computation.
+        """
         nodes_list = self._getAllSelectedNodes()
         if not nodes_list:
             nodes_list = DepthFirstIterator(self._application.getController().getScene().getRoot())
 
-        if self._all_picked_node:
-            self._all_picked_node = []
-            self._SMsg = catalog.i18nc("@label", "Remove All") 
-            
-        self._op = GroupedOperation()   
+        # The scene is only read and modified by the main thread
+        if self._placement_pool is None:
+            self._placement_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        jobs = []
         for node in nodes_list:
             if node.callDecoration("isSliceable"):
                 # Logger.log('d', "isSliceable : {}".format(node.getName()))
@@ -622,58 +1138,154 @@ class TabPlus(Tool):
                     if not type_infill_mesh and not type_support_mesh and not type_anti_overhang_mesh :
                     # and Selection.isSelected(node)
                         Logger.log('d', "Mesh : {}".format(node.getName()))
-                        
-                        #hull_polygon = node.callDecoration("getConvexHull")
-                        if self._AdhesionArea :
-                            hull_polygon = node.callDecoration("getAdhesionArea")
-                        else:
-                            # hull_polygon = node.callDecoration("getConvexHull")
-                            # hull_polygon = node.callDecoration("getConvexHullBoundary")
-                            hull_polygon = node.callDecoration("_compute2DConvexHull")
-                                   
-                        if not hull_polygon or hull_polygon.getPoints is None:
-                            Logger.log("w", "Object {} cannot be calculated because it has no convex hull.".format(node.getName()))
-                            continue
-                            
-                        points=hull_polygon.getPoints()
-                        # nb_pt = point[0] / point[1] must be divided by 2
-                        nb_pt=points.size*0.5
-                        Logger.log('d', "Size pt : {}".format(nb_pt))
-                        
-                        for point in points:
-                            nb_Tab+=1
-                            # Logger.log('d', "Nb_Tab : {}".format(nb_Tab))
-                            if nb_Tab == 1:
-                                first_pt = Vector(point[0], 0, point[1])
-                                # Logger.log('d', "First PT : {}".format(first_pt))
-                                
-                            # Logger.log('d', "Point : {}".format(point))
-                            new_position = Vector(point[0], 0, point[1])
-                            lg=act_position-new_position
-                            lght = lg.length()
-                            # Logger.log('d', "Length : {}".format(lght))
-                            # Add a tab if the distance between 2 tabs are more than a Tab Radius
-                            # We have to tune this parameter or algorythm in the futur
-                            if nb_Tab == nb_pt:
-                                lgfl=(first_pt-new_position).length()
-                                 
-                                # Logger.log('d', "Length First Last : {}".format(lgfl))
-                                if lght >= (self._UseSize*0.7) and lgfl >= (self._UseSize*0.7) :
-                                    self._createSupportMesh(node, new_position)
-                                    act_position = new_position                               
-                            else:
-                                if lght >= (self._UseSize*0.7) :
-                                    self._createSupportMesh(node, new_position)
-                                    act_position = new_position
+                        job = self._submitPlacement(self._placement_pool, node, node_stack, profiler)
+                        if job is not None:
+                            jobs.append((node,) + job)
+
+        # The last job done posts the result to the main thread
+        remaining = [len(jobs)]
+        lock = threading.Lock()
+
+        def onJobDone(future: Future) -> None:
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            self._application.callLater(self._onPlacementDone, jobs, callback, profiler)
+
+        if not jobs:
+            self._application.callLater(self._onPlacementDone, jobs, callback, profiler)
+        for _, _, future in jobs:
+            future.add_done_callback(onJobDone)
+
+    def _onPlacementDone(self, jobs: List[tuple], callback, profiler: Profiler) -> None:
+        """
+        Positions of the jobs of _computeAutoPositions, in the main thread.
+        The positions too close of a tab of the plate, or of a position already kept, are dropped.
+        
+        param jobs: list of (object, cache key, Future of the (k, 2) tab positions).
+        param callback: function called with the list of (object, (k, 2) build plate positions).
+        param profiler: timings and counters of the computation.
+        """
+        # Tab centres of the plate, a tab is not added too close of an other tab
+        # even if the two tabs are on different objects
+        distance = self._MinTabDistance if self._MinTabDistance > 0 else self._UseSize*0.7
+        tab_index = TabPlacement.TabSpatialIndex(distance)
+        for tab_node in self._registry.getTabs():
+            for x, z in self._getTabCentres(tab_node):
+                tab_index.insert(x, z)
+        nb_dropped = 0
+
+        placements = []
+        for node, key, future in jobs:
+            # Object deleted during the computation
+            if node.getParent() is None:
+                continue
+            # Add a tab if the distance between 2 tabs are more than a Tab Radius
+            # We have to tune this parameter or algorythm in the futur
+            try:
+                positions = future.result()
+            except Exception:
+                Logger.logException('e', "Tab positions of {} cannot be calculated".format(node.getName()))
+                continue
+            self._placement_cache.put(node, key, positions)
+            kept = tab_index.filterPositions(positions)
+            nb_dropped += len(positions) - len(kept)
+            profiler.count("dropped", len(positions) - len(kept))
+            placements.append((node, kept))
                                  
-                            # Useless but I keep it for the code example
-                            # Using findObject(id(node))
-                            # act_node = self._controller.getScene().findObject(id(node))
-                            # if act_node:
-                            #     Logger.log('d', "Mesh To Add : {}".format(act_node.getName()))
-                            #     self._createSupportMesh(act_node, Vector(point[0], 0, point[1]))  
-        self._op.push() 
-        return nb_Tab
+        if nb_dropped:
+            Logger.log('d', "Tabs dropped too close of an other tab : {}".format(nb_dropped))
+        Logger.log('d', "Placement cache hits / misses : {} / {}".format(*self._placement_cache.getStats()))
+        callback(placements)
+
+    def _submitPlacement(self, pool: ThreadPoolExecutor, node: CuraSceneNode, node_stack, profiler: Profiler) -> Optional[tuple]:
+        """
+        Read the data of an object needed for the automatic placement and submit the
+        computation of its tab positions.
+        The hull is computed by TabCore like _compute2DConvexHull, except for the adhesion area,
+        the mold and the shrinkage compensation where the hull of Cura is used.
+        In Footprint mode the tabs are placed on the outline of the first layer of the mesh.
+        
+        param pool: executor of the placement.
+        param node: object.
+        param node_stack: stack of the object.
+        param profiler: timings and counters of the computation.
+        return: (cache key, Future of the (k, 2) tab positions), None if the object has no outline
+        """
+        spacing = self._UseSize*0.7
+        mesh_data = node.getMeshData()
+        matrix = node.getWorldTransformation().getData().copy()
+        shrinkage = node_stack.getProperty("material_shrinkage_percentage_xy", "value")
+        mold = node_stack.getProperty("mold_enabled", "value")
+        # Horizontal expansion of the hull
+        offset = max(node_stack.getProperty("xy_offset", "value") or 0, node_stack.getProperty("xy_offset_layer_0", "value") or 0)
+
+        key = (id(mesh_data), matrix.tobytes(), self._UseSize, self._AdhesionArea, self._Footprint, offset, mold, shrinkage)
+        positions = self._placement_cache.get(node, key)
+        if positions is not None:
+            profiler.count("cached")
+            future = Future()
+            future.set_result(positions)
+            return key, future
+
+        if self._Footprint and mesh_data is not None:
+            return key, pool.submit(profiler.wrap("hull", TabPlacement.footprintTabPositions), mesh_data.getVertices(), mesh_data.getIndices(), matrix, spacing)
+
+        if self._AdhesionArea or mesh_data is None or mold or (shrinkage is not None and shrinkage != 100):
+            if self._AdhesionArea :
+                hull_polygon = node.callDecoration("getAdhesionArea")
+            else:
+                # hull_polygon = node.callDecoration("getConvexHull")
+                # hull_polygon = node.callDecoration("getConvexHullBoundary")
+                hull_polygon = node.callDecoration("_compute2DConvexHull")
+                       
+            if not hull_polygon or hull_polygon.getPoints is None:
+                Logger.log("w", "Object {} cannot be calculated because it has no convex hull.".format(node.getName()))
+                return None
+                
+            points=hull_polygon.getPoints()
+            if points.size == 0:
+                return None
+            return key, pool.submit(profiler.wrap("hull", TabPlacement.selectTabPositions), numpy.array(points), spacing)
+
+        vertices = mesh_data.getConvexHullVertices()
+        if vertices is None:
+            vertices = mesh_data.getVertices()
+        return key, pool.submit(profiler.wrap("hull", TabPlacement.meshTabPositions), vertices, matrix, offset, spacing)
+
+    def _getTabCentres(self, node: CuraSceneNode) -> List[tuple]:
+        """
+        Build plate position of the tabs of a support mesh node.
+        
+        param node: tab node.
+        return: list of (x, z), empty if the node is not in the scene anymore
+        """
+        if node.getParent() is None:
+            return []
+        if node.callDecoration("isTabGroup"):
+            return [(p[0], p[2]) for p in node.callDecoration("getTabWorldPositions")]
+        position = node.getWorldPosition()
+        return [(position.x, position.z)]
+
+    def _publishProfile(self, title: str) -> None:
+        """
+        Log the timings of the profiler and show them in the tool panel (SProfile).
+        The hull time is the sum of the worker threads.
+        
+        param title: name of the measured action.
+        """
+        if not self._profiler.enabled:
+            return
+        self._SProfile = self._profiler.summary()
+        Logger.log('d', "{} profile :\n{}".format(title, self._SProfile))
+        self._notifyPropertyChanged()
+
+    def getSProfile(self) -> str:
+        """ 
+            return: timings of the last tab creation as text, empty if the profiling is off.
+        """ 
+        return self._SProfile
 
     def getSMsg(self) -> bool:
         """ 
@@ -782,3 +1394,30 @@ class TabPlus(Tool):
         self._AdhesionArea = SArea
         self._preferences.setValue("tab_plus/adhesion_area", SArea)
 
+    def getSFootprint(self) -> bool:
+        """ 
+            return: golabl _Footprint  as boolean
+        """           
+        return self._Footprint
+  
+    def setSFootprint(self, SFootprint: bool) -> None:
+        """
+        param SFootprint: as boolean.
+        """
+        self._Footprint = SFootprint
+        self._preferences.setValue("tab_plus/footprint", SFootprint)
+
+    def getSPreview(self) -> bool:
+        """ 
+            return: golabl _Preview  as boolean
+        """           
+        return self._Preview
+  
+    def setSPreview(self, SPreview: bool) -> None:
+        """
+        param SPreview: as boolean.
+        """
+        self._Preview = SPreview
+        self._preferences.setValue("tab_plus/preview", SPreview)
+        # Text of the addition button
+        self.propertyChanged.emit()
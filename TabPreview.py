@@ -0,0 +1,85 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Preview of the automatic addition : tab positions drawn as transparent discs
+#
+# The preview is a plain SceneNode (not sliceable, not selectable, no mesh data) so it does
+# not start a slice. Every disc is one item of the same render batch with a shared mesh,
+# only the transformation changes.
+#--------------------------------------------------------------------------------------------
+
+import numpy
+
+from typing import List, Optional
+
+from UM.Math.Color import Color
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshData import MeshData
+from UM.Resources import Resources
+from UM.Scene.SceneNode import SceneNode
+from UM.View.GL.OpenGL import OpenGL
+
+from .TabCore import TabMesh
+
+# Height of the discs, drawn just over the build plate
+DISC_HEIGHT = 0.2
+
+
+def createDiscMesh(size: float, segments: int) -> MeshData:
+    """ Disc of the preview, centered on the origin.
+
+    param size: tab diameter in mm.
+    param segments: number of angle segments.
+    return: MeshData
+    """
+    mesh = MeshBuilder()
+    verts, normals, indices = TabMesh.pastilleMesh(size, segments, 0, DISC_HEIGHT)
+    mesh.setVertices(verts)
+    mesh.setNormals(normals)
+    mesh.setIndices(indices)
+    return mesh.build()
+
+
+class TabPreviewNode(SceneNode):
+    _shader = None
+
+    def __init__(self, parent: Optional[SceneNode] = None) -> None:
+        super().__init__(parent)
+        self.setName("TabPlusPreview")
+        self.setSelectable(False)
+        self.setCalculateBoundingBox(False)
+        self._disc = None  # type: Optional[MeshData]
+        self._transformations = []  # type: List[Matrix]
+
+    def setTabs(self, disc: MeshData, positions: numpy.ndarray) -> None:
+        """
+        param disc: shared disc mesh.
+        param positions: (n, 2) build plate positions (x, z).
+        """
+        self._disc = disc
+        self._transformations = []
+        for x, z in positions:
+            transformation = Matrix()
+            transformation.setByTranslation(Vector(float(x), 0, float(z)))
+            self._transformations.append(transformation)
+
+    def getTabCount(self) -> int:
+        return len(self._transformations)
+
+    def render(self, renderer) -> bool:
+        if not self._transformations:
+            return True
+        if TabPreviewNode._shader is None:
+            TabPreviewNode._shader = OpenGL.getInstance().createShaderProgram(Resources.getPath(Resources.Shaders, "transparent_object.shader"))
+            TabPreviewNode._shader.setUniformValue("u_diffuseColor", Color(0.2, 0.6, 1.0, 1.0))
+            TabPreviewNode._shader.setUniformValue("u_opacity", 0.5)
+
+        batch = renderer.getNamedBatch("tab_plus_preview")
+        if not batch:
+            batch = renderer.createRenderBatch(transparent = True, shader = TabPreviewNode._shader, backface_cull = True, sort = -8)
+            renderer.addRenderBatch(batch, name = "tab_plus_preview")
+        for transformation in self._transformations:
+            batch.addItem(transformation, self._disc)
+        return True
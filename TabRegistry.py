@@ -0,0 +1,113 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Registry of the tab nodes of the scene
+#
+# Tab nodes carry a TabNodeDecorator and are indexed by their parent object with weak
+# references : a removed tab is released as soon as nothing else (undo stack ...) holds it.
+# The decorator follows the parent of its node : the copies of the tabs (Multiply, copy /
+# paste of an object with its tabs) and the tabs moved to an other object are indexed too.
+#--------------------------------------------------------------------------------------------
+
+from typing import List, Optional
+from weakref import WeakKeyDictionary, WeakSet
+
+from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
+from UM.Scene.SceneNode import SceneNode
+from UM.Scene.SceneNodeDecorator import SceneNodeDecorator
+
+# Name of the tab nodes, kept in the projects
+TAB_NODE_NAME = "RoundTab"
+
+
+class TabNodeDecorator(SceneNodeDecorator):
+    """ Marker of the support mesh nodes created by Tab Plus, registers its node when the parent changes """
+
+    def __init__(self, registry: Optional["TabRegistry"] = None) -> None:
+        super().__init__()
+        self._registry = registry
+
+    def setNode(self, node: SceneNode) -> None:
+        super().setNode(node)
+        node.parentChanged.connect(self._onParentChanged)
+
+    def isTabPlusTab(self) -> bool:
+        return True
+
+    def _onParentChanged(self, *args) -> None:
+        parent = self._node.getParent()
+        if parent is not None and self._registry is not None:
+            self._registry.register(parent, self._node)
+
+    def __deepcopy__(self, memo):
+        # The copy of the node is indexed when it is added to the copy of the object
+        return TabNodeDecorator(self._registry)
+
+
+class TabRegistry:
+    def __init__(self, root: Optional[SceneNode] = None) -> None:
+        self._root = root
+        self._tabs = WeakKeyDictionary()  # parent SceneNode -> WeakSet of tab nodes
+
+    def register(self, parent: SceneNode, node: SceneNode) -> None:
+        if not node.callDecoration("isTabPlusTab"):
+            node.addDecorator(TabNodeDecorator(self))
+        tabs = self._tabs.get(parent)
+        if tabs is None:
+            tabs = self._tabs[parent] = WeakSet()
+        tabs.add(node)
+
+    def getTabs(self, parent: Optional[SceneNode] = None) -> List[SceneNode]:
+        """
+        Tabs in the scene.
+
+        param parent: object of the tabs, None for all the objects.
+        return: tab nodes, the tabs removed from the scene (or copied but not added, clipboard) are skipped
+        """
+        if parent is None:
+            return [node for owner, tabs in list(self._tabs.items()) for node in list(tabs)
+                    if node.getParent() is owner and self._inScene(owner)]
+        tabs = self._tabs.get(parent)
+        if tabs is None or not self._inScene(parent):
+            return []
+        return [node for node in list(tabs) if node.getParent() is parent]
+
+    def getTabCount(self) -> int:
+        return len(self.getTabs())
+
+    def _inScene(self, node: SceneNode) -> bool:
+        if self._root is None:
+            return node.getParent() is not None
+        while node is not None:
+            if node is self._root:
+                return True
+            node = node.getParent()
+        return False
+
+    def clear(self) -> None:
+        self._tabs.clear()
+
+    def rebuild(self, root: SceneNode) -> None:
+        """
+        Index again the tabs of the scene, after a project load.
+        The decorators are not saved in the project : a support mesh child of an object is
+        considered as a tab. At the root of the scene (object ungrouped or deleted before the
+        save) only the support meshes with the name of the tabs are taken, not the support
+        meshes of the other plugins.
+
+        param root: root of the scene.
+        """
+        self._root = root
+        self.clear()
+        for node in DepthFirstIterator(root):
+            parent = node.getParent()
+            if parent is None or not node.callDecoration("isSliceable"):
+                continue
+            if node.callDecoration("isTabPlusTab"):
+                self.register(parent, node)
+                continue
+            if parent is root and node.getName() != TAB_NODE_NAME:
+                continue
+            node_stack = node.callDecoration("getStack")
+            if node_stack and node_stack.getProperty("support_mesh", "value"):
+                self.register(parent, node)
@@ -0,0 +1,31 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Shared modules of the post-processing scripts
+#
+# The scripts of resources/scripts import their shared modules from the package _TabPlusGCode.
+# TabPlusGCode has no __init__.py so it is not listed as a script by the PostProcessingPlugin.
+# The package is registered by register() of the plugin, before the PostProcessingPlugin loads
+# the scripts. The folder is found from this file : the plugin folder can have any name
+# (TabPlus-main from a zip of GitHub).
+#--------------------------------------------------------------------------------------------
+
+import os
+import sys
+import types
+
+# Name of the package of the shared modules in sys.modules
+GCODE_PACKAGE = "_TabPlusGCode"
+
+
+def registerGCodePackage() -> types.ModuleType:
+    """ Register the package of the shared modules of the scripts, once
+
+    return: package _TabPlusGCode
+    """
+    package = sys.modules.get(GCODE_PACKAGE)
+    if package is None:
+        package = types.ModuleType(GCODE_PACKAGE)
+        package.__path__ = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "scripts", "TabPlusGCode")]
+        sys.modules[GCODE_PACKAGE] = package
+    return package
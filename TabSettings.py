@@ -0,0 +1,40 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Settings used to create the tabs
+#
+# The values are resolved once from the container stacks at the start of a batch of tabs
+# (automatic addition or one click) and reused by every tab of the batch.
+#--------------------------------------------------------------------------------------------
+
+from cura.CuraApplication import CuraApplication
+
+
+class TabSettingsSnapshot:
+    """ Resolved values of the stacks for one batch of tabs """
+
+    def __init__(self, nb_layer: int) -> None:
+        application = CuraApplication.getInstance()
+        self.global_stack = application.getGlobalContainerStack()
+        self.extruder_stack = application.getExtruderManager().getActiveExtruderStacks()[0]
+        self.extruder_count = self.global_stack.getProperty("machine_extruder_count", "value")
+
+        layer_height_0 = self.extruder_stack.getProperty("layer_height_0", "value")
+        layer_height = self.extruder_stack.getProperty("layer_height", "value")
+        line_width = self.extruder_stack.getProperty("line_width", "value")
+        # Tab height and line width used for the tab mesh
+        self.tab_height = (layer_height_0 * 1.2) + (layer_height * (nb_layer - 1))
+        self.line_width = line_width * 1.2
+
+        # Profile values checked by the fix-ups
+        self.support_type = self.global_stack.getProperty("support_type", "value")
+        self.support_xy_distance = self.extruder_stack.getProperty("support_xy_distance", "value")
+        self.support_infill_rate = self.extruder_stack.getProperty("support_infill_rate", "value")
+        self.brim_replaces_support = self.extruder_stack.getProperty("brim_replaces_support", "value")
+
+        # Definitions of the settings of the tab nodes
+        self.definitions = {key: self.global_stack.getSettingDefinition(key)
+                            for key in ("support_mesh", "support_mesh_drop_down", "support_xy_distance")}
+
+        # Profile fix-ups done for this batch
+        self.fixed = False
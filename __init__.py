@@ -8,6 +8,7 @@ except ImportError:
     VERSION_QT5 = True
     
 from . import TabPlus
+from . import TabScripts
 
 from UM.i18n import i18nCatalog
 i18n_catalog = i18nCatalog("tabplus")
@@ -29,4 +30,6 @@ def getMetaData():
     }
 
 def register(app):
+    # Shared modules of the post-processing scripts, before the PostProcessingPlugin loads them
+    TabScripts.registerGCodePackage()
     return { "tool": TabPlus.TabPlus() }
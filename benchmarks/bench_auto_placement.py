@@ -0,0 +1,188 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Benchmark of the automatic addition on synthetic build plates
+#
+# The tool runs against the stand-ins of cura_stubs (no Cura needed). For every plate the
+# wall time, the tabs per second, the peak memory (tracemalloc, measured in an other run)
+# and the time of the phases (hull, spacing, mesh, push) are reported. Hull and spacing run
+# in worker threads, their time is the sum over the threads. The wall time runs up to the
+# creation of the tabs by the event loop (callLater of the stand-in application).
+# Run from the plugin folder :
+#     python benchmarks/bench_auto_placement.py --json results.json
+#--------------------------------------------------------------------------------------------
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+import numpy
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PLUGIN_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+import cura_stubs  # noqa: E402
+
+cura_stubs.install()
+
+# The plugin is loaded as the package "TabPlus" without running its __init__ (register)
+_package = types.ModuleType("TabPlus")
+_package.__path__ = [PLUGIN_DIR]
+sys.modules["TabPlus"] = _package
+TabPlusModule = importlib.import_module("TabPlus.TabPlus")
+TabPlacement = importlib.import_module("TabPlus.TabCore.TabPlacement")
+TabHull = importlib.import_module("TabPlus.TabCore.TabHull")
+
+# Hull vertices of the parts : simple and high point count
+HULLS = {"simple": 32, "dense": 4096}
+
+
+class PhaseTimer:
+    """ Cumulated time of the wrapped functions, thread safe """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.times = {}
+        self.calls = {}
+
+    def wrap(self, phase: str, function):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.times[phase] = self.times.get(phase, 0.0) + elapsed
+                    self.calls[phase] = self.calls.get(phase, 0) + 1
+        return timed
+
+    def reset(self) -> None:
+        self.times = {}
+        self.calls = {}
+
+
+TIMER = PhaseTimer()
+TabHull.buildPlateHull = TIMER.wrap("hull", TabHull.buildPlateHull)
+TabPlacement.selectTabPositions = TIMER.wrap("spacing", TabPlacement.selectTabPositions)
+TabPlusModule.TabPlus._createSupportMesh = TIMER.wrap("mesh", TabPlusModule.TabPlus._createSupportMesh)
+cura_stubs.GroupedOperation.push = TIMER.wrap("push", cura_stubs.GroupedOperation.push)
+
+
+def buildPlate(nb_parts: int, hull: str) -> None:
+    """ Parts on a grid on a new scene """
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    root = application.getController().getScene().getRoot()
+    mesh_data = cura_stubs.cylinder(8.0, 10.0, HULLS[hull])
+    columns = int(numpy.ceil(numpy.sqrt(nb_parts)))
+    for number in range(nb_parts):
+        node = cura_stubs.CuraSceneNode(name = "Part {}".format(number))
+        node.addDecorator(cura_stubs.SliceableObjectDecorator())
+        node.setMeshData(mesh_data)
+        node.setPosition(cura_stubs.Vector((number % columns) * 20.0, 0, (number // columns) * 20.0))
+        node.setParent(root)
+
+
+def addAutoTabs(tool) -> int:
+    """ Automatic addition, the event loop runs until the tabs of the positions computed in the worker threads are created
+
+    return: number of tabs created
+    """
+    nb_tabs = TIMER.calls.get("mesh", 0)
+    tool.addAutoSupportMesh()
+    cura_stubs.CuraApplication.getInstance().processEvents(wait = True)
+    return TIMER.calls.get("mesh", 0) - nb_tabs
+
+
+def peakMemory(nb_parts: int, hull: str) -> int:
+    """ Peak memory of the automatic addition, in a separate run as tracemalloc slows down the code """
+    buildPlate(nb_parts, hull)
+    tool = TabPlusModule.TabPlus()
+    tracemalloc.start()
+    addAutoTabs(tool)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(nb_parts: int, hull: str) -> dict:
+    peak = peakMemory(nb_parts, hull)
+
+    buildPlate(nb_parts, hull)
+    tool = TabPlusModule.TabPlus()
+    TIMER.reset()
+    cura_stubs.ContainerStack.lookups = 0
+
+    start = time.perf_counter()
+    nb_tabs = addAutoTabs(tool)
+    wall = time.perf_counter() - start
+    phases = dict(TIMER.times)
+    calls = dict(TIMER.calls)
+    lookups = cura_stubs.ContainerStack.lookups
+
+    # Same plate again : placement cache, every tab already exists
+    start = time.perf_counter()
+    addAutoTabs(tool)
+    repeat = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tool.removeAllSupportMesh()
+    remove = time.perf_counter() - start
+
+    return {
+        "parts": nb_parts,
+        "hull": hull,
+        "tabs": nb_tabs,
+        "wall_s": wall,
+        "tabs_per_s": nb_tabs / wall if wall > 0 else 0.0,
+        "peak_memory_kib": peak / 1024,
+        "phases_s": {phase: phases.get(phase, 0.0) for phase in ("hull", "spacing", "mesh", "push")},
+        "phase_calls": calls,
+        "stack_lookups": lookups,
+        "repeat_s": repeat,
+        "remove_all_s": remove,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "Benchmark of the automatic addition")
+    parser.add_argument("--parts", default = "1,50,500", help = "part counts of the plates (default 1,50,500)")
+    parser.add_argument("--hulls", default = ",".join(HULLS), help = "hull types (default simple,dense)")
+    parser.add_argument("--json", default = None, help = "write the results in a JSON file")
+    options = parser.parse_args()
+
+    results = []
+    print("{:>6} {:>7} {:>6} {:>9} {:>9} {:>9} | {:>8} {:>8} {:>8} {:>8} | {:>8} {:>8}".format(
+        "parts", "hull", "tabs", "wall ms", "tabs/s", "peak KiB", "hull", "spacing", "mesh", "push", "repeat", "remove"))
+    for hull in options.hulls.split(","):
+        for nb_parts in [int(value) for value in options.parts.split(",")]:
+            result = run(nb_parts, hull)
+            results.append(result)
+            phases = result["phases_s"]
+            print("{:>6} {:>7} {:>6} {:9.1f} {:9.0f} {:9.0f} | {:8.1f} {:8.1f} {:8.1f} {:8.1f} | {:8.1f} {:8.1f}".format(
+                nb_parts, hull, result["tabs"], result["wall_s"] * 1000, result["tabs_per_s"], result["peak_memory_kib"],
+                phases["hull"] * 1000, phases["spacing"] * 1000, phases["mesh"] * 1000, phases["push"] * 1000,
+                result["repeat_s"] * 1000, result["remove_all_s"] * 1000))
+
+    if options.json:
+        with open(options.json, "w") as stream:
+            json.dump({
+                "python": platform.python_version(),
+                "numpy": numpy.__version__,
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "results": results,
+            }, stream, indent = 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Benchmark of the post-processing scripts on a large synthetic G-code
+#
+# Compare the scripts up to V1.1.5 (tests/baseline) with the scripts on the shared G-code
+# modules (TabPlusGCode). The current scripts are timed twice : with their layer range (the
+# layers after the range are not read) and with the range removed, every layer is read as
+# the baseline scripts do. The results of the three runs are checked.
+# FastFirstInfill is also timed on a large first layer (time and peak memory of the run).
+# The scripts run on the stand-ins of tests/conftest (pytest is needed).
+# Run from the plugin folder :
+#     python benchmarks/bench_gcode_scripts.py --layers 300 --first-layer 15000
+#--------------------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+TESTS_DIR = os.path.join(os.path.dirname(BENCHMARK_DIR), "tests")
+sys.path.insert(0, TESTS_DIR)
+
+from conftest import BASELINE_DIR, SCRIPTS_DIR, loadScript  # noqa: E402
+from gcode_samples import gcodeData  # noqa: E402
+
+SETTINGS = {
+    "MultiBrim": dict(multiply = 2, speed = 30),
+    "ReduceZBrim": dict(reduce = 0.08, extruder_nb = 1, lcdfeedback = True),
+    "FastFirstInfill": dict(infillspeed = 45),
+}
+
+BASELINE = {name: loadScript(os.path.join(BASELINE_DIR, name + ".py"), name) for name in SETTINGS}
+CURRENT = {name: loadScript(os.path.join(SCRIPTS_DIR, name + ".py"), name) for name in SETTINGS}
+
+# Registered by tests/conftest
+from _TabPlusGCode.LayerRangeScript import rewriteLayers  # noqa: E402
+
+
+def _script(script_class: type, settings: dict):
+    script = script_class()
+    script._settings = dict(settings)
+    return script
+
+
+def _allLayers(name: str):
+    """ Current script with its layer range removed """
+    settings = SETTINGS[name]
+
+    def execute(data: list) -> list:
+        rewriter = _script(CURRENT[name], settings).createRewriter()
+        rewriter.first_layer = rewriter.last_layer = None
+        return rewriteLayers(data, rewriter)
+    return execute
+
+
+def _time(execute, data: list, repeat: int) -> float:
+    return min(timeit.repeat(lambda: execute(list(data)), number = 1, repeat = repeat))
+
+
+def _peak(execute, data: list) -> float:
+    """ Peak memory of a run in MiB """
+    data = list(data)
+    tracemalloc.start()
+    execute(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def _firstLayer(options: argparse.Namespace) -> None:
+    """ FastFirstInfill on G-code with a large layer 0 """
+    data = gcodeData(layers = options.layers, segments = options.segments)
+    # Elements 0 and 1 are the start G-code, 2 is the layer 0
+    data[2] = gcodeData(layers = 1, segments = options.first_layer)[2]
+    settings = SETTINGS["FastFirstInfill"]
+    baseline = _script(BASELINE["FastFirstInfill"], settings).execute
+    current = _script(CURRENT["FastFirstInfill"], settings).execute
+    assert current(list(data)) == baseline(list(data))
+    print("FastFirstInfill, layer 0 of {:d} lines".format(data[2].count("\n")))
+    print("{:>16} {:>12} {:>12}".format("", "baseline", "current"))
+    print("{:>16} {:12.1f} {:12.1f}".format("ms", _time(baseline, data, options.repeat) * 1000,
+                                              _time(current, data, options.repeat) * 1000))
+    print("{:>16} {:12.1f} {:12.1f}".format("peak MiB", _peak(baseline, data), _peak(current, data)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "Benchmark of the post-processing scripts")
+    parser.add_argument("--layers", type = int, default = 300, help = "layers of the G-code (default 300)")
+    parser.add_argument("--segments", type = int, default = 100, help = "extrusions per section (default 100)")
+    parser.add_argument("--first-layer", type = int, default = 15000, help = "extrusions per section of the large layer 0 (default 15000)")
+    parser.add_argument("--repeat", type = int, default = 5, help = "runs per script, the best is kept (default 5)")
+    options = parser.parse_args()
+
+    data = gcodeData(layers = options.layers, segments = options.segments)
+    nb_lines = sum(layer.count("\n") for layer in data)
+    print("{:d} layers, {:d} lines".format(options.layers, nb_lines))
+    print("{:>16} {:>12} {:>12} {:>12}".format("script", "baseline ms", "range ms", "all layers ms"))
+    for name, settings in SETTINGS.items():
+        baseline = _script(BASELINE[name], settings).execute
+        current = _script(CURRENT[name], settings).execute
+        all_layers = _allLayers(name)
+        expected = baseline(list(data))
+        assert current(list(data)) == expected and all_layers(list(data)) == expected, name
+        print("{:>16} {:12.1f} {:12.1f} {:12.1f}".format(name,
+              _time(baseline, data, options.repeat) * 1000,
+              _time(current, data, options.repeat) * 1000,
+              _time(all_layers, data, options.repeat) * 1000))
+    print()
+    _firstLayer(options)
+
+
+if __name__ == "__main__":
+    main()
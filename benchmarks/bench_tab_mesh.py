@@ -0,0 +1,152 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Micro-benchmark of the tab mesh builders
+#
+# Compare the per-vertex Python loop (triangle soup) used up to V1.1.5 with the indexed
+# numpy builders of TabCore.
+# Run from the plugin folder :
+#     python benchmarks/bench_tab_mesh.py
+#--------------------------------------------------------------------------------------------
+
+import math
+import os
+import sys
+import timeit
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TabCore import TabMesh  # noqa: E402
+
+
+def legacyCapsule(size, nb, lg, He, lw, nb_layer):
+    r = size / 2
+    sup = -lg + He
+    if nb_layer > 1:
+        sup_c = -lg + (He * 2)
+    else:
+        sup_c = -lg + (He * 3)
+    l = -lg
+    rng = int(360 / nb)
+    ang = math.radians(nb)
+
+    r_sup = math.tan(math.radians(45)) * (He * 3) + r
+    ri = r_sup - (1.8 * lw)
+    rit = r - (1.8 * lw)
+
+    verts = []
+    for i in range(0, rng):
+        verts.append([ri*math.cos(i*ang), sup_c, ri*math.sin(i*ang)])
+        verts.append([r_sup*math.cos((i+1)*ang), sup_c, r_sup*math.sin((i+1)*ang)])
+        verts.append([r_sup*math.cos(i*ang), sup_c, r_sup*math.sin(i*ang)])
+        verts.append([ri*math.cos((i+1)*ang), sup_c, ri*math.sin((i+1)*ang)])
+        verts.append([r_sup*math.cos((i+1)*ang), sup_c, r_sup*math.sin((i+1)*ang)])
+        verts.append([ri*math.cos(i*ang), sup_c, ri*math.sin(i*ang)])
+        verts.append([r_sup*math.cos(i*ang), sup_c, r_sup*math.sin(i*ang)])
+        verts.append([r_sup*math.cos((i+1)*ang), sup_c, r_sup*math.sin((i+1)*ang)])
+        verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
+        verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
+        verts.append([r*math.cos(i*ang), l, r*math.sin(i*ang)])
+        verts.append([r_sup*math.cos(i*ang), sup_c, r_sup*math.sin(i*ang)])
+        verts.append([rit*math.cos((i+1)*ang), sup, rit*math.sin((i+1)*ang)])
+        verts.append([ri*math.cos((i+1)*ang), sup_c, ri*math.sin((i+1)*ang)])
+        verts.append([ri*math.cos(i*ang), sup_c, ri*math.sin(i*ang)])
+        verts.append([ri*math.cos(i*ang), sup_c, ri*math.sin(i*ang)])
+        verts.append([rit*math.cos(i*ang), sup, rit*math.sin(i*ang)])
+        verts.append([rit*math.cos((i+1)*ang), sup, rit*math.sin((i+1)*ang)])
+        verts.append([0, sup, 0])
+        verts.append([rit*math.cos((i+1)*ang), sup, rit*math.sin((i+1)*ang)])
+        verts.append([rit*math.cos(i*ang), sup, rit*math.sin(i*ang)])
+        verts.append([0, l, 0])
+        verts.append([r*math.cos(i*ang), l, r*math.sin(i*ang)])
+        verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
+    vertices = numpy.asarray(verts, dtype=numpy.float32)
+
+    indices = []
+    for i in range(0, rng * 24, 3):
+        indices.append([i, i+1, i+2])
+    return vertices, numpy.asarray(indices, dtype=numpy.int32)
+
+
+def legacyPastille(size, nb, lg, He):
+    r = size / 2
+    sup = -lg + He
+    l = -lg
+    rng = int(360 / nb)
+    ang = math.radians(nb)
+
+    verts = []
+    for i in range(0, rng):
+        verts.append([0, sup, 0])
+        verts.append([r*math.cos((i+1)*ang), sup, r*math.sin((i+1)*ang)])
+        verts.append([r*math.cos(i*ang), sup, r*math.sin(i*ang)])
+        verts.append([r*math.cos(i*ang), sup, r*math.sin(i*ang)])
+        verts.append([r*math.cos((i+1)*ang), sup, r*math.sin((i+1)*ang)])
+        verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
+        verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
+        verts.append([r*math.cos(i*ang), l, r*math.sin(i*ang)])
+        verts.append([r*math.cos(i*ang), sup, r*math.sin(i*ang)])
+        verts.append([0, l, 0])
+        verts.append([r*math.cos(i*ang), l, r*math.sin(i*ang)])
+        verts.append([r*math.cos((i+1)*ang), l, r*math.sin((i+1)*ang)])
+    vertices = numpy.asarray(verts, dtype=numpy.float32)
+
+    indices = []
+    for i in range(0, rng * 12, 3):
+        indices.append([i, i+1, i+2])
+    return vertices, numpy.asarray(indices, dtype=numpy.int32)
+
+
+def _triangles(vertices, indices):
+    """ Triangles as a sorted list of rounded coordinates, every triangle starting on its smallest vertex """
+    triangles = []
+    for face in numpy.round(vertices[indices], 4).tolist():
+        start = face.index(min(face))
+        triangles.append(tuple(map(tuple, face[start:] + face[:start])))
+    return sorted(triangles)
+
+
+def _checkMesh(label, legacy, current):
+    """ The indexed mesh must describe the same triangles (same orientation) as the triangle soup """
+    v_old, i_old = legacy
+    v_new, n_new, i_new = current
+    assert _triangles(v_old, i_old) == _triangles(v_new, i_new), label
+    # Analytic normals on the side of the face normals
+    faces = v_new[i_new]
+    face_normals = numpy.cross(faces[:, 1] - faces[:, 0], faces[:, 2] - faces[:, 0])
+    assert (numpy.einsum("ij,ikj->ik", face_normals, n_new[i_new]) > 0).all(), label
+    bytes_old = v_old.nbytes * 2 + i_old.nbytes  # vertices + calculated normals
+    bytes_new = v_new.nbytes + n_new.nbytes + i_new.nbytes
+    print("{:<10} vertices {:5d} -> {:5d}   buffers {:6d} -> {:6d} bytes".format(
+        label, v_old.shape[0], v_new.shape[0], bytes_old, bytes_new))
+
+
+def _report(label, legacy, current, number):
+    t_legacy = min(timeit.repeat(legacy, number=number, repeat=5)) / number
+    t_current = min(timeit.repeat(current, number=number, repeat=5)) / number
+    print("{:<10} legacy {:8.1f} us   numpy {:8.1f} us   x{:.1f}".format(
+        label, t_legacy * 1e6, t_current * 1e6, t_legacy / t_current))
+
+
+def main():
+    size, nb, lg, He, lw = 10.0, 10, 2.5, 0.24, 0.48
+
+    _checkMesh("capsule", legacyCapsule(size, nb, lg, He, lw, 1), TabMesh.capsuleMesh(size, int(360 / nb), lg, He, lw, 1))
+    _checkMesh("capsule/3", legacyCapsule(size, nb, lg, He, lw, 3), TabMesh.capsuleMesh(size, int(360 / nb), lg, He, lw, 3))
+    _checkMesh("pastille", legacyPastille(size, nb, lg, He), TabMesh.pastilleMesh(size, int(360 / nb), lg, He))
+
+    number = 500
+    _report("capsule",
+            lambda: legacyCapsule(size, nb, lg, He, lw, 1),
+            lambda: TabMesh.capsuleMesh(size, int(360 / nb), lg, He, lw, 1),
+            number)
+    _report("pastille",
+            lambda: legacyPastille(size, nb, lg, He),
+            lambda: TabMesh.pastilleMesh(size, int(360 / nb), lg, He),
+            number)
+
+
+if __name__ == "__main__":
+    main()
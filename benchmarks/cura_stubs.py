@@ -0,0 +1,719 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Lightweight stand-ins of the PyQt / Uranium / Cura modules used by the tool
+#
+# Only the behaviour needed to run the tool without Cura is implemented : scene nodes,
+# decorators, container stacks, preferences, operations and signals. install() registers
+# the modules in sys.modules, it must be called before the plugin is imported.
+#--------------------------------------------------------------------------------------------
+
+import queue
+import sys
+import traceback
+import types
+
+from copy import deepcopy
+
+import numpy
+
+# Profile values of the stacks
+DEFAULT_SETTINGS = {
+    "machine_extruder_count": 1,
+    "layer_height_0": 0.2,
+    "layer_height": 0.2,
+    "line_width": 0.4,
+    "support_type": "everywhere",
+    "support_xy_distance": 0.16,
+    "support_infill_rate": 100,
+    "brim_replaces_support": False,
+    "support_mesh": False,
+    "support_mesh_drop_down": True,
+    "infill_mesh": False,
+    "cutting_mesh": False,
+    "anti_overhang_mesh": False,
+    "xy_offset": 0,
+    "xy_offset_layer_0": 0,
+    "mold_enabled": False,
+    "material_shrinkage_percentage_xy": 100,
+}
+
+
+class Signal:
+    def __init__(self, *args, **kwargs) -> None:
+        self._slots = []
+
+    def connect(self, slot) -> None:
+        self._slots.append(slot)
+
+    def disconnect(self, slot) -> None:
+        if slot in self._slots:
+            self._slots.remove(slot)
+
+    def emit(self, *args) -> None:
+        for slot in self._slots[:]:
+            slot(*args)
+
+
+class _Anything:
+    """ Attribute / call sink for the Qt and UI objects """
+
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def __getattr__(self, name):
+        return _Anything()
+
+    def __call__(self, *args, **kwargs):
+        return _Anything()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __and__(self, other):
+        return False
+
+
+def _decorator(*args, **kwargs):
+    return lambda function: function
+
+
+class Vector:
+    def __init__(self, x: float = 0, y: float = 0, z: float = 0) -> None:
+        self.x, self.y, self.z = float(x), float(y), float(z)
+
+
+class Matrix:
+    def __init__(self, data = None) -> None:
+        self._data = numpy.identity(4) if data is None else numpy.array(data, dtype=numpy.float64)
+
+    def getData(self) -> numpy.ndarray:
+        return self._data
+
+    def setByTranslation(self, direction: "Vector") -> None:
+        self._data = numpy.identity(4)
+        self._data[:3, 3] = (direction.x, direction.y, direction.z)
+
+
+class MeshData:
+    def __init__(self, vertices = None, normals = None, indices = None, **kwargs) -> None:
+        self._vertices, self._normals, self._indices = vertices, normals, indices
+
+    def getVertices(self):
+        return self._vertices
+
+    def getNormals(self):
+        return self._normals
+
+    def getIndices(self):
+        return self._indices
+
+    def getConvexHullVertices(self):
+        # No scipy 3D hull : all the vertices
+        return self._vertices
+
+
+class MeshBuilder:
+    def __init__(self) -> None:
+        self._vertices = self._normals = self._indices = None
+
+    def setVertices(self, vertices) -> None:
+        self._vertices = vertices
+
+    def setNormals(self, normals) -> None:
+        self._normals = normals
+
+    def setIndices(self, indices) -> None:
+        self._indices = indices
+
+    def build(self) -> MeshData:
+        return MeshData(vertices = self._vertices, normals = self._normals, indices = self._indices)
+
+
+class SettingDefinition:
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+
+class SettingInstance:
+    def __init__(self, definition: SettingDefinition, container) -> None:
+        self.definition = definition
+        self.values = {}
+
+    def setProperty(self, name: str, value) -> None:
+        self.values[name] = value
+
+    def resetState(self) -> None:
+        pass
+
+
+class InstanceContainer:
+    def __init__(self) -> None:
+        self.instances = {}
+
+    def addInstance(self, instance: SettingInstance) -> None:
+        self.instances[instance.definition.key] = instance
+
+
+class ContainerStack:
+    """ Stack with a top container and a parent stack, counts the property lookups """
+
+    lookups = 0
+
+    def __init__(self, parent = None, values = None) -> None:
+        self._parent = parent
+        self._values = dict(values or {})
+        self._top = InstanceContainer()
+        self.propertyChanged = Signal()
+        self.extruderList = []
+
+    def getTop(self) -> InstanceContainer:
+        return self._top
+
+    def getProperty(self, key: str, property_name: str):
+        ContainerStack.lookups += 1
+        if property_name == "label":
+            return key
+        instance = self._top.instances.get(key)
+        if instance is not None and property_name in instance.values:
+            return instance.values[property_name]
+        if key in self._values:
+            return self._values[key]
+        if self._parent is not None:
+            return self._parent.getProperty(key, property_name)
+        return None
+
+    def setProperty(self, key: str, property_name: str, value) -> None:
+        self._values[key] = value
+        self.propertyChanged.emit(key, property_name)
+
+    def getSettingDefinition(self, key: str) -> SettingDefinition:
+        return SettingDefinition(key)
+
+
+class SceneNodeDecorator:
+    def __init__(self) -> None:
+        self._node = None
+
+    def setNode(self, node) -> None:
+        self._node = node
+
+    def getNode(self):
+        return self._node
+
+
+class SceneNode:
+    class TransformSpace:
+        Local = 1
+        Parent = 2
+        World = 3
+
+    def __init__(self, parent = None, name: str = "") -> None:
+        self._parent = None
+        self._children = []
+        self._decorators = []
+        self._mesh_data = None
+        self._name = name
+        self._transformation = numpy.identity(4)
+        self.transformationChanged = Signal()
+        self.meshDataChanged = Signal()
+        self.parentChanged = Signal()
+        self.childrenChanged = Signal()
+        if parent is not None:
+            self.setParent(parent)
+
+    def getName(self) -> str:
+        return self._name
+
+    def setName(self, name: str) -> None:
+        self._name = name
+
+    def setSelectable(self, selectable: bool) -> None:
+        pass
+
+    def setCalculateBoundingBox(self, calculate: bool) -> None:
+        pass
+
+    def addDecorator(self, decorator: SceneNodeDecorator) -> None:
+        decorator.setNode(self)
+        self._decorators.append(decorator)
+
+    def callDecoration(self, function: str, *args, **kwargs):
+        for decorator in self._decorators:
+            if hasattr(decorator, function):
+                return getattr(decorator, function)(*args, **kwargs)
+        return None
+
+    def getParent(self):
+        return self._parent
+
+    def setParent(self, parent) -> None:
+        # As Uranium : the signals of a child are forwarded by its parent, up to the root of the scene
+        old_parent = self._parent
+        if old_parent is not None:
+            old_parent._children.remove(self)
+            self._forwardSignals(old_parent, False)
+        self._parent = parent
+        if parent is not None:
+            parent._children.append(self)
+            self._forwardSignals(parent, True)
+        if old_parent is not None:
+            old_parent.childrenChanged.emit(old_parent)
+        if parent is not None:
+            parent.childrenChanged.emit(parent)
+        self.parentChanged.emit(self)
+
+    def _forwardSignals(self, parent, connect: bool) -> None:
+        for name in ("transformationChanged", "childrenChanged", "meshDataChanged"):
+            signal = getattr(self, name)
+            (signal.connect if connect else signal.disconnect)(getattr(parent, name).emit)
+
+    def getChildren(self) -> list:
+        return self._children
+
+    def hasChildren(self) -> bool:
+        return bool(self._children)
+
+    def getAllChildren(self) -> list:
+        children = []
+        for child in self._children:
+            children.append(child)
+            children += child.getAllChildren()
+        return children
+
+    def getMeshData(self):
+        return self._mesh_data
+
+    def setMeshData(self, mesh_data) -> None:
+        self._mesh_data = mesh_data
+        self.meshDataChanged.emit(self)
+
+    def getWorldTransformation(self, copy: bool = True) -> Matrix:
+        matrix = self._transformation
+        if self._parent is not None:
+            matrix = self._parent.getWorldTransformation().getData().dot(matrix)
+        return Matrix(matrix)
+
+    def setPosition(self, position: Vector, transform_space = None) -> None:
+        # Positions are only set on nodes of the root in the benchmark : world = local
+        self._transformation = self._transformation.copy()
+        self._transformation[:3, 3] = (position.x, position.y, position.z)
+        self.transformationChanged.emit(self)
+
+    def getWorldPosition(self) -> Vector:
+        return Vector(*self.getWorldTransformation().getData()[:3, 3])
+
+    def __deepcopy__(self, memo):
+        # As Uranium : decorators and children are copied, the copy is not in the scene
+        copy = self.__class__.__new__(self.__class__)
+        SceneNode.__init__(copy, name = self._name)
+        copy._transformation = self._transformation.copy()
+        copy._mesh_data = self._mesh_data
+        for decorator in self._decorators:
+            copy.addDecorator(deepcopy(decorator, memo))
+        for child in self._children:
+            deepcopy(child, memo).setParent(copy)
+        return copy
+
+
+class _StackDecorator(SceneNodeDecorator):
+    def __init__(self, stack: ContainerStack) -> None:
+        super().__init__()
+        self._stack = stack
+
+    def getStack(self) -> ContainerStack:
+        return self._stack
+
+    def __deepcopy__(self, memo):
+        stack = ContainerStack(self._stack._parent, self._stack._values)
+        stack._top.instances.update(self._stack._top.instances)
+        return _StackDecorator(stack)
+
+
+class CuraSceneNode(SceneNode):
+    def __init__(self, parent = None, name: str = "") -> None:
+        super().__init__(parent, name)
+        # SettingOverrideDecorator of Cura
+        application = CuraApplication.getInstance()
+        self.addDecorator(_StackDecorator(ContainerStack(application.getExtruderManager().getActiveExtruderStacks()[0])))
+
+
+class SliceableObjectDecorator(SceneNodeDecorator):
+    def isSliceable(self) -> bool:
+        return True
+
+
+class BuildPlateDecorator(SceneNodeDecorator):
+    def __init__(self, build_plate_number: int = 0) -> None:
+        super().__init__()
+
+
+class Polygon:
+    def __init__(self, points) -> None:
+        self._points = numpy.asarray(points)
+
+    def getPoints(self) -> numpy.ndarray:
+        return self._points
+
+
+class Operation:
+    def undo(self) -> None:
+        pass
+
+    def redo(self) -> None:
+        pass
+
+    def push(self) -> None:
+        CuraApplication.getInstance().getOperationStack().push(self)
+
+
+class OperationStack:
+    """ Undo / redo stack, without the merge of the operations """
+
+    def __init__(self) -> None:
+        self._operations = []
+        self._current_index = -1
+        self.changed = Signal()
+
+    def push(self, operation: Operation) -> None:
+        operation.redo()
+        del self._operations[self._current_index + 1:]
+        self._operations.append(operation)
+        self._current_index += 1
+        self.changed.emit()
+
+    def getOperations(self) -> list:
+        return self._operations[:self._current_index + 1]
+
+    def undo(self) -> None:
+        if self._current_index >= 0:
+            self._operations[self._current_index].undo()
+            self._current_index -= 1
+            self.changed.emit()
+
+    def redo(self) -> None:
+        if self._current_index + 1 < len(self._operations):
+            self._current_index += 1
+            self._operations[self._current_index].redo()
+            self.changed.emit()
+
+
+class GroupedOperation(Operation):
+    def __init__(self) -> None:
+        self._children = []
+
+    def addOperation(self, operation: Operation) -> None:
+        self._children.append(operation)
+
+    def getNumChildrenOperations(self) -> int:
+        return len(self._children)
+
+    def redo(self) -> None:
+        for operation in self._children:
+            operation.redo()
+
+    def undo(self) -> None:
+        for operation in reversed(self._children):
+            operation.undo()
+
+
+class AddSceneNodeOperation(Operation):
+    def __init__(self, node: SceneNode, parent: SceneNode) -> None:
+        self._node, self._parent = node, parent
+
+    def redo(self) -> None:
+        self._node.setParent(self._parent)
+
+    def undo(self) -> None:
+        self._node.setParent(None)
+
+
+class SetParentOperation(Operation):
+    """ The world transformation of the node is kept """
+
+    def __init__(self, node: SceneNode, parent: SceneNode) -> None:
+        self._node, self._parent = node, parent
+        self._old_parent = None
+
+    def redo(self) -> None:
+        self._old_parent = self._node.getParent()
+        self._setParent(self._parent)
+
+    def undo(self) -> None:
+        self._setParent(self._old_parent)
+
+    def _setParent(self, parent: SceneNode) -> None:
+        world = self._node.getWorldTransformation().getData()
+        self._node.setParent(parent)
+        if parent is not None:
+            self._node._transformation = numpy.linalg.inv(parent.getWorldTransformation().getData()).dot(world)
+
+
+class RemoveSceneNodeOperation(Operation):
+    def __init__(self, node: SceneNode) -> None:
+        self._node = node
+        self._parent = node.getParent()
+
+    def redo(self) -> None:
+        self._node.setParent(None)
+
+    def undo(self) -> None:
+        self._node.setParent(self._parent)
+
+
+class DepthFirstIterator:
+    def __init__(self, root: SceneNode) -> None:
+        self._root = root
+
+    def __iter__(self):
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack += reversed(node.getChildren())
+
+
+class Selection:
+    selectionChanged = Signal()
+    _selection = []
+
+    @classmethod
+    def getAllSelectedObjects(cls) -> list:
+        return cls._selection
+
+    @classmethod
+    def hasSelection(cls) -> bool:
+        return bool(cls._selection)
+
+    @classmethod
+    def isSelected(cls, node) -> bool:
+        return node in cls._selection
+
+    @classmethod
+    def add(cls, node) -> None:
+        cls._selection.append(node)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._selection = []
+
+
+class Preferences:
+    def __init__(self) -> None:
+        self._values = {"general/auto_slice": True}
+        self.preferenceChanged = Signal()
+
+    def addPreference(self, key: str, default) -> None:
+        self._values.setdefault(key, default)
+
+    def getValue(self, key: str):
+        return self._values.get(key)
+
+    def setValue(self, key: str, value) -> None:
+        self._values[key] = value
+        self.preferenceChanged.emit(key)
+
+
+class Scene:
+    def __init__(self) -> None:
+        self._root = SceneNode(name = "Root")
+        self.sceneChanged = Signal()
+        self._root.transformationChanged.connect(self.sceneChanged.emit)
+        self._root.childrenChanged.connect(self.sceneChanged.emit)
+        self._root.meshDataChanged.connect(self.sceneChanged.emit)
+        self.activeCameraChanged = Signal()
+
+    def getRoot(self) -> SceneNode:
+        return self._root
+
+    def getActiveCamera(self):
+        return _Anything()
+
+    def findObject(self, object_id):
+        return None
+
+
+class Controller:
+    def __init__(self) -> None:
+        self._scene = Scene()
+        self.toolEnabledChanged = Signal()
+
+    def getScene(self) -> Scene:
+        return self._scene
+
+    def getToolsEnabled(self) -> bool:
+        return True
+
+
+class _ExtruderManager:
+    def __init__(self, stack: ContainerStack) -> None:
+        self._stack = stack
+
+    def getActiveExtruderStacks(self) -> list:
+        return [self._stack]
+
+
+class CuraApplication:
+    _instance = None
+
+    def __init__(self) -> None:
+        self._preferences = Preferences()
+        self._controller = Controller()
+        self._operation_stack = OperationStack()
+        self._global_stack = ContainerStack(values = DEFAULT_SETTINGS)
+        self._extruder_stack = ContainerStack(self._global_stack)
+        self._global_stack.extruderList = [self._extruder_stack]
+        self._extruder_manager = _ExtruderManager(self._extruder_stack)
+        self.fileCompleted = Signal()
+        self.globalContainerStackChanged = Signal()
+        self._calls = queue.Queue()
+
+    @classmethod
+    def getInstance(cls) -> "CuraApplication":
+        if cls._instance is None:
+            cls._instance = CuraApplication()
+        return cls._instance
+
+    @classmethod
+    def reset(cls) -> "CuraApplication":
+        cls._instance = CuraApplication()
+        return cls._instance
+
+    def getPreferences(self) -> Preferences:
+        return self._preferences
+
+    def getController(self) -> Controller:
+        return self._controller
+
+    def getOperationStack(self) -> OperationStack:
+        return self._operation_stack
+
+    def getGlobalContainerStack(self) -> ContainerStack:
+        return self._global_stack
+
+    def getExtruderManager(self) -> _ExtruderManager:
+        return self._extruder_manager
+
+    def getMultiBuildPlateModel(self):
+        return types.SimpleNamespace(activeBuildPlate = 0)
+
+    def getRenderer(self):
+        return _Anything()
+
+    def callLater(self, function, *args, **kwargs) -> None:
+        self._calls.put((function, args, kwargs))
+
+    def processEvents(self, wait: bool = False) -> None:
+        """ Run the functions of callLater, wait for the first one if wait is True (event loop) """
+        while True:
+            try:
+                function, args, kwargs = self._calls.get(block = wait)
+            except queue.Empty:
+                return
+            function(*args, **kwargs)
+            wait = False
+
+
+class Tool:
+    def __init__(self) -> None:
+        self._plugin_id = "TabPlus"
+        self.propertyChanged = Signal()
+
+    def getController(self) -> Controller:
+        return CuraApplication.getInstance().getController()
+
+    def setExposedProperties(self, *names) -> None:
+        self._exposed_properties = names
+
+    def event(self, event) -> bool:
+        return False
+
+
+class Logger:
+    @classmethod
+    def log(cls, level: str, message: str, *args) -> None:
+        pass
+
+    @classmethod
+    def logException(cls, level: str, message: str, *args) -> None:
+        traceback.print_exc()
+
+
+class i18nCatalog:
+    def __init__(self, name: str = None) -> None:
+        pass
+
+    def hasTranslationLoaded(self) -> bool:
+        return False
+
+    def i18nc(self, context: str, text: str, *args) -> str:
+        return text
+
+
+def cylinder(radius: float, height: float, segments: int) -> MeshData:
+    """ Closed cylinder, indexed mesh """
+    angles = numpy.linspace(0, 2 * numpy.pi, segments, endpoint=False)
+    ring = numpy.stack((radius * numpy.cos(angles), numpy.zeros(segments), radius * numpy.sin(angles)), axis=1)
+    vertices = numpy.concatenate((ring, ring + (0, height, 0), [(0, 0, 0), (0, height, 0)])).astype(numpy.float32)
+    i = numpy.arange(segments)
+    j = (i + 1) % segments
+    bottom, top = 2 * segments, 2 * segments + 1
+    indices = numpy.concatenate((
+        numpy.stack((i, j, j + segments), axis=1),
+        numpy.stack((j + segments, i + segments, i), axis=1),
+        numpy.stack((numpy.full(segments, bottom), i, j), axis=1),
+        numpy.stack((numpy.full(segments, top), j + segments, i + segments), axis=1))).astype(numpy.int32)
+    return MeshData(vertices = vertices, indices = indices)
+
+
+def _module(name: str, **attributes) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install() -> None:
+    """ Register the stand-in modules in sys.modules """
+    for package in ("PyQt6", "UM", "UM.Math", "UM.Mesh", "UM.Operations", "UM.Settings", "UM.Scene",
+                    "UM.Scene.Iterator", "cura", "cura.Operations", "cura.Scene"):
+        _module(package).__path__ = []
+
+    qt = types.SimpleNamespace(Key = types.SimpleNamespace(Key_J = 74),
+                               KeyboardModifier = types.SimpleNamespace(ControlModifier = 1))
+    _module("PyQt6.QtCore", Qt = qt, QTimer = _Anything, pyqtProperty = _decorator, pyqtSignal = Signal,
+            pyqtSlot = _decorator, QUrl = _Anything, QT_VERSION_STR = "6.0.0")
+    _module("PyQt6.QtWidgets", QApplication = _Anything())
+
+    _module("UM.Resources", Resources = _Anything())
+    _module("UM.Logger", Logger = Logger)
+    _module("UM.Message", Message = _Anything)
+    _module("UM.Math.Vector", Vector = Vector)
+    _module("UM.Math.Matrix", Matrix = Matrix)
+    _module("UM.Math.Polygon", Polygon = Polygon)
+    _module("UM.Math.Color", Color = _Anything)
+    _module("UM.Tool", Tool = Tool)
+    _module("UM.Event", Event = _Anything(), MouseEvent = _Anything())
+    _module("UM.Mesh.MeshBuilder", MeshBuilder = MeshBuilder)
+    _module("UM.Mesh.MeshData", MeshData = MeshData)
+    _module("UM.Version", Version = _Anything)
+    _module("UM.Operations.Operation", Operation = Operation)
+    _module("UM.Operations.GroupedOperation", GroupedOperation = GroupedOperation)
+    _module("UM.Operations.AddSceneNodeOperation", AddSceneNodeOperation = AddSceneNodeOperation)
+    _module("UM.Operations.RemoveSceneNodeOperation", RemoveSceneNodeOperation = RemoveSceneNodeOperation)
+    _module("UM.Settings.SettingInstance", SettingInstance = SettingInstance)
+    _module("UM.Scene.Selection", Selection = Selection)
+    _module("UM.Scene.SceneNode", SceneNode = SceneNode)
+    _module("UM.Scene.SceneNodeDecorator", SceneNodeDecorator = SceneNodeDecorator)
+    _module("UM.Scene.ToolHandle", ToolHandle = _Anything)
+    _module("UM.Scene.Iterator.DepthFirstIterator", DepthFirstIterator = DepthFirstIterator)
+    _module("UM.View.GL.OpenGL", OpenGL = _Anything())
+    _module("UM.i18n", i18nCatalog = i18nCatalog)
+
+    _module("cura.CuraApplication", CuraApplication = CuraApplication)
+    _module("cura.CuraVersion", CuraVersion = "5.3.0")
+    _module("cura.PickingPass", PickingPass = _Anything)
+    _module("cura.Operations.SetParentOperation", SetParentOperation = SetParentOperation)
+    _module("cura.Scene.SliceableObjectDecorator", SliceableObjectDecorator = SliceableObjectDecorator)
+    _module("cura.Scene.BuildPlateDecorator", BuildPlateDecorator = BuildPlateDecorator)
+    _module("cura.Scene.CuraSceneNode", CuraSceneNode = CuraSceneNode)
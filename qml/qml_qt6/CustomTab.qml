@@ -6,6 +6,9 @@
 //   "SOffset"  : Offset set on Tab in mm
 //   "SCapsule" : Define as capsule
 //   "SArea" 	: Set on Adhesion Area
+//   "SFootprint" : Set on the first layer outline
+//   "SPreview" : Preview of the automatic addition
+//   "SProfile" : Timings of the last tab creation (tab_plus/profiling)
 //   "NLayer"   : Number of layer
 //   "SMsg"     : Text for the Remove All Button
 //
@@ -194,7 +197,7 @@ Item
 		spacing: UM.Theme.getSize("default_margin").height
 		width: UM.Theme.getSize("setting_control").width
 		height: UM.Theme.getSize("setting_control").height	
-		text: catalog.i18nc("@label", "Automatic Addition")
+		text: UM.ActiveTool.properties.getValue("SPreview") ? catalog.i18nc("@label", "Confirm Addition") : catalog.i18nc("@label", "Automatic Addition")
 		onClicked: UM.ActiveTool.triggerAction("addAutoSupportMesh")
 	}
 	
@@ -208,4 +211,38 @@ Item
 		onClicked: UM.ActiveTool.setProperty("SArea", checked)
 	}
 
+	UM.CheckBox
+	{
+		id: useFootprintCheckbox
+		anchors.top: useAreaCheckbox.bottom
+		anchors.topMargin: UM.Theme.getSize("default_margin").height
+		text: catalog.i18nc("@option:check","Set On First Layer Outline")
+		checked: UM.ActiveTool.properties.getValue("SFootprint")
+		onClicked: UM.ActiveTool.setProperty("SFootprint", checked)
+	}
+
+	UM.CheckBox
+	{
+		id: usePreviewCheckbox
+		anchors.top: useFootprintCheckbox.bottom
+		anchors.topMargin: UM.Theme.getSize("default_margin").height
+		text: catalog.i18nc("@option:check","Preview Automatic Addition")
+		checked: UM.ActiveTool.properties.getValue("SPreview")
+		onClicked: UM.ActiveTool.setProperty("SPreview", checked)
+	}
+
+	Label
+	{
+		id: profileLabel
+		anchors.top: usePreviewCheckbox.bottom
+		anchors.topMargin: UM.Theme.getSize("default_margin").height
+		width: UM.Theme.getSize("setting_control").width * 1.3
+		visible: text != ""
+		text: UM.ActiveTool.properties.getValue("SProfile")
+		font: UM.Theme.getFont("small")
+		color: UM.Theme.getColor("text")
+		wrapMode: Text.WordWrap
+		renderType: Text.NativeRendering
+	}
+
 }
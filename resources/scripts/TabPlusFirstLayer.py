@@ -0,0 +1,177 @@
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+# Cura PostProcessing Script
+# Author:   5axes
+# Date:     October 18, 2026
+#
+# Description:  TabPlusFirstLayer : MultiBrim, ReduceZBrim and FastFirstInfill in one pass
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+#   Version 1.0 18/10/2026 first version
+#
+#   Same result as the scripts MultiBrim, ReduceZBrim and FastFirstInfill in this order, with one pass on the G-code.
+#   A layer is only read if one of the modifications needs it (the first layers), it is split and joined once.
+#   The setting "Check the result" runs the three modifications one after the other too and compares the results.
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+
+from PostProcessingPlugin.Script import Script
+from UM.Logger import Logger
+
+from typing import List
+
+# Shared modules of the TabPlus scripts, registered by the plugin (TabScripts.py)
+from _TabPlusGCode.LayerRangeScript import LayerRewriter, rewriteLayers, rewriteLayerPipeline, isAllAtOnce
+from _TabPlusGCode.MultiBrimRewriter import MultiBrimRewriter
+from _TabPlusGCode.ReduceZBrimRewriter import createReduceZBrimRewriter
+from _TabPlusGCode.FastFirstInfillRewriter import FastFirstInfillRewriter
+
+__version__ = '1.0'
+
+class TabPlusFirstLayer(Script):
+    def __init__(self):
+        super().__init__()
+
+    def getSettingDataString(self):
+        return """{
+            "name": "TabPlusFirstLayer",
+            "key": "TabPlusFirstLayer",
+            "metadata": {},
+            "version": 2,
+            "settings":
+            {
+                "multibrim":
+                {
+                    "label": "MultiBrim",
+                    "description": "Print the brim again on the next layers.",
+                    "type": "bool",
+                    "default_value": true
+                },
+                "multiply":
+                {
+                    "label": "Brim addition",
+                    "description": "Number of brim to add to the existing one.",
+                    "type": "int",
+                    "default_value": 1,
+                    "minimum_value": 1,
+                    "maximum_value_warning": 3,
+                    "maximum_value": 5,
+                    "enabled": "multibrim"
+                },
+                "speed":
+                {
+                    "label": "Brim speed",
+                    "description": "Speed for the subsequent brim.",
+                    "type": "float",
+                    "unit": "mm/s",
+                    "default_value": 30,
+                    "minimum_value": 0,
+                    "maximum_value_warning": 50,
+                    "maximum_value": 100,
+                    "enabled": "multibrim"
+                },
+                "reducezbrim":
+                {
+                    "label": "ReduceZBrim",
+                    "description": "Print the skirt of the first layer with a reduced height.",
+                    "type": "bool",
+                    "default_value": true
+                },
+                "reduce":
+                {
+                    "label": "Skirt height reduction",
+                    "description": "Skirt height reduction.",
+                    "type": "float",
+                    "unit": "mm",
+                    "default_value": 0.08,
+                    "minimum_value": 0.06,
+                    "maximum_value_warning": 0.2,
+                    "maximum_value": 0.3,
+                    "enabled": "reducezbrim"
+                },
+                "extruder_nb":
+                {
+                    "label": "Extruder Id",
+                    "description": "Define extruder Id in case of multi extruders",
+                    "unit": "",
+                    "type": "int",
+                    "default_value": 1,
+                    "enabled": "reducezbrim"
+                },
+                "lcdfeedback":
+                {
+                    "label": "Display details on LCD",
+                    "description": "This setting will insert M117 gcode instructions, to display current modification in the G-Code is being used.",
+                    "type": "bool",
+                    "default_value": true,
+                    "enabled": "reducezbrim"
+                },
+                "fastfirstinfill":
+                {
+                    "label": "FastFirstInfill",
+                    "description": "Change the infill speed of the first layer.",
+                    "type": "bool",
+                    "default_value": true
+                },
+                "infillspeed":
+                {
+                    "label": "First layer infill speed",
+                    "description": "First layer infill speed value.",
+                    "type": "float",
+                    "unit": "mm/s",
+                    "default_value": 30,
+                    "minimum_value": 1,
+                    "maximum_value": 100,
+                    "maximum_value_warning": 50,
+                    "enabled": "fastfirstinfill"
+                },
+                "verify":
+                {
+                    "label": "Check the result",
+                    "description": "Run the modifications one after the other too and compare with the result of the single pass (slower).",
+                    "type": "bool",
+                    "default_value": false
+                }
+            }
+        }"""
+
+    def _createRewriters(self) -> List[LayerRewriter]:
+        """Rewriters of the selected modifications, in the order of the scripts (the rewriters on the text at the end)"""
+        rewriters = []
+        if self.getSettingValueByKey("multibrim"):
+            BrimMultiply = int(self.getSettingValueByKey("multiply"))
+            BrimSpeed = int(self.getSettingValueByKey("speed"))*60
+            rewriters.append(MultiBrimRewriter(BrimMultiply, BrimSpeed))
+
+        if self.getSettingValueByKey("reducezbrim"):
+            BrimReduce = float(self.getSettingValueByKey("reduce"))
+            extruder_nb = self.getSettingValueByKey("extruder_nb")
+            UseLcd = self.getSettingValueByKey("lcdfeedback")
+            rewriters.append(createReduceZBrimRewriter(BrimReduce, extruder_nb, UseLcd))
+
+        if self.getSettingValueByKey("fastfirstinfill"):
+            InfillSpeed = float(self.getSettingValueByKey("infillspeed")) * 60
+            rewriters.append(FastFirstInfillRewriter(InfillSpeed))
+
+        return rewriters
+
+    def execute(self, data):
+
+        all_at_once = isAllAtOnce()
+        verify = self.getSettingValueByKey("verify")
+        if verify:
+            expected = list(data)
+            for rewriter in self._createRewriters():
+                rewriteLayers(expected, rewriter, all_at_once)
+
+        rewriteLayerPipeline(data, self._createRewriters(), all_at_once)
+
+        if verify:
+            for layer_index, (layer, expected_layer) in enumerate(zip(data, expected)):
+                if layer != expected_layer:
+                    Logger.log('e', 'Single pass result different from the scripts in sequence on element {:d}, result of the scripts used'.format(layer_index))
+                    return expected
+            Logger.log('d', 'Single pass result checked : {:d} elements'.format(len(data)))
+
+        return data
@@ -0,0 +1,101 @@
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+# Shared module of the TabPlus post-processing scripts
+# Author:   5axes
+#
+# Description:  FastFirstInfill rewrite : speed of the skin extrusions of the first layer
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+#   A large layer is read as a ParsedGCode, only the modified lines are new strings. A small layer is split in lines :
+#   the numpy calls of ParsedGCode cost more than the split of a few hundred lines.
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+
+from UM.Logger import Logger
+
+import numpy
+
+from typing import List
+
+from .GCodeTokenizer import tokenize, is_begin_layer_line, is_begin_type_line, is_begin_skin_segment_line, is_extrusion_line
+from .LayerRangeScript import LayerRewriter
+from .ParsedGCode import ParsedGCode, commandCode
+
+_G1 = commandCode("G1")
+# Lines which change the state : ;LAYER:n and ;TYPE:xxx
+_MARKERS = (";LAYER:", ";TYPE")
+# Size in bytes from which a layer is read as a ParsedGCode (bench_gcode_scripts --first-layer)
+_PARSED_MIN_SIZE = 16384
+
+
+class FastFirstInfillRewriter(LayerRewriter):
+    """Speed of the skin extrusions of the layer 0.
+
+    Args:
+        speed (float): skin speed in mm/min
+    """
+
+    first_layer = 0
+    last_layer = 0
+    uses_text = True
+
+    def __init__(self, speed: float) -> None:
+        self._InfillSpeedInstruction = "F" + str(speed)
+        Logger.log('d', 'InfillSpeedInstruction : {}'.format(self._InfillSpeedInstruction))
+        self._idl = 0
+
+    def processText(self, layer: str) -> str:
+        if len(layer) < _PARSED_MIN_SIZE:
+            return super().processText(layer)
+        gcode = ParsedGCode(layer)
+
+        # The state only changes on the ;LAYER: and ;TYPE lines, the lines between two of them have the same state
+        markers = gcode.findLines(*_MARKERS).tolist()
+        extrusion = (gcode.command == _G1) & gcode.has("X") & gcode.has("Y") & gcode.has("E") & gcode.has("F")
+        bounds = markers + [len(gcode)]
+        start = 0
+        for marker, end in zip([None] + markers, bounds):
+            if marker is not None:
+                text = gcode.line(marker)
+                if text.startswith(";LAYER:"):
+                    self._idl = 1 if text.startswith(";LAYER:0") else 0
+                elif self._idl > 0:
+                    if text.startswith(";TYPE:SKIN"):
+                        self._idl = 2
+                        Logger.log('d', 'layer_lines : {}'.format(text))
+                    else :
+                        self._idl = 1
+                start = marker + 1
+
+            if self._idl >= 2:
+                for index in (numpy.flatnonzero(extrusion[start:end]) + start).tolist():
+                    line = gcode.token(index)
+                    instructionF = "F" + line.raw("F")
+                    gcode.setLine(index, line.text.replace(instructionF, self._InfillSpeedInstruction))
+
+        return gcode.toString()
+
+    def processLines(self, lines: List[str]) -> List[str]:
+        for line in tokenize(lines):
+
+            if is_begin_layer_line(line):
+                if line.text.startswith(";LAYER:0"):
+                    self._idl = 1
+                else :
+                    self._idl = 0
+
+            if is_begin_type_line(line) and self._idl > 0:
+                if is_begin_skin_segment_line(line):
+                    self._idl = 2
+                    Logger.log('d', 'layer_lines : {}'.format(line.text))
+                else :
+                    self._idl = 1
+
+            if self._idl >= 2 and is_extrusion_line(line):
+                valueF = line.raw("F")
+                if valueF is not None:
+                    instructionF = "F" + valueF
+                    lines[line.index] = line.text.replace(instructionF, self._InfillSpeedInstruction)
+
+        return lines
@@ -0,0 +1,173 @@
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+# Shared module of the TabPlus post-processing scripts
+# Author:   5axes
+#
+# Description:  G-code tokenizer : a line is parsed once into its command (G0, G1, M83 ...) and its word values (X, Y, Z, E, F ...)
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+#   The folder TabPlusGCode has no __init__.py so the PostProcessingPlugin does not list it as a script. The plugin registers
+#   it as the package "_TabPlusGCode" (TabScripts.py) before the scripts are loaded, the scripts import the modules with :
+#
+#       from _TabPlusGCode.GCodeTokenizer import GCodeLine
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+
+import itertools
+import re
+
+from typing import Dict, Iterable, Iterator, Optional
+
+# Command of a line (G0, G1, M83 ...)
+_COMMAND = re.compile(r"\s*([GMT]\d+)")
+# Letter and value of a word, the value keeps the text of the G-code (same text as the former re.search(r"Z(\d*\.?\d*)"))
+_WORD = re.compile(r"([A-Z])([-+]?\d*\.?\d*)")
+
+
+class GCodeLine:
+    """One line of G-code, the command and the words are parsed on the first access only.
+
+    Attributes:
+        text (str): line as in the G-code
+        index (int): position of the line in the list it was read from
+    """
+
+    __slots__ = ("text", "index", "_command", "_code", "_words")
+
+    def __init__(self, text: str, index: int = 0) -> None:
+        self.text = text
+        self.index = index
+        self._command = None  # type: Optional[str]
+        self._code = None  # type: Optional[str]
+        self._words = None  # type: Optional[Dict[str, str]]
+
+    @property
+    def command(self) -> str:
+        """Command of the line ("G1", "M83" ...), empty for a comment or an empty line"""
+        if self._command is None:
+            match = _COMMAND.match(self.text)
+            self._command = match.group(1) if match else ""
+        return self._command
+
+    @property
+    def code(self) -> str:
+        """Line without its comment"""
+        if self._code is None:
+            end = self.text.find(";")
+            self._code = self.text if end < 0 else self.text[:end]
+        return self._code
+
+    @property
+    def words(self) -> Dict[str, str]:
+        """Letter -> value text of the parameters of the command"""
+        if self._words is None:
+            words = {}
+            if self.command:
+                code = self.code
+                for letter, value in _WORD.findall(code, _COMMAND.match(code).end()):
+                    if letter not in words:
+                        words[letter] = value
+            self._words = words
+        return self._words
+
+    def isCommand(self, command: str) -> bool:
+        """Check the command of the line, without parsing it when the line starts with an other command"""
+        text = self.text
+        if not text.startswith(command):
+            return False
+        return len(text) == len(command) or not text[len(command)].isdigit()
+
+    def has(self, letter: str) -> bool:
+        """Check if the command has a parameter (X, Y, Z, E, F ...), without parsing the values"""
+        return letter in self.code
+
+    def raw(self, letter: str) -> Optional[str]:
+        """Value of a parameter as written in the line ("0.2" for Z0.2), None if the line has no such parameter"""
+        return self.words.get(letter)
+
+    def value(self, letter: str) -> Optional[float]:
+        """Value of a parameter, None if the line has no such parameter or no number after the letter"""
+        value = self.words.get(letter)
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[GCodeLine]:
+    """Stream of the tokens of lines of G-code.
+
+    Lines inserted in a list after the current line while it is read are tokenized too, like the former
+    "for line in lines" loops of the scripts.
+
+    Args:
+        lines (Iterable[str]): G-code lines
+
+    Returns:
+        Iterator[GCodeLine]: one token per line, with its index
+    """
+    return map(GCodeLine, lines, itertools.count())
+
+
+def is_begin_layer_line(line: GCodeLine) -> bool:
+    """Check if current line is the start of a layer section."""
+    return line.text.startswith(";LAYER:")
+
+def is_layer_count_line(line: GCodeLine) -> bool:
+    """Check if current line gives the number of layers."""
+    return line.text.startswith(";LAYER_COUNT:")
+
+def is_begin_type_line(line: GCodeLine) -> bool:
+    """Check if current line is the start of a type section."""
+    return line.text.startswith(";TYPE")
+
+def is_begin_skirt_line(line: GCodeLine) -> bool:
+    """Check if current line is the start of a SKIRT section."""
+    return line.text.startswith(";TYPE:SKIRT")
+
+def is_begin_skin_segment_line(line: GCodeLine) -> bool:
+    """Check if current line is the start of an skin."""
+    return line.text.startswith(";TYPE:SKIN")
+
+def is_begin_mesh_line(line: GCodeLine) -> bool:
+    """Check if current line is the start of a new MESH."""
+    return line.text.startswith(";MESH:")
+
+def is_relative_extrusion_line(line: GCodeLine) -> bool:
+    """Check if current line is a relative extrusion line"""
+    return line.isCommand("M83")
+
+def is_absolute_extrusion_line(line: GCodeLine) -> bool:
+    """Check if current line is an absolute extrusion line"""
+    return line.isCommand("M82")
+
+def is_z_line(line: GCodeLine) -> bool:
+    """Check if current line is a G0 Z line"""
+    return line.isCommand("G0") and line.has("Z") and not line.has("E")
+
+def is_z_G1_line(line: GCodeLine) -> bool:
+    """Check if current line is a G1 Z line"""
+    return line.isCommand("G1") and line.has("Z") and not line.has("E")
+
+def is_e_line(line: GCodeLine) -> bool:
+    """Check if current line is a an Extruder line"""
+    return line.isCommand("G1") and line.has("E")
+
+def is_extrusion_line(line: GCodeLine) -> bool:
+    """Check if current line is a standard printing segment."""
+    return line.isCommand("G1") and line.has("X") and line.has("Y") and line.has("E")
+
+def is_not_extrusion_line(line: GCodeLine) -> bool:
+    """Check if current line is a rapid movement segment."""
+    return line.isCommand("G0") and line.has("X") and line.has("Y") and not line.has("E")
+
+def is_retract_line(line: GCodeLine) -> bool:
+    """Check if current line is a retract segment."""
+    return line.isCommand("G1") and line.has("F") and line.has("E") and not line.has("X") and not line.has("Y") and not line.has("Z")
+
+def is_only_extrusion_line(line: GCodeLine) -> bool:
+    """Check if current line is a pure extrusion command."""
+    return line.isCommand("G1") and not line.has("X") and not line.has("Y") and line.has("E")
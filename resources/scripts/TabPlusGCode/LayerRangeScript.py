@@ -0,0 +1,174 @@
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+# Shared module of the TabPlus post-processing scripts
+# Author:   5axes
+#
+# Description:  Scripts limited to a range of layers : the other layers are passed through without being split
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+#   The data of the PostProcessingPlugin is one element per layer (";LAYER:n" as first line) and some elements without
+#   layer before and after the layers (start and end G-code).
+#   - the elements before the first layer are always processed (M82 / M83, ;LAYER_COUNT)
+#   - an element without ;LAYER: line gets the number of the previous layer
+#   - in "all_at_once" print sequence, the loop ends after the last layer of the range, in "one_at_a_time" the layers
+#     start again at 0 for every object and all the elements are checked (first line only)
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+
+from PostProcessingPlugin.Script import Script
+from UM.Application import Application
+
+import abc
+import re
+
+from typing import List, Optional
+
+_LAYER = re.compile(r"^;LAYER:(-?\d+)", re.MULTILINE)
+
+
+def layerNumber(layer: str) -> Optional[int]:
+    """Number of the layer of an element of the G-code data.
+
+    Args:
+        layer (str): element of the data
+
+    Returns:
+        Optional[int]: number of the ;LAYER: line, None if there is no ;LAYER: line
+    """
+    if layer.startswith(";LAYER:"):
+        end = layer.find("\n")
+        try:
+            return int(layer[7:] if end < 0 else layer[7:end])
+        except ValueError:
+            pass
+    match = _LAYER.search(layer)
+    return int(match.group(1)) if match else None
+
+
+def isAllAtOnce() -> bool:
+    """Check if the layers of the G-code are in increasing order (print sequence "all_at_once")"""
+    return Application.getInstance().getGlobalContainerStack().getProperty("print_sequence", "value") == "all_at_once"
+
+
+class LayerRewriter:
+    """Rewrite of the layers of a range, the state of the rewrite is kept from a layer to the next one.
+
+    Attributes:
+        first_layer (Optional[int]): first layer to process, None for no limit
+        last_layer (Optional[int]): last layer to process, None for no limit
+        uses_text (bool): the rewrite is done by processText() on the text of the element, not on its lines
+    """
+
+    first_layer = None  # type: Optional[int]
+    last_layer = None  # type: Optional[int]
+    uses_text = False
+
+    def inRange(self, layer_nr: Optional[int]) -> bool:
+        """Check if a layer must be processed, None is an element before the first layer."""
+        if layer_nr is None:
+            return True
+        if self.first_layer is not None and layer_nr < self.first_layer:
+            return False
+        return self.last_layer is None or layer_nr <= self.last_layer
+
+    def isAfterRange(self, layer_nr: Optional[int]) -> bool:
+        """Check if a layer is after the last layer of the range"""
+        return layer_nr is not None and self.last_layer is not None and layer_nr > self.last_layer
+
+    def processText(self, layer: str) -> str:
+        """Rewrite of an element of the data.
+
+        Args:
+            layer (str): element of the data
+
+        Returns:
+            str: new element
+        """
+        return "\n".join(self.processLines(layer.split("\n")))
+
+    def processLines(self, lines: List[str]) -> List[str]:
+        """Rewrite of the lines of an element of the data, the lines are not changed by default
+        (a rewriter with uses_text only implements processText()).
+
+        Args:
+            lines (List[str]): lines of the element
+
+        Returns:
+            List[str]: new lines, a line of the list has no "\n"
+        """
+        return lines
+
+
+def rewriteLayers(data: List[str], rewriter: LayerRewriter, all_at_once: bool = True) -> List[str]:
+    """Apply a rewriter to the elements of the data in its range of layers.
+
+    Args:
+        data (List[str]): G-code data of the PostProcessingPlugin, modified in place
+        rewriter (LayerRewriter): rewrite of the layers
+        all_at_once (bool): the layers are in increasing order, stop after the range
+
+    Returns:
+        List[str]: data
+    """
+    layer_nr = None
+    for layer_index, layer in enumerate(data):
+        number = layerNumber(layer)
+        if number is not None:
+            layer_nr = number
+        if rewriter.inRange(layer_nr):
+            data[layer_index] = rewriter.processText(layer)
+        elif all_at_once and rewriter.isAfterRange(layer_nr):
+            break
+    return data
+
+
+def rewriteLayerPipeline(data: List[str], rewriters: List[LayerRewriter], all_at_once: bool = True) -> List[str]:
+    """Apply several rewriters in one pass over the data, same result as rewriteLayers() for each rewriter in sequence.
+
+    The rewriters of an element get the result of the previous ones. The element is split once for the rewriters on
+    the lines and joined once for the rewriters on the text : put the rewriters with uses_text at the end.
+
+    Args:
+        data (List[str]): G-code data of the PostProcessingPlugin, modified in place
+        rewriters (List[LayerRewriter]): rewrites in their order of application
+        all_at_once (bool): the layers are in increasing order, stop after the ranges
+
+    Returns:
+        List[str]: data
+    """
+    layer_nr = None
+    for layer_index, layer in enumerate(data):
+        number = layerNumber(layer)
+        if number is not None:
+            layer_nr = number
+        if all_at_once and all(rewriter.isAfterRange(layer_nr) for rewriter in rewriters):
+            break
+
+        lines = None  # type: Optional[List[str]]
+        for rewriter in rewriters:
+            if not rewriter.inRange(layer_nr):
+                continue
+            if rewriter.uses_text:
+                if lines is not None:
+                    layer = "\n".join(lines)
+                    lines = None
+                layer = rewriter.processText(layer)
+            else:
+                if lines is None:
+                    lines = layer.split("\n")
+                lines = rewriter.processLines(lines)
+        data[layer_index] = layer if lines is None else "\n".join(lines)
+    return data
+
+
+class LayerRangeScript(Script, metaclass = abc.ABCMeta):
+    """Script which only needs a range of layers, the rewrite is done by the LayerRewriter of createRewriter()"""
+
+    @abc.abstractmethod
+    def createRewriter(self) -> LayerRewriter:
+        """Rewriter of the script with the current settings"""
+        pass
+
+    def execute(self, data: List[str]) -> List[str]:
+        return rewriteLayers(data, self.createRewriter(), isAllAtOnce())
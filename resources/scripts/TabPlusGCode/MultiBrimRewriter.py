@@ -0,0 +1,320 @@
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+# Shared module of the TabPlus post-processing scripts
+# Author:   5axes
+#
+# Description:  MultiBrim rewrite engine : the brim of the first layer is printed again on the next layers
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+#   One pass state machine over the lines of a layer, the result is written in a new list.
+#   The lines inserted for a layer are read by the state machine before the next line of the layer, like the former
+#   version which inserted them in the list it was reading (the Z and E positions of the copied brim are tracked).
+#   The positions are counters, the lines before / after the current line are read in the output, the inserted lines
+#   not read yet and the source lines.
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+
+from UM.Logger import Logger
+
+from collections import deque
+from typing import Deque, List
+
+from .LayerRangeScript import LayerRewriter
+from .GCodeTokenizer import GCodeLine, is_begin_layer_line, is_layer_count_line, is_begin_skirt_line, is_begin_type_line, \
+    is_begin_mesh_line, is_z_line, is_e_line, is_relative_extrusion_line, is_absolute_extrusion_line
+
+# Lines which can change the state out of the brim layers (;LAYER:, ;LAYER_COUNT:, M82, M83)
+_STATE_LINES = (";LAYER", "M82", "M83")
+# In the copied layers, out of the brim : the comments, M82 / M83 and the G0 Z / G1 E lines too
+_COPY_LINES = (";", "M82", "M83", "G0", "G1")
+
+
+class MultiBrimRewriter(LayerRewriter):
+    """State of the MultiBrim script over the layers of a G-code.
+
+    Args:
+        multiply (int): number of brim to add to the existing one
+        speed (int): speed of the added brim in mm/min, 0 keeps the speed of the brim
+    """
+
+    def __init__(self, multiply: int, speed: int) -> None:
+        # The brim is copied on the layers 1 to multiply, the Z / E positions are read up to the last copy
+        self.last_layer = multiply
+
+        self._BrimMultiply = multiply
+        self._BrimSpeed = speed
+        self._BrimReplaceSpeeed = "F" + str(speed)
+
+        self._idl = 0
+        self._lines_brim = []  # type: List[str]
+        self._StartLine = ''
+        self._StartLineZ = None
+        self._BrimF = 'F0'
+        self._FirstZToReplace = ''
+        self._ModiZ = None
+        self._InitialE = ''
+        self._StartZ = 0
+        self._BrimZ = 0
+        self._currentlayer = 0
+        self._currentz = None
+        self._CurrentE = 0
+        self._RetractE = 0
+        self._ResetE = 0
+        self._lastE = 'G92 E0'
+        self._RetractF = 3000
+        self._RelativeExtruder = False
+        self._layercount = 0
+
+        # Current layer
+        self._output = []  # type: List[str]
+        self._pending = deque()  # type: Deque[str]
+        self._lines = []  # type: List[str]
+        self._position = 0
+
+    def _line(self, index: int) -> str:
+        """Line of the layer as in the former list : output, current line, inserted lines not read yet, source lines.
+
+        Args:
+            index (int): position in the layer, negative positions are read from the end of the layer
+
+        Returns:
+            str: line
+        """
+        nb_output = len(self._output)
+        size = nb_output + 1 + len(self._pending) + len(self._lines) - self._position
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("line index out of range")
+        if index < nb_output:
+            return self._output[index]
+        if index == nb_output:
+            return self._current
+        index -= nb_output + 1
+        if index < len(self._pending):
+            return self._pending[index]
+        return self._lines[self._position + index - len(self._pending)]
+
+    def processLines(self, lines: List[str]) -> List[str]:
+        """Rewrite the lines of a layer, the state is kept for the next layer.
+
+        Args:
+            lines (List[str]): lines of the layer
+
+        Returns:
+            List[str]: new lines of the layer
+        """
+        self._output = []
+        self._pending = deque()
+        self._lines = lines
+        self._position = 0
+        output = self._output
+        pending = self._pending
+        while pending or self._position < len(lines):
+            if pending:
+                line = pending.popleft()
+            else:
+                line = lines[self._position]
+                self._position += 1
+                # Out of the brim the other lines are not tokenized
+                if self._idl == 0 and not line.startswith(_STATE_LINES if self._currentlayer > self._BrimMultiply else _COPY_LINES):
+                    output.append(line)
+                    continue
+            self._current = line
+            self._rewriteLine(GCodeLine(line, len(output)))
+            output.append(line)
+        return output
+
+    def _insertModification(self, line_index: int) -> None:
+        """Copy of the brim after the ;LAYER: line"""
+        xyline = self._line(line_index - 3)
+
+        #----------------------------
+        #    Begin of modification
+        #----------------------------
+        inserted = [";BEGIN_OF_MODIFICATION"]
+        # Reset the Extruder position
+        if self._RetractE > 0 and self._RelativeExtruder == False :
+            inserted.append("G1 F" + str(self._RetractF) + " E" + str(self._ResetE))
+
+        if self._RelativeExtruder == False :
+            inserted.append(self._InitialE)
+
+        #    Set Z position of the Brim
+        #    the case not searchZ is not managed. It's normal like that if there is no Z in Stratline
+        #    Then the postprocesing script will not produce a Gcode modification
+        #    The Z of the StartLine is the one read on the ;TYPE:SKIRT line : the Z appended to a StartLine
+        #    with a comment is after the ";"
+        searchZ = self._StartLineZ
+        if searchZ is not None:
+            self._FirstZToReplace = "Z" + searchZ
+            self._ModiZ = "Z" + str(round((float(searchZ) + self._BrimZ), 5))
+
+        inserted.append(self._StartLine.replace(self._FirstZToReplace, self._ModiZ))
+
+        for aline in self._lines_brim:
+            searchZ = GCodeLine(aline).raw("Z")
+            if searchZ is not None:
+                Cz = "Z" + searchZ
+                self._ModiZ = "Z" + str(round((float(searchZ) + self._BrimZ), 5))
+                inserted.append(aline.replace(Cz, self._ModiZ))
+            else:
+                inserted.append(aline)
+        inserted.append(xyline)
+        inserted.append("G1 Z" + str(self._currentz))
+        # Reset Etruder position
+        if self._RelativeExtruder == False:
+            inserted.append(self._lastE)
+
+        #----------------------------
+        #    End of modification
+        #----------------------------
+        inserted.append(";END_OF_MODIFICATION")
+        self._BrimZ += self._StartZ
+
+        # Read after the current line, before the lines inserted previously
+        self._pending.extendleft(reversed(inserted))
+
+    def _startBrim(self, line: GCodeLine) -> None:
+        """Init copy of the BRIM extruding path on the ;TYPE:SKIRT line of the first layer"""
+        # G0 F6000 X106.445 Y116.579 Z0.2   -> StartLine
+        # ;TYPE:SKIRT
+        # G1 F3000 E0                       -> ZHopLine/ELine
+        # G1 F1200 X106.693 Y116.356 E0.011 -> SpeedLine
+
+        # or
+
+        # G0 F6000 X51.318 Y121.726 Z0.4    -> StartLine
+        # ;TYPE:SKIRT
+        # G1 F300 Z0.2                      -> ZHopLine
+        # G1 F3000 E0                       -> ELine
+        # G1 F1080 X51.568 Y121.624 E0.0089 -> SpeedLine
+
+        # or Cura 5.0 & 5.1
+
+        # G0 F6000 X105.446 Y125.313 Z0.2    -> PreviousStartLine
+        # G0 X104.5 Y127.5                   -> StartLine
+        # ;TYPE:SKIRT
+        # G1 F3000 E0                        -> ZHopLine/ELine
+        # G1 F1200 X104.54 Y127.012 E0.01629 -> SpeedLine
+
+        # Modification for Cura 5.0  StartLine += " " + Z0.2
+
+        # Relative mode
+
+        # G0 F6000 X109.982 Y102.608 Z0.2
+        # ;TYPE:SKIRT
+        # G1 F3000 E5
+        # G1 F1080 X110.147 Y102.432 E0.00795
+        self._idl = 2
+        self._InitialE = ''
+
+        # StartLine get the Z height
+        line_index = line.index - 1
+        self._StartLine = self._line(line_index)
+        searchZ = GCodeLine(self._StartLine).raw("Z")
+        if searchZ is not None:
+            self._StartZ = float(searchZ)
+            self._FirstZToReplace = "Z" + searchZ
+            self._StartLineZ = searchZ
+        else :
+            self._StartLine += " "
+            self._StartLine += self._FirstZToReplace
+            self._StartLineZ = self._FirstZToReplace[1:] if self._FirstZToReplace else None
+            Logger.log('d', 'Format  5.0 StartLine : {}'.format(self._StartLine))
+
+        # Test for Z hop case
+        ZHopLine = GCodeLine(self._line(line_index + 2))
+        searchZ = ZHopLine.raw("Z")
+        if searchZ is not None:
+            self._StartZ = float(searchZ)
+            self._FirstZToReplace = "Z" + searchZ
+            Logger.log('d', 'Mode Z Hop : {}'.format(self._FirstZToReplace))
+
+        self._BrimZ = self._StartZ
+
+        searchE = ZHopLine.raw("E")
+        if searchE is not None:
+            self._InitialE = "G92 E" + searchE
+            nb_line = 3
+        else:
+            ZHopLine = GCodeLine(self._line(line_index + 3))
+            searchE = ZHopLine.raw("E")
+            if searchE is not None and self._InitialE == '' :
+                self._InitialE = "G92 E" + searchE
+            nb_line = 4
+
+        SpeedLine = GCodeLine(self._line(line_index + nb_line))
+        searchF = SpeedLine.raw("F")
+        if searchF is not None:
+            self._BrimF = "F" + searchF
+
+        self._lines_brim = [line.text]
+
+    def _rewriteLine(self, token: GCodeLine) -> None:
+        line = token.text
+
+        if is_relative_extrusion_line(token):
+            self._RelativeExtruder = True
+
+        if is_absolute_extrusion_line(token):
+            self._RelativeExtruder = False
+
+        if is_layer_count_line(token):
+            self._layercount = int(line[13:])
+
+        # ;LAYER:X
+        if is_begin_layer_line(token):
+            self._currentlayer = int(line[7:])
+            if line.startswith(";LAYER:0"):
+                self._idl = 1
+
+            # Copy the Original Brim
+            elif self._currentlayer <= self._BrimMultiply :
+                self._insertModification(token.index)
+
+        #---------------------------------------
+        # Stock the FirstZToReplace
+        #---------------------------------------
+        if self._idl == 1 :
+            searchZ = token.raw("Z")
+            if searchZ is not None:
+                self._StartZ = float(searchZ)
+                self._FirstZToReplace = "Z" + searchZ
+                Logger.log('d', 'First Z ToReplace : {}'.format(self._FirstZToReplace))
+
+        if self._idl == 2 and is_begin_type_line(token):
+            self._idl = 0
+
+        if self._idl == 2 and is_begin_mesh_line(token) :
+            self._idl = 0
+
+        #---------------------------------------
+        # Add the Brim line to the brim path
+        #---------------------------------------
+        if self._idl == 2 :
+            if self._BrimSpeed > 0 :
+                self._lines_brim.append(line.replace(self._BrimF, self._BrimReplaceSpeeed))
+            else :
+                self._lines_brim.append(line)
+
+        if self._idl == 1 and is_begin_skirt_line(token):
+            self._startBrim(token)
+
+        if self._currentlayer <= self._BrimMultiply and is_z_line(token):
+            searchZ = token.raw("Z")
+            if searchZ is not None:
+                self._currentz = float(searchZ)
+
+        if self._currentlayer <= self._BrimMultiply and is_e_line(token):
+            searchE = token.raw("E")
+            if searchE is not None:
+                self._lastE = "G92 E" + searchE
+                self._RetractE = self._CurrentE - float(searchE)
+                self._ResetE = self._CurrentE
+                self._CurrentE = float(searchE)
+
+                searchF = token.raw("F")
+                if searchF is not None:
+                    self._RetractF = float(searchF)
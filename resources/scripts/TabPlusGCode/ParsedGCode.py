@@ -0,0 +1,274 @@
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+# Shared module of the TabPlus post-processing scripts
+# Author:   5axes
+#
+# Description:  Parsed G-code : one element of the data kept as its bytes and arrays of values per line
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+#   No str per line : the text is read as bytes (numpy.frombuffer), the lines are byte offsets, the commands and the
+#   X / Y / Z / E / F parameters are numpy arrays computed from the byte offsets of the letters, without a Python loop over
+#   the lines. has() keeps one bool array per letter, the numbers are only read by value().
+#   The modified lines are kept apart and toString() copies the other lines by spans of the source.
+#
+#   Command codes : G<n> -> n, M<n> -> 10000 + n, T<n> -> 20000 + n, NO_COMMAND for the comments and the empty lines.
+#   Like the tokenizer predicates (line.startswith("G1")) the command must be at the start of the line.
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+
+import numpy
+import re
+
+from typing import Dict
+
+from .GCodeTokenizer import GCodeLine
+
+NO_COMMAND = -1
+_LETTER_CODE = {"G": 0, "M": 10000, "T": 20000}
+
+# Parameters kept in arrays
+LETTERS = "XYZEF"
+
+_NEW_LINE = ord("\n")
+_COMMENT = ord(";")
+_DOT = ord(".")
+_MINUS = ord("-")
+_PLUS = ord("+")
+_ZERO = ord("0")
+_COMMAND_LETTERS = numpy.frombuffer(b"GMT", dtype = numpy.uint8)
+_COMMAND_BASE = numpy.zeros(256, dtype = numpy.int32)
+_COMMAND_BASE[_COMMAND_LETTERS] = [_LETTER_CODE[letter] for letter in "GMT"]
+
+# Bytes read for a command / a number, the longer ones are read by int() / float()
+_COMMAND_WIDTH = 8
+_NUMBER_WIDTH = 16
+# Up to 15 digits, mantissa / 10 ** decimals is the float of the text (both are exact doubles, the division is rounded once)
+_MAX_DIGITS = 15
+# Numbers read at once, bounds the (block, _NUMBER_WIDTH) arrays
+_BLOCK = 16384
+
+_COMMAND = re.compile(rb"[GMT]\d+")
+_NUMBER = re.compile(rb"[-+]?\d*\.?\d*")
+
+
+def commandCode(command: str) -> int:
+    """Code of a command in ParsedGCode.command ("G1" -> 1, "M83" -> 10083)"""
+    return _LETTER_CODE[command[0]] + int(command[1:])
+
+
+def _window(data: numpy.ndarray, starts: numpy.ndarray, width: int) -> numpy.ndarray:
+    """Bytes from every start, (len(starts), width) uint8, 0 after the end of the data"""
+    window = numpy.empty((len(starts), width), dtype = numpy.uint8)
+    for column in range(width):
+        index = starts + column
+        window[:, column] = data.take(index, mode = "clip")
+        window[index >= len(data), column] = 0
+    return window
+
+
+def _digits(window: numpy.ndarray) -> numpy.ndarray:
+    """Digit values of a window, -1 for the other bytes"""
+    digits = window.astype(numpy.int8) - _ZERO
+    digits[(window < _ZERO) | (window > _ZERO + 9)] = -1
+    return digits
+
+
+def _runEnd(digits: numpy.ndarray, start: numpy.ndarray) -> numpy.ndarray:
+    """End column of the digits of every row from its start column, the width of the window if the digits reach it"""
+    stop = (digits < 0) & (numpy.arange(digits.shape[1]) >= start[:, None])
+    return numpy.where(stop.any(axis = 1), stop.argmax(axis = 1), digits.shape[1])
+
+
+class ParsedGCode:
+    """One element of the G-code data (a layer) parsed in arrays.
+
+    The parameters of a letter are found on the first use of has() / value() for the letter.
+
+    Args:
+        text (str): lines of G-code separated by "\\n"
+
+    Attributes:
+        text (str): source text
+        data (bytes): source text in UTF-8
+        offsets (numpy.ndarray): int64 (n + 1) start of the lines in data, the last one is len(data) + 1
+        command (numpy.ndarray): int32 (n) command code of the lines
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.data = text.encode("utf-8")
+        self._bytes = numpy.frombuffer(self.data, dtype = numpy.uint8)
+        # Same offsets in the bytes and in the text : the lines are sliced from the text
+        self._ascii = len(self.data) == len(text)
+        self._edits = {}  # type: Dict[int, str]
+        self._has = {}  # type: Dict[str, numpy.ndarray]
+        self._values = {}  # type: Dict[str, numpy.ndarray]
+        self._comments = None  # type: numpy.ndarray
+
+        ends = numpy.flatnonzero(self._bytes == _NEW_LINE) + 1
+        size = len(ends) + 1
+        self.offsets = numpy.empty(size + 1, dtype = numpy.int64)
+        self.offsets[0] = 0
+        self.offsets[1:-1] = ends
+        self.offsets[-1] = len(self.data) + 1
+
+        self.command = self._parseCommands()
+
+    def __len__(self) -> int:
+        return len(self.command)
+
+    def _parseCommands(self) -> numpy.ndarray:
+        command = numpy.full(len(self.offsets) - 1, NO_COMMAND, dtype = numpy.int32)
+        starts = self.offsets[:-1]
+        if not len(self._bytes):
+            return command
+        first = self._bytes[numpy.minimum(starts, len(self._bytes) - 1)]
+        second = self._bytes[numpy.minimum(starts + 1, len(self._bytes) - 1)]
+        lines = numpy.flatnonzero(numpy.isin(first, _COMMAND_LETTERS) & (second >= _ZERO) & (second <= _ZERO + 9)
+                                  & (starts + 1 < len(self._bytes)))
+        digits = _digits(_window(self._bytes, starts[lines] + 1, _COMMAND_WIDTH))
+        end = _runEnd(digits, numpy.zeros(len(lines), dtype = numpy.int64))
+        number = numpy.zeros(len(lines), dtype = numpy.int32)
+        for column in range(_COMMAND_WIDTH):
+            inside = column < end
+            number[inside] = number[inside] * 10 + digits[inside, column]
+        command[lines] = _COMMAND_BASE[first[lines]] + number
+        for line in lines[end == _COMMAND_WIDTH].tolist():
+            command[line] = commandCode(_COMMAND.match(self.data, self.offsets[line]).group().decode())
+        return command
+
+    def _commentStarts(self) -> numpy.ndarray:
+        """Byte offset of the first ";" of every line, end of the line without comment"""
+        if self._comments is None:
+            self._comments = self.offsets[1:] - 1
+            semicolons = numpy.flatnonzero(self._bytes == _COMMENT)
+            lines, first = numpy.unique(numpy.searchsorted(self.offsets, semicolons, side = "right") - 1, return_index = True)
+            self._comments[lines] = semicolons[first]
+        return self._comments
+
+    def _findLetter(self, letter: str) -> numpy.ndarray:
+        """Byte offset of the letter in the parameters of the commands (before the comment), first one of every line.
+        A capital letter is always the start of a word, like in GCodeLine.words
+
+        Returns:
+            numpy.ndarray: int64 (n) offset, -1 if the line has not the letter
+        """
+        found = numpy.flatnonzero(self._bytes == ord(letter))
+        lines = numpy.searchsorted(self.offsets, found, side = "right") - 1
+        keep = (self.command[lines] != NO_COMMAND) & (found < self._commentStarts()[lines])
+        found = found[keep]
+        lines = lines[keep]
+        first = numpy.ones(len(lines), dtype = bool)
+        first[1:] = lines[1:] != lines[:-1]
+        positions = numpy.full(len(self.command), -1, dtype = numpy.int64)
+        positions[lines[first]] = found[first]
+        return positions
+
+    def _parseNumbers(self, starts: numpy.ndarray) -> numpy.ndarray:
+        """Values of the numbers [-+]?\\d*\\.?\\d* at the byte offsets, NaN without digit"""
+        window = _window(self._bytes, starts, _NUMBER_WIDTH)
+        digits = _digits(window)
+        rows = numpy.arange(len(starts))
+        sign = ((window[:, 0] == _MINUS) | (window[:, 0] == _PLUS)).astype(numpy.int64)
+        integer_end = _runEnd(digits, sign)
+        dot = window[rows, numpy.minimum(integer_end, _NUMBER_WIDTH - 1)] == _DOT
+        dot &= integer_end < _NUMBER_WIDTH
+        decimal_start = integer_end + dot
+        decimal_end = numpy.where(dot, _runEnd(digits, decimal_start), integer_end)
+        nb_digits = integer_end - sign + decimal_end - decimal_start
+
+        mantissa = numpy.zeros(len(starts), dtype = numpy.int64)
+        for column in range(_NUMBER_WIDTH):
+            inside = ((column >= sign) & (column < integer_end)) | ((column >= decimal_start) & (column < decimal_end))
+            mantissa[inside] = mantissa[inside] * 10 + digits[inside, column]
+        values = mantissa / 10.0 ** (decimal_end - decimal_start)
+        values[window[:, 0] == _MINUS] *= -1
+        values[nb_digits == 0] = numpy.nan
+
+        # Numbers longer than the window or than the exact mantissa
+        for row in numpy.flatnonzero((decimal_end == _NUMBER_WIDTH) | (nb_digits > _MAX_DIGITS)).tolist():
+            values[row] = float(_NUMBER.match(self.data, int(starts[row])).group())
+        return values
+
+    def has(self, letter: str) -> numpy.ndarray:
+        """Lines with the parameter letter (one of LETTERS)
+
+        Returns:
+            numpy.ndarray: bool (n)
+        """
+        if letter not in self._has:
+            self._has[letter] = self._findLetter(letter) >= 0
+        return self._has[letter]
+
+    def value(self, letter: str) -> numpy.ndarray:
+        """Values of the parameter letter (one of LETTERS)
+
+        Returns:
+            numpy.ndarray: float64 (n), NaN if the line has not the letter or no number after it
+        """
+        if letter not in self._values:
+            positions = self._findLetter(letter)
+            lines = numpy.flatnonzero(positions >= 0)
+            starts = positions[lines] + 1
+            values = numpy.full(len(self.command), numpy.nan)
+            for block in range(0, len(lines), _BLOCK):
+                values[lines[block:block + _BLOCK]] = self._parseNumbers(starts[block:block + _BLOCK])
+            self._values[letter] = values
+        return self._values[letter]
+
+    def line(self, index: int) -> str:
+        """Text of a line, modified or not"""
+        edit = self._edits.get(index)
+        if edit is not None:
+            return edit
+        if self._ascii:
+            return self.text[self.offsets[index]:self.offsets[index + 1] - 1]
+        return self.data[self.offsets[index]:self.offsets[index + 1] - 1].decode("utf-8")
+
+    def token(self, index: int) -> GCodeLine:
+        """Line for the values as written in the G-code (GCodeLine.raw())"""
+        return GCodeLine(self.line(index), index)
+
+    def setLine(self, index: int, text: str) -> None:
+        """Replace a line, the text can hold several lines. The arrays keep the values of the source line."""
+        self._edits[index] = text
+
+    def isModified(self) -> bool:
+        return bool(self._edits)
+
+    def findLines(self, *prefixes: str) -> numpy.ndarray:
+        """Lines of the source which start with one of the prefixes.
+
+        Returns:
+            numpy.ndarray: int64 line indices, in increasing order
+        """
+        if not len(self._bytes):
+            return numpy.zeros(0, dtype = numpy.int64)
+        prefixes = [numpy.frombuffer(prefix.encode("utf-8"), dtype = numpy.uint8) for prefix in prefixes]
+        starts = self.offsets[:-1]
+        lines = numpy.flatnonzero(numpy.isin(self._bytes.take(starts, mode = "clip"), [prefix[0] for prefix in prefixes]))
+        window = _window(self._bytes, starts[lines], max(map(len, prefixes)))
+        found = numpy.zeros(len(lines), dtype = bool)
+        for prefix in prefixes:
+            found |= (window[:, :len(prefix)] == prefix).all(axis = 1)
+        return lines[found]
+
+    def toString(self) -> str:
+        """Text with the modified lines, the other lines are copied from the source"""
+        if not self._edits:
+            return self.text
+        if self._ascii:
+            source, empty, encode = self.text, "", str
+        else:
+            source, empty, encode = self.data, b"", str.encode
+        offsets = self.offsets
+        parts = []
+        position = 0
+        for index in sorted(self._edits):
+            parts.append(source[position:offsets[index]])
+            parts.append(encode(self._edits[index]))
+            position = offsets[index + 1] - 1
+        parts.append(source[position:])
+        text = empty.join(parts)
+        return text if self._ascii else text.decode("utf-8")
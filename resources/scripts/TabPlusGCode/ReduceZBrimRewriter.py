@@ -0,0 +1,149 @@
+#------------------------------------------------------------------------------------------------------------------------------------
+#
+# Shared module of the TabPlus post-processing scripts
+# Author:   5axes
+#
+# Description:  ReduceZBrim rewrite : skirt / brim of the first layer printed at a lower height with a reduced flow (M221)
+#
+#------------------------------------------------------------------------------------------------------------------------------------
+
+from UM.Logger import Logger
+from UM.Application import Application
+
+from typing import List
+
+from .LayerRangeScript import LayerRewriter
+from .GCodeTokenizer import GCodeLine, is_begin_layer_line, is_layer_count_line, is_begin_skirt_line, is_begin_type_line, \
+    is_z_line, is_z_G1_line
+
+
+class ReduceZBrimRewriter(LayerRewriter):
+    """Reduced height of the skirt / brim of the layer 0.
+
+    Args:
+        reduce (float): height of the skirt / brim in mm
+        layer_height_0 (float): initial layer height of the extruder
+        use_lcd (bool): insert M117 messages
+    """
+
+    # The modification ends on the first ;TYPE line after the skirt : on the layer 0 or at the start of the layer 1
+    first_layer = 0
+    last_layer = 1
+
+    def __init__(self, reduce: float, layer_height_0: float, use_lcd: bool) -> None:
+        self._BrimReduce = reduce
+        self._layer_height_0 = layer_height_0
+        self._UseLcd = use_lcd
+        self._NewZ = "Z{:.2f}".format(float(reduce))
+        self._layer_reduction = int((reduce / layer_height_0) * 100)
+
+        self._idl = 0
+        self._currentlayer = 0
+        self._layercount = 0
+        self._Zhop = False
+
+    def processLines(self, lines: List[str]) -> List[str]:
+        layer_height_0 = self._layer_height_0
+
+        for line_index, line in enumerate(lines):
+            # Out of the skirt only the comments change the state, the other lines are not tokenized
+            if self._idl < 2 and not line.startswith(";"):
+                continue
+            token = GCodeLine(line, line_index)
+
+            if is_layer_count_line(token):
+                self._layercount = int(line[13:])
+
+            # startswith ";LAYER"
+            if is_begin_layer_line(token):
+                self._currentlayer = int(line[7:])
+                if line.startswith(";LAYER:0"):
+                    self._idl = 1
+
+            if self._idl == 2 and is_begin_type_line(token):
+                self._idl = 0
+                line_index = token.index
+                lcd_gcode = "M117 End Brim Z{:.2f}".format(float(layer_height_0))
+                lines.insert(line_index , ";END_OF_MODIFICATION")
+                if self._UseLcd == True :
+                    lines.insert(line_index, lcd_gcode)
+                lines.insert(line_index , "M221 S100")
+                if self._Zhop == False :
+                    lines.insert(line_index , "G0 Z" + str(layer_height_0))
+
+            #---------------------------------------------------
+            # Init modification of the BRIM extruding path
+            #---------------------------------------------------
+            # G0 F6000 X106.445 Y116.579 Z0.2   -> StartLine
+            # ;TYPE:SKIRT
+            # G1 F3000 E0                       -> ZHopLine/ELine
+            # G1 F1200 X106.693 Y116.356 E0.011 -> SpeedLine
+
+            # or
+
+            # G0 F6000 X51.318 Y121.726 Z0.4    -> StartLine
+            # ;TYPE:SKIRT
+            # G1 F300 Z0.2                      -> ZHopLine
+            # G1 F3000 E0                       -> ELine
+            # G1 F1080 X51.568 Y121.624 E0.0089 -> SpeedLine
+
+            # Relative mode
+
+            # G0 F6000 X109.982 Y102.608 Z0.2
+            # ;TYPE:SKIRT
+            # G1 F3000 E5
+            # G1 F1080 X110.147 Y102.432 E0.00795
+            if self._idl == 1 and is_begin_skirt_line(token):
+                self._idl = 2
+
+                line_index = token.index
+
+                #----------------------------
+                #    Begin of modification
+                #     https://marlinfw.org/docs/gcode/M221.html
+                #----------------------------
+                lines.insert(line_index + 1, ";BEGIN_OF_MODIFICATION")
+                lines.insert(line_index + 2, "G0 Z" + str(self._BrimReduce))
+                lines.insert(line_index + 3, "M221 S" + str(self._layer_reduction))
+                if self._UseLcd == True :
+                    lcd_gcode = "M117 M221 S{:d}".format(int(self._layer_reduction))
+                    lines.insert(line_index + 4, lcd_gcode)
+
+            if self._idl > 1 and (is_z_line(token) or is_z_G1_line(token)) :
+                searchZ = token.raw("Z")
+                if searchZ is not None:
+                    currentz = float(searchZ)
+                    if currentz == layer_height_0:
+                        self._Zhop = False
+                        ZToReplace = "Z" + str(currentz)
+                        lines[token.index] = line.replace(ZToReplace, self._NewZ)
+                    else:
+                        if currentz > layer_height_0:
+                            self._Zhop = True
+
+        return lines
+
+
+def createReduceZBrimRewriter(reduce: float, extruder_nb: int, use_lcd: bool) -> ReduceZBrimRewriter:
+    """Rewriter for the settings of the ReduceZBrim script, with the initial layer height of the extruder.
+
+    Args:
+        reduce (float): height of the skirt / brim in mm
+        extruder_nb (int): extruder Id, from 1
+        use_lcd (bool): insert M117 messages
+
+    Returns:
+        ReduceZBrimRewriter: rewriter
+    """
+    extruder_id = extruder_nb - 1
+
+    # Deprecation function
+    # extrud = list(Application.getInstance().getGlobalContainerStack().extruders.values())
+    extrud = Application.getInstance().getGlobalContainerStack().extruderList
+
+    layer_height_0 = extrud[extruder_id].getProperty("layer_height_0", "value")
+    Logger.log('d', 'layer_height_0 : {}'.format(layer_height_0))
+    layer_reduction = int((reduce / layer_height_0) * 100)
+    Logger.log('d', 'layer_reduction : {}'.format(layer_reduction))
+
+    return ReduceZBrimRewriter(reduce, layer_height_0, use_lcd)
@@ -0,0 +1,137 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Test configuration
+#
+# The tests run without Cura : the modules of Uranium and of the PostProcessingPlugin used
+# by the scripts are replaced by small stand-ins, and the plugin is loaded as the package
+# "TabPlus" without running its __init__ (register), the shared modules of the scripts are
+# registered as register() does. The tool runs on the stand-ins of the
+# benchmarks (benchmarks/cura_stubs).
+# Run from the plugin folder :
+#     python -m pytest -q tests
+#--------------------------------------------------------------------------------------------
+
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PLUGIN_DIR = os.path.dirname(TESTS_DIR)
+SCRIPTS_DIR = os.path.join(PLUGIN_DIR, "resources", "scripts")
+BASELINE_DIR = os.path.join(TESTS_DIR, "baseline")
+
+# Machine settings read by the scripts
+SETTINGS = {
+    "print_sequence": "all_at_once",
+    "machine_extruder_count": 1,
+    "layer_height_0": 0.2,
+}
+
+
+class Logger:
+    @staticmethod
+    def log(*args, **kwargs) -> None:
+        pass
+
+    @staticmethod
+    def logException(*args, **kwargs) -> None:
+        pass
+
+
+class ContainerStack:
+    def getProperty(self, key: str, property_name: str):
+        return SETTINGS[key]
+
+    @property
+    def extruderList(self) -> list:
+        return [ContainerStack() for _ in range(SETTINGS["machine_extruder_count"])]
+
+
+class Application:
+    _instance = None
+
+    @classmethod
+    def getInstance(cls) -> "Application":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def getGlobalContainerStack(self) -> ContainerStack:
+        return ContainerStack()
+
+
+class Script:
+    """ Settings of the script set by the tests """
+
+    def __init__(self) -> None:
+        self._settings = {}
+
+    def getSettingValueByKey(self, key: str):
+        return self._settings[key]
+
+
+def _module(name: str, **attributes) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install() -> None:
+    """ Put the stand-ins and the plugin package in sys.modules """
+    _module("UM", __path__ = [])
+    _module("UM.Logger", Logger = Logger)
+    _module("UM.Application", Application = Application)
+    _module("PostProcessingPlugin", __path__ = [])
+    _module("PostProcessingPlugin.Script", Script = Script)
+    # The scripts are loaded in a package of the PostProcessingPlugin : "from ..Script import Script" of the baseline scripts
+    _module("PostProcessingPlugin.scripts", __path__ = [])
+    plugin = _module("TabPlus", __path__ = [PLUGIN_DIR])
+    # pytest imports the plugin folder as a package by the name of the folder : same package, register is not run
+    sys.modules.setdefault(os.path.basename(PLUGIN_DIR), plugin)
+    # Shared modules of the scripts, registered by register() in Cura
+    importlib.import_module("TabPlus.TabScripts").registerGCodePackage()
+
+
+install()
+sys.path.insert(0, TESTS_DIR)
+
+
+def importTool() -> types.ModuleType:
+    """ Module TabPlus.TabPlus on the stand-ins of benchmarks/cura_stubs, the stand-ins of the
+    scripts are put back once the tool is imported """
+    sys.path.insert(0, os.path.join(PLUGIN_DIR, "benchmarks"))
+    import cura_stubs
+
+    saved_modules = dict(sys.modules)
+    cura_stubs.install()
+    module = importlib.import_module("TabPlus.TabPlus")
+    for name in [name for name in sys.modules if name.split(".")[0] in ("UM", "PyQt6", "cura")]:
+        if name in saved_modules:
+            sys.modules[name] = saved_modules[name]
+        else:
+            del sys.modules[name]
+    return module
+
+
+def loadScript(path: str, name: str) -> type:
+    """ Script class of a script file, every file gets its own module """
+    module_name = "PostProcessingPlugin.scripts.{}_{:d}".format(name, len(sys.modules))
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return getattr(module, name)
+
+
+@pytest.fixture
+def machine_settings():
+    """ Machine settings of the scripts, restored after the test """
+    saved = dict(SETTINGS)
+    yield SETTINGS
+    SETTINGS.clear()
+    SETTINGS.update(saved)
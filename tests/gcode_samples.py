@@ -0,0 +1,114 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Synthetic G-code data of the PostProcessingPlugin (one element per layer)
+#
+# Cura like layers : skirt on the layer 0, outer wall, skin and infill with a retraction
+# and a travel between the sections. The variants cover the absolute / relative extrusion,
+# the Z hop, the Cura 5 travel before the skirt, several objects (print sequence
+# "one_at_a_time"), no skirt and a raft (negative layers).
+#--------------------------------------------------------------------------------------------
+
+import random
+
+from typing import List
+
+
+def gcodeData(layers: int = 5, relative: bool = False, zhop: bool = False, cura5: bool = False, objects: int = 1,
+              skirt: bool = True, raft: int = 0, seed: int = 0, segments: int = 20, wipe: bool = False) -> List[str]:
+    """ G-code data as given to Script.execute()
+
+    param layers: layers per object.
+    param relative: relative extrusion (M83).
+    param zhop: Z hop on the travels.
+    param cura5: travel in two moves before the skirt, as Cura 5.
+    param objects: number of objects printed one at a time.
+    param skirt: skirt on the layer 0.
+    param raft: number of raft layers.
+    param seed: seed of the coordinates.
+    param segments: extrusions per section.
+    param wipe: move without Z and with a comment before the skirt.
+    return: elements of the data
+    """
+    rnd = random.Random(seed)
+    layer_height = 0.2
+    e = 0.0
+    data = [";FLAVOR:Marlin\n;TIME:100\n;Generated with Cura_SteamEngine 5.3.0\n",
+            ";Generated with Cura\n{}\nG92 E0\nG28\nG1 Z15.0 F6000\n;LAYER_COUNT:{:d}\n".format("M83" if relative else "M82", layers)]
+
+    def extrusion(x: float, y: float, speed: int = 0) -> str:
+        nonlocal e
+        de = round(rnd.uniform(0.01, 0.05), 5)
+        e = round(e + de, 5)
+        return "G1 {}X{:.3f} Y{:.3f} E{}".format("F{:d} ".format(speed) if speed else "", x, y, de if relative else e)
+
+    def retraction(length: float) -> str:
+        nonlocal e
+        if relative:
+            return "G1 F2700 E{}".format(length)
+        e = round(e + length, 5)
+        return "G1 F2700 E{}".format(e)
+
+    for number in range(objects):
+        for n in range(-raft, layers):
+            z = round(layer_height * (1 + n + raft), 2)
+            lines = [";LAYER:{:d}".format(n)]
+            if n == 0 and number == 0:
+                lines.append("M107")
+            x, y = rnd.uniform(50, 150), rnd.uniform(50, 150)
+            if cura5:
+                lines.append("G0 F6000 X{:.3f} Y{:.3f} Z{}".format(x + 1, y + 1, z))
+                lines.append("G0 X{:.3f} Y{:.3f}".format(x, y))
+            else:
+                lines.append("G0 F6000 X{:.3f} Y{:.3f} Z{}".format(x, y, z))
+            if n == 0 and skirt:
+                if wipe:
+                    lines.append("G1 X{:.3f} Y{:.3f} E1.0 ;wipe".format(x, y))
+                lines.append(";TYPE:SKIRT")
+                if zhop:
+                    lines.append("G1 F300 Z{}".format(z))
+                lines.append("G1 F2700 E{}".format(5 if relative else e))
+                lines.append(extrusion(x + 0.3, y + 0.2, 1200))
+                lines.extend(extrusion(rnd.uniform(40, 160), rnd.uniform(40, 160)) for _ in range(segments))
+                lines.append("G0 F6000 X{:.3f} Y{:.3f}".format(x, y))
+            lines.append(";MESH:part{:d}.stl".format(number))
+            lines.append("G0 F6000 X{:.3f} Y{:.3f}".format(x, y))
+            for section in ("WALL-OUTER", "SKIN", "FILL"):
+                lines.append(";TYPE:{}".format(section))
+                for index in range(segments):
+                    lines.append(extrusion(rnd.uniform(40, 160), rnd.uniform(40, 160), 0 if index else 1500))
+                    # Same extrusion twice, the relative E values repeat
+                    if relative and rnd.random() < 0.2:
+                        lines.append("G1 X100.000 Y100.000 E0.02")
+                lines.append(retraction(-5))
+                if zhop:
+                    lines.append("G1 F300 Z{}".format(round(z + 0.4, 3)))
+                lines.append("G0 F6000 X{:.3f} Y{:.3f}".format(rnd.uniform(40, 160), rnd.uniform(40, 160)))
+                if zhop:
+                    lines.append("G1 F300 Z{}".format(z))
+                lines.append(retraction(5))
+            lines.append(";TIME_ELAPSED:{:d}".format(n + 10))
+            data.append("\n".join(lines) + "\n")
+    data.append(";End of Gcode\nM140 S0\nM84\n")
+    return data
+
+
+def _variants() -> List[dict]:
+    variants = []
+    for relative in (False, True):
+        for zhop in (False, True):
+            for cura5 in (False, True):
+                for objects in (1, 2):
+                    variants.append(dict(relative = relative, zhop = zhop, cura5 = cura5, objects = objects))
+    variants.append(dict(skirt = False))
+    variants.append(dict(raft = 2))
+    variants.append(dict(layers = 1))
+    variants.append(dict(raft = 2, relative = True, zhop = True))
+    return variants
+
+
+VARIANTS = _variants()
+
+
+def variantId(variant: dict) -> str:
+    return "-".join("{}={}".format(key, value) for key, value in sorted(variant.items()))
@@ -0,0 +1,76 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Notifications of a batch of tabs : the scene change and the property change of the tool
+# are emitted once at the end of the outer batch.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+
+@pytest.fixture(params = (False, True), ids = ("tabs", "merged"))
+def tool(request):
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    application.getPreferences().setValue("tab_plus/merged_tabs", request.param)
+    root = application.getController().getScene().getRoot()
+    for x in (-30.0, 30.0):
+        node = cura_stubs.CuraSceneNode(name = "Part")
+        node.addDecorator(cura_stubs.SliceableObjectDecorator())
+        node.setMeshData(cura_stubs.cylinder(8.0, 10.0, 32))
+        node.setPosition(cura_stubs.Vector(x, 0, 0))
+        node.setParent(root)
+    return TabPlusModule.TabPlus()
+
+
+def _connect(signal) -> list:
+    calls = []
+    signal.connect(lambda *args: calls.append(args))
+    return calls
+
+
+def test_one_notification_per_batch(tool):
+    scene = cura_stubs.CuraApplication.getInstance().getController().getScene()
+    scene_changes = _connect(scene.sceneChanged)
+    property_changes = _connect(tool.propertyChanged)
+    first, last = scene.getRoot().getChildren()
+
+    with tool._batch():
+        tool._notifySceneChanged(first)
+        tool._notifyPropertyChanged()
+        with tool._batch():
+            tool._notifySceneChanged(last)
+            tool._notifyPropertyChanged()
+        assert scene_changes == [] and property_changes == []
+    # The last node of the batch
+    assert scene_changes == [(last,)]
+    assert property_changes == [()]
+
+    # Nothing to notify
+    with tool._batch():
+        pass
+    assert len(scene_changes) == 1 and len(property_changes) == 1
+
+    tool._notifySceneChanged(first)
+    tool._notifyPropertyChanged()
+    assert len(scene_changes) == 2 and len(property_changes) == 2
+
+
+def test_one_property_change_per_action(tool):
+    application = cura_stubs.CuraApplication.getInstance()
+    property_changes = _connect(tool.propertyChanged)
+    tool.addAutoSupportMesh()
+    application.processEvents(wait = True)
+    assert tool._registry.getTabCount() > 1
+    assert len(property_changes) == 1
+
+    tool.removeAllSupportMesh()
+    assert tool._registry.getTabCount() == 0
+    assert len(property_changes) == 2
@@ -0,0 +1,161 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Footprint mode : cut of the mesh just above its bottom (sliceSegments), loops of the cut
+# (the same as the walk from point to point chainSegments replaces) and outer loops of the
+# cut (outerLoops), the holes of the first layer get no tab.
+#--------------------------------------------------------------------------------------------
+
+import math
+
+import numpy
+import pytest
+
+from TabPlus.TabCore import TabFootprint, TabPlacement
+
+
+def _square(center: tuple, size: float) -> numpy.ndarray:
+    """ Counterclockwise square loop in X / Z """
+    half = size / 2
+    return numpy.array(center) + numpy.array([[-half, -half], [half, -half], [half, half], [-half, half]])
+
+
+def _prism(loops: list, height: float = 10.0) -> tuple:
+    """ Side walls of the extrusion of loops along Y, indexed triangles (the caps are not cut) """
+    vertices = []
+    indices = []
+    for loop in loops:
+        start = len(vertices)
+        count = len(loop)
+        vertices += [(x, 0.0, z) for x, z in loop] + [(x, height, z) for x, z in loop]
+        for a in range(count):
+            b = (a + 1) % count
+            indices += [(start + a, start + b, start + count + a), (start + b, start + count + b, start + count + a)]
+    return numpy.array(vertices), numpy.array(indices)
+
+
+def _translation(x: float, y: float, z: float) -> numpy.ndarray:
+    matrix = numpy.identity(4)
+    matrix[:3, 3] = (x, y, z)
+    return matrix
+
+
+def _segmentSet(segments: numpy.ndarray) -> set:
+    return {tuple(sorted(map(tuple, numpy.round(segment, 6).tolist()))) for segment in segments}
+
+
+def referenceLoops(segments: numpy.ndarray) -> list:
+    """ Closed loops of the segments by a walk from point to point """
+    points = segments.reshape(-1, 2)
+    keys = numpy.round(points / TabFootprint._MERGE_DISTANCE).astype(numpy.int64)
+    _, first, point_id = numpy.unique(keys, axis=0, return_index=True, return_inverse=True)
+    coords = points[first]
+    point_id = point_id.reshape(-1, 2)
+    point_id = point_id[point_id[:, 0] != point_id[:, 1]]
+
+    neighbours = {}
+    for a, b in point_id.tolist():
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+
+    loops = []
+    visited = set()
+    for start in neighbours:
+        if start in visited:
+            continue
+        loop = [start]
+        visited.add(start)
+        previous, current = None, start
+        closed = False
+        while True:
+            following = [p for p in neighbours[current] if p != previous]
+            if len(loop) > 2 and start in following:
+                closed = True
+                break
+            following = [p for p in following if p not in visited]
+            if not following:
+                break
+            previous, current = current, following[0]
+            visited.add(current)
+            loop.append(current)
+        if closed:
+            loops.append(coords[loop])
+    return loops
+
+
+def _polygon(rng: numpy.random.Generator, center: numpy.ndarray, radius: float) -> numpy.ndarray:
+    count = int(rng.integers(3, 40))
+    angles = numpy.sort(rng.uniform(0, 2 * math.pi, count))
+    return center + numpy.stack((numpy.cos(angles), numpy.sin(angles)), axis=1) * radius
+
+
+def _randomSegments(seed: int) -> numpy.ndarray:
+    """ Segments of closed polygons and open chains, in a random order and direction """
+    rng = numpy.random.default_rng(seed)
+    segments = []
+    for index in range(int(rng.integers(1, 6))):
+        polygon = _polygon(rng, rng.uniform(-100, 100, 2), rng.uniform(1, 20))
+        if index % 3 == 2:
+            # Open chain
+            segments.append(numpy.stack((polygon[:-1], polygon[1:]), axis=1))
+        else:
+            segments.append(numpy.stack((polygon, numpy.roll(polygon, -1, axis=0)), axis=1))
+    segments = numpy.concatenate(segments)
+    flip = rng.random(segments.shape[0]) < 0.5
+    segments[flip] = segments[flip, ::-1]
+    return segments[rng.permutation(segments.shape[0])]
+
+
+@pytest.mark.parametrize("height", (0.0, 5.0, -2.0))
+def test_slice_segments_of_a_box(height):
+    square = _square((0.0, 0.0), 20.0)
+    vertices, indices = _prism([square])
+    segments = TabFootprint.sliceSegments(vertices, indices, _translation(3.0, height, -4.0))
+    # 2 triangles per side
+    assert segments.shape == (8, 2, 2)
+    points = segments.reshape(-1, 2) - (3.0, -4.0)
+    # Every point on a side of the square
+    assert numpy.allclose(numpy.abs(points).max(axis=1), 10.0)
+    # Same cut for the triangle soup
+    soup = TabFootprint.sliceSegments(vertices[indices.reshape(-1)], None, _translation(3.0, height, -4.0))
+    assert _segmentSet(soup) == _segmentSet(segments)
+
+
+def test_slice_segments_flat_mesh():
+    vertices, indices = _prism([_square((0.0, 0.0), 20.0)], 0.0)
+    assert TabFootprint.sliceSegments(vertices, indices, numpy.identity(4)).shape == (0, 2, 2)
+    assert TabFootprint.sliceSegments(numpy.zeros((0, 3)), None, numpy.identity(4)).shape == (0, 2, 2)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_loops_same_as_walk(seed):
+    segments = _randomSegments(seed)
+    loops = TabFootprint.chainSegments(segments)
+    expected = referenceLoops(segments)
+    assert len(loops) == len(expected)
+    for loop, expected_loop in zip(loops, expected):
+        numpy.testing.assert_array_equal(loop, expected_loop)
+
+
+def test_outer_loops_drop_the_holes():
+    outer = _square((0.0, 0.0), 40.0)
+    hole = _square((0.0, 0.0), 20.0)[::-1]
+    island = _square((0.0, 0.0), 6.0)
+    other = _square((50.0, 0.0), 10.0)
+    tiny = _square((80.0, 0.0), 0.05)
+    loops = TabFootprint.outerLoops([hole, island, tiny, other, outer])
+    assert len(loops) == 2
+    numpy.testing.assert_array_equal(loops[0], outer[::-1])
+    numpy.testing.assert_array_equal(loops[1], other[::-1])
+    # Clockwise as the Cura hulls
+    assert all(TabFootprint._signedArea(loop) < 0 for loop in loops)
+
+
+def test_footprint_tabs_on_the_outline_only():
+    # Frame : square with a square hole, the tabs are on the outer square
+    vertices, indices = _prism([_square((0.0, 0.0), 40.0), _square((0.0, 0.0), 20.0)[::-1]])
+    loops = TabFootprint.footprintLoops(vertices, indices, numpy.identity(4))
+    assert len(loops) == 1
+    positions = TabPlacement.footprintTabPositions(vertices, indices, numpy.identity(4), 7.0)
+    assert len(positions) >= 4
+    assert numpy.allclose(numpy.abs(positions).max(axis=1), 20.0)
@@ -0,0 +1,130 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# The scripts on the shared G-code modules (TabPlusGCode) give the same G-code as the
+# scripts up to V1.1.5 (tests/baseline), one at a time and in one pass (TabPlusFirstLayer).
+#--------------------------------------------------------------------------------------------
+
+import importlib.util
+import itertools
+import os
+import shutil
+import sys
+
+import pytest
+
+from conftest import BASELINE_DIR, PLUGIN_DIR, SCRIPTS_DIR, loadScript
+from gcode_samples import VARIANTS, gcodeData, variantId
+
+SCRIPTS = ("MultiBrim", "ReduceZBrim", "FastFirstInfill")
+
+SCRIPT_SETTINGS = {
+    "MultiBrim": [dict(multiply = multiply, speed = speed) for multiply in (1, 2, 3) for speed in (0, 30)],
+    "ReduceZBrim": [dict(reduce = 0.08, extruder_nb = 1, lcdfeedback = lcd) for lcd in (True, False)],
+    "FastFirstInfill": [dict(infillspeed = 45)],
+}
+
+BASELINE = {name: loadScript(os.path.join(BASELINE_DIR, name + ".py"), name) for name in SCRIPTS}
+CURRENT = {name: loadScript(os.path.join(SCRIPTS_DIR, name + ".py"), name) for name in SCRIPTS}
+TabPlusFirstLayer = loadScript(os.path.join(SCRIPTS_DIR, "TabPlusFirstLayer.py"), "TabPlusFirstLayer")
+
+
+def _script(script_class: type, settings: dict):
+    script = script_class()
+    script._settings = dict(settings)
+    return script
+
+
+def _execute(scripts: list, data: list):
+    """ Data after the scripts in sequence, Exception if a script raised (MultiBrim without skirt or
+    with a raft, the exception is not the same as in the baseline scripts) """
+    data = list(data)
+    try:
+        for script in scripts:
+            data = script.execute(data)
+    except Exception:
+        return Exception
+    return data
+
+
+@pytest.fixture(params = VARIANTS, ids = variantId)
+def variant(request, machine_settings):
+    machine_settings["print_sequence"] = "one_at_a_time" if request.param.get("objects", 1) > 1 else "all_at_once"
+    return request.param
+
+
+@pytest.mark.parametrize("name, settings", [(name, settings) for name in SCRIPTS for settings in SCRIPT_SETTINGS[name]])
+def test_script_same_as_baseline(name, settings, variant):
+    for seed in range(2):
+        data = gcodeData(seed = seed, **variant)
+        expected = _execute([_script(BASELINE[name], settings)], data)
+        assert _execute([_script(CURRENT[name], settings)], data) == expected
+
+
+@pytest.mark.parametrize("flags", list(itertools.product((False, True), repeat = 3)))
+@pytest.mark.parametrize("verify", (False, True))
+def test_first_layer_same_as_baseline_sequence(flags, verify, variant):
+    settings = dict(multibrim = flags[0], reducezbrim = flags[1], fastfirstinfill = flags[2], verify = verify)
+    baseline_scripts = []
+    for name, enabled in zip(SCRIPTS, flags):
+        script_settings = SCRIPT_SETTINGS[name][-1]
+        settings.update(script_settings)
+        if enabled:
+            baseline_scripts.append(_script(BASELINE[name], script_settings))
+
+    for seed in range(2):
+        data = gcodeData(seed = seed, **variant)
+        expected = _execute(baseline_scripts, data)
+        assert _execute([_script(TabPlusFirstLayer, settings)], data) == expected
+
+
+@pytest.mark.parametrize("name, settings", [(name, settings) for name in SCRIPTS for settings in SCRIPT_SETTINGS[name]])
+def test_script_same_as_baseline_comment_before_skirt(name, settings):
+    # The Z added to the line before the skirt is after the comment of the line
+    data = gcodeData(relative = True, zhop = True, layers = 3, seed = 7, wipe = True)
+    expected = _execute([_script(BASELINE[name], settings)], data)
+    assert expected is not Exception
+    assert _execute([_script(CURRENT[name], settings)], data) == expected
+
+
+@pytest.mark.parametrize("flags", list(itertools.product((False, True), repeat = 3)))
+def test_first_layer_same_as_baseline_comment_before_skirt(flags):
+    settings = dict(multibrim = flags[0], reducezbrim = flags[1], fastfirstinfill = flags[2], verify = False)
+    baseline_scripts = []
+    for name, enabled in zip(SCRIPTS, flags):
+        script_settings = SCRIPT_SETTINGS[name][-1]
+        settings.update(script_settings)
+        if enabled:
+            baseline_scripts.append(_script(BASELINE[name], script_settings))
+
+    data = gcodeData(relative = True, zhop = True, layers = 3, seed = 7, wipe = True)
+    assert _execute([_script(TabPlusFirstLayer, settings)], data) == _execute(baseline_scripts, data)
+
+
+def test_scripts_in_renamed_plugin_folder(tmp_path):
+    # Plugin installed from a zip of GitHub : the shared modules are found from the folder of the plugin
+    plugin_dir = str(tmp_path / "TabPlus-main")
+    scripts_dir = os.path.join(plugin_dir, "resources", "scripts")
+    shutil.copytree(SCRIPTS_DIR, scripts_dir, ignore = shutil.ignore_patterns("__pycache__"))
+    shutil.copy(os.path.join(PLUGIN_DIR, "TabScripts.py"), plugin_dir)
+    saved_modules = dict(sys.modules)
+    for name in list(sys.modules):
+        if name.split(".")[0] in ("TabPlus", "_TabPlusGCode", os.path.basename(PLUGIN_DIR)):
+            del sys.modules[name]
+    try:
+        spec = importlib.util.spec_from_file_location("TabPlus-main.TabScripts", os.path.join(plugin_dir, "TabScripts.py"))
+        tab_scripts = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(tab_scripts)
+        tab_scripts.registerGCodePackage()
+        scripts = {name: loadScript(os.path.join(scripts_dir, name + ".py"), name) for name in SCRIPTS + ("TabPlusFirstLayer",)}
+        assert sys.modules["_TabPlusGCode"].__path__ == [os.path.join(scripts_dir, "TabPlusGCode")]
+        assert "TabPlus" not in sys.modules
+    finally:
+        for name in set(sys.modules) - set(saved_modules):
+            del sys.modules[name]
+        sys.modules.update(saved_modules)
+
+    data = gcodeData(seed = 1)
+    for name in SCRIPTS:
+        settings = SCRIPT_SETTINGS[name][-1]
+        assert _execute([_script(scripts[name], settings)], data) == _execute([_script(CURRENT[name], settings)], data)
@@ -0,0 +1,80 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# ParsedGCode : the arrays of a layer give the same commands and values as GCodeLine, and
+# FastFirstInfill on a large layer 0 (read as a ParsedGCode) gives the output of V1.1.5.
+#--------------------------------------------------------------------------------------------
+
+import math
+import os
+
+import numpy
+import pytest
+
+from conftest import BASELINE_DIR, SCRIPTS_DIR, loadScript
+from gcode_samples import gcodeData
+
+BASELINE = loadScript(os.path.join(BASELINE_DIR, "FastFirstInfill.py"), "FastFirstInfill")
+CURRENT = loadScript(os.path.join(SCRIPTS_DIR, "FastFirstInfill.py"), "FastFirstInfill")
+
+# Registered by tests/conftest
+from _TabPlusGCode.GCodeTokenizer import GCodeLine  # noqa: E402
+from _TabPlusGCode.ParsedGCode import LETTERS, NO_COMMAND, ParsedGCode, commandCode  # noqa: E402
+
+LINES = [
+    ";LAYER:0", "", "G0 F6000 X10.5 Y-3", "G1 X.5 Y1. E-0 F+1200", "G1 X Y- E.", "G92 E0", "M83", "T1", "G1;X3",
+    "G1 E2 ; comment X4", "G1 X1 X2", "G1 X123456789012345678 Y3.14159265358979323 Z0.000001", "G1234567890 X1",
+    "M204 S500", "X1 Y2", ";TYPE:SKIN", "G1 X1é Y2", "é G1 X3",
+]
+
+
+def _script(script_class: type):
+    script = script_class()
+    script._settings = dict(infillspeed = 45)
+    return script
+
+
+def test_arrays_same_as_gcode_line():
+    gcode = ParsedGCode("\n".join(LINES))
+    assert len(gcode) == len(LINES)
+    for index, text in enumerate(LINES):
+        line = GCodeLine(text, index)
+        assert gcode.line(index) == text
+        assert gcode.command[index] == (commandCode(line.command) if line.command else NO_COMMAND)
+        for letter in LETTERS:
+            raw = line.raw(letter) if line.command else None
+            assert gcode.has(letter)[index] == (raw is not None)
+            value = gcode.value(letter)[index]
+            expected = line.value(letter) if raw is not None else None
+            if expected is None:
+                assert math.isnan(value)
+            else:
+                assert value == expected and math.copysign(1, value) == math.copysign(1, expected)
+
+
+def test_values_same_as_float():
+    layer = gcodeData(layers = 1, relative = True, segments = 200)[2]
+    gcode = ParsedGCode(layer)
+    for letter in LETTERS:
+        expected = [GCodeLine(text, index).value(letter) for index, text in enumerate(layer.split("\n"))]
+        expected = numpy.array([numpy.nan if value is None else value for value in expected])
+        numpy.testing.assert_array_equal(gcode.value(letter), expected)
+
+
+def test_find_lines_and_edits():
+    text = ";LAYER:1\n;TYPE:SKIN\nG1 ;TYPE\n;TYP\né\n;TYPE:FILL"
+    gcode = ParsedGCode(text)
+    assert gcode.findLines(";LAYER:", ";TYPE").tolist() == [0, 1, 5]
+    assert gcode.toString() is text
+    gcode.setLine(2, "G1 F100\nG1 F200")
+    gcode.setLine(4, "è")
+    assert gcode.isModified()
+    assert gcode.toString() == ";LAYER:1\n;TYPE:SKIN\nG1 F100\nG1 F200\n;TYP\nè\n;TYPE:FILL"
+    assert len(ParsedGCode("")) == 1 and ParsedGCode("").findLines(";TYPE").tolist() == []
+
+
+@pytest.mark.parametrize("relative", (False, True))
+def test_large_first_layer_same_as_baseline(relative, machine_settings):
+    data = gcodeData(layers = 3, relative = relative)
+    data[2] = gcodeData(layers = 1, relative = relative, segments = 2000)[2]
+    assert _script(CURRENT).execute(list(data)) == _script(BASELINE).execute(list(data))
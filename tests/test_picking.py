@@ -0,0 +1,106 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Picking pass kept between the clicks : adding or removing tabs does not render it again,
+# a change of an object or of the view does. The stand-ins forward the signals of the
+# children up to Scene.sceneChanged, as Uranium.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+import numpy
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+
+class _Camera:
+    def __init__(self) -> None:
+        self.width = 800
+
+    def getViewportWidth(self) -> int:
+        return self.width
+
+    def getViewportHeight(self) -> int:
+        return 600
+
+    def getProjectionMatrix(self):
+        return cura_stubs.Matrix(numpy.identity(4))
+
+
+class _PickingPass:
+    renders = 0
+
+    def __init__(self, width: int, height: int) -> None:
+        pass
+
+    def render(self) -> None:
+        _PickingPass.renders += 1
+
+    def getPickedPosition(self, x: float, y: float):
+        return cura_stubs.Vector(0, 0, 0)
+
+
+@pytest.fixture(params = (False, True), ids = ("tabs", "merged"))
+def tool(request, monkeypatch):
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    application.getPreferences().setValue("tab_plus/merged_tabs", request.param)
+    camera = _Camera()
+    monkeypatch.setattr(cura_stubs.Scene, "getActiveCamera", lambda scene: camera)
+    monkeypatch.setattr(TabPlusModule, "PickingPass", _PickingPass)
+    _PickingPass.renders = 0
+    node = cura_stubs.CuraSceneNode(name = "Part")
+    node.addDecorator(cura_stubs.SliceableObjectDecorator())
+    node.setMeshData(cura_stubs.cylinder(8.0, 10.0, 32))
+    node.setParent(application.getController().getScene().getRoot())
+    tool = TabPlusModule.TabPlus()
+    tool.camera = camera
+    return tool
+
+
+def _part():
+    return cura_stubs.CuraApplication.getInstance().getController().getScene().getRoot().getChildren()[0]
+
+
+def test_scene_changed_forwarded_by_the_stand_ins(tool):
+    changed = []
+    cura_stubs.CuraApplication.getInstance().getController().getScene().sceneChanged.connect(changed.append)
+    child = cura_stubs.SceneNode(name = "Child")
+    child.setParent(_part())
+    assert changed == [_part()]
+
+
+def test_tabs_do_not_render_the_pass(tool):
+    tool._getPickedPosition(10, 10)
+    assert _PickingPass.renders == 1
+
+    tool.addAutoSupportMesh()
+    cura_stubs.CuraApplication.getInstance().processEvents(wait = True)
+    assert tool._registry.getTabCount() > 0
+    tool._getPickedPosition(10, 10)
+    assert _PickingPass.renders == 1
+
+    tool.removeAllSupportMesh()
+    tool._getPickedPosition(10, 10)
+    assert _PickingPass.renders == 1
+
+
+def test_object_and_view_changes_render_the_pass(tool):
+    tool._getPickedPosition(10, 10)
+    _part().setPosition(cura_stubs.Vector(20, 0, 0))
+    tool._getPickedPosition(10, 10)
+    assert _PickingPass.renders == 2
+
+    other = cura_stubs.CuraSceneNode(name = "Other")
+    other.setMeshData(cura_stubs.cylinder(5.0, 5.0, 16))
+    other.setParent(_part().getParent())
+    tool._getPickedPosition(10, 10)
+    assert _PickingPass.renders == 3
+
+    tool.camera.width = 1024
+    tool._getPickedPosition(10, 10)
+    assert _PickingPass.renders == 4
@@ -0,0 +1,89 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Cache of the automatic tab positions : the positions of an object are computed again when
+# the object is moved, its mesh changed or a setting of the key changed, not when tabs are
+# added to it.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+import numpy
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+from TabPlus.TabPlacementCache import PlacementCache  # noqa: E402
+
+
+def _part(x: float = 0.0):
+    node = cura_stubs.CuraSceneNode(name = "Part")
+    node.addDecorator(cura_stubs.SliceableObjectDecorator())
+    node.setMeshData(cura_stubs.cylinder(8.0, 10.0, 32))
+    node.setPosition(cura_stubs.Vector(x, 0, 0))
+    return node
+
+
+def test_entry_removed_by_the_node_changes():
+    cache = PlacementCache()
+    node = _part()
+    positions = numpy.zeros((3, 2))
+    cache.put(node, ("key",), positions)
+    assert cache.get(node, ("key",)) is positions
+    assert cache.get(node, ("other key",)) is None
+    assert not positions.flags.writeable
+
+    # A child (tab) moved does not change the positions of the object
+    child = cura_stubs.SceneNode(name = "Tab")
+    child.setParent(node)
+    child.setPosition(cura_stubs.Vector(5, 0, 0))
+    assert cache.get(node, ("key",)) is positions
+
+    node.setPosition(cura_stubs.Vector(10, 0, 0))
+    assert cache.get(node, ("key",)) is None
+    cache.put(node, ("key",), positions)
+    node.setMeshData(cura_stubs.cylinder(5.0, 10.0, 16))
+    assert cache.get(node, ("key",)) is None
+    assert cache.getStats() == (2, 3)
+
+
+@pytest.fixture
+def tool():
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    root = application.getController().getScene().getRoot()
+    for x in (-30.0, 30.0):
+        _part(x).setParent(root)
+    return TabPlusModule.TabPlus()
+
+
+def _addAutoTabs(tool) -> None:
+    tool.addAutoSupportMesh()
+    cura_stubs.CuraApplication.getInstance().processEvents(wait = True)
+
+
+def test_auto_addition_reads_the_cache(tool):
+    root = cura_stubs.CuraApplication.getInstance().getController().getScene().getRoot()
+    parts = list(root.getChildren())
+    _addAutoTabs(tool)
+    assert tool._placement_cache.getStats() == (0, 2)
+    nb_tabs = tool._registry.getTabCount()
+
+    # The tabs added to the objects keep their entries, all the positions are taken
+    _addAutoTabs(tool)
+    assert tool._placement_cache.getStats() == (2, 2)
+    assert tool._registry.getTabCount() == nb_tabs
+
+    # The moved object is computed again, its tabs move with it
+    parts[0].setPosition(cura_stubs.Vector(-60, 0, 0))
+    _addAutoTabs(tool)
+    assert tool._placement_cache.getStats() == (3, 3)
+    assert tool._registry.getTabCount() == nb_tabs
+
+    # Tab size of the key
+    tool.setSSize(6)
+    _addAutoTabs(tool)
+    assert tool._placement_cache.getStats() == (3, 5)
@@ -0,0 +1,112 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Preview of the automatic addition : shown while the tool is active, computed again when the
+# tabs change (also by an undo / redo), not measured by the profiler of the tool panel.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+import types
+
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+
+class _Events:
+    """ Event types compared by name """
+
+    def __getattr__(self, name: str) -> str:
+        return name
+
+
+def _event(tool, name: str) -> None:
+    tool.event(types.SimpleNamespace(type = name))
+
+
+@pytest.fixture(params = (False, True), ids = ("tabs", "merged"))
+def tool(request, monkeypatch):
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    monkeypatch.setattr(TabPlusModule, "Event", _Events())
+    preferences = application.getPreferences()
+    preferences.setValue("tab_plus/merged_tabs", request.param)
+    preferences.setValue("tab_plus/preview", True)
+    preferences.setValue("tab_plus/profiling", True)
+    root = application.getController().getScene().getRoot()
+    for x in (-30.0, 30.0):
+        node = cura_stubs.CuraSceneNode(name = "Part")
+        node.addDecorator(cura_stubs.SliceableObjectDecorator())
+        node.setMeshData(cura_stubs.cylinder(8.0, 10.0, 32))
+        node.setPosition(cura_stubs.Vector(x, 0, 0))
+        node.setParent(root)
+    tool = TabPlusModule.TabPlus()
+    tool._Preview = True
+    return tool
+
+
+def _preview(tool) -> int:
+    """ return: number of discs of the preview, None if it is hidden """
+    node = tool._preview_node
+    if node is None or node.getParent() is None:
+        return None
+    return node.getTabCount()
+
+
+def _wait(tool) -> None:
+    application = cura_stubs.CuraApplication.getInstance()
+    while tool._preview_running:
+        application.processEvents(wait = True)
+
+
+def test_preview_shown_while_the_tool_is_active(tool):
+    assert _preview(tool) is None
+    _event(tool, "ToolActivateEvent")
+    _wait(tool)
+    assert _preview(tool) > 4
+    assert tool._registry.getTabCount() == 0
+
+    _event(tool, "ToolDeactivateEvent")
+    assert _preview(tool) is None
+
+
+def test_preview_refreshed_by_undo_redo(tool):
+    stack = cura_stubs.CuraApplication.getInstance().getOperationStack()
+    _event(tool, "ToolActivateEvent")
+    _wait(tool)
+    nb_tabs = _preview(tool)
+
+    # All the positions of the preview are taken by the tabs
+    tool.addAutoSupportMesh()
+    cura_stubs.CuraApplication.getInstance().processEvents(wait = True)
+    _wait(tool)
+    assert sum(len(tool._getTabCentres(node)) for node in tool._registry.getTabs()) == nb_tabs
+    assert _preview(tool) == 0
+
+    stack.undo()
+    _wait(tool)
+    assert _preview(tool) == nb_tabs
+    stack.redo()
+    _wait(tool)
+    assert _preview(tool) == 0
+
+
+def test_preview_not_profiled(tool):
+    _event(tool, "ToolActivateEvent")
+    _wait(tool)
+    assert tool._profiler.getCounters() == {} and tool._profiler.getPhases() == {}
+
+    tool.addAutoSupportMesh()
+    cura_stubs.CuraApplication.getInstance().processEvents(wait = True)
+    _wait(tool)
+    phases, counters = tool._profiler.getPhases(), tool._profiler.getCounters()
+    # The positions of the preview are read from the cache by the automatic addition
+    assert counters["cached"] == 2 and counters["tabs"] > 4
+
+    cura_stubs.CuraApplication.getInstance().getOperationStack().undo()
+    _wait(tool)
+    assert tool._profiler.getPhases() == phases and tool._profiler.getCounters() == counters
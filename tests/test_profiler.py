@@ -0,0 +1,90 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Timings of the tab creation : phases and counters of TabCore.TabProfiler, nothing measured
+# when the profiling is off, summary of the automatic addition in the tool panel.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+import threading
+
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+from TabPlus.TabCore.TabProfiler import Profiler  # noqa: E402
+
+
+def test_phases_and_counters():
+    profiler = Profiler(True)
+    for _ in range(3):
+        with profiler.phase("mesh"):
+            pass
+    profiler.count("tabs")
+    profiler.count("tabs", 4)
+    assert profiler.wrap("hull", max)(2, 5) == 5
+
+    phases = profiler.getPhases()
+    assert sorted(phases) == ["hull", "mesh"]
+    assert phases["mesh"][1] == 3 and phases["hull"][1] == 1
+    assert profiler.getCounters() == {"tabs": 5}
+    lines = profiler.summary().split("\n")
+    assert lines[0].startswith("mesh : ") and lines[0].endswith(" ms (3)")
+    assert lines[-1] == "tabs 5"
+
+    profiler.reset()
+    assert profiler.getPhases() == {} and profiler.getCounters() == {} and profiler.summary() == ""
+
+
+def test_disabled_profiler_measures_nothing():
+    profiler = Profiler()
+    with profiler.phase("mesh"):
+        pass
+    profiler.count("tabs")
+    assert profiler.wrap("hull", max) is max
+    assert profiler.getPhases() == {} and profiler.getCounters() == {}
+
+
+def test_phases_of_the_worker_threads():
+    profiler = Profiler(True)
+    measured = profiler.wrap("hull", lambda: None)
+    threads = [threading.Thread(target = measured) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert profiler.getPhases()["hull"][1] == 8
+
+
+@pytest.mark.parametrize("profiling", (False, True))
+def test_profile_of_the_automatic_addition(profiling):
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    application.getPreferences().setValue("tab_plus/profiling", profiling)
+    node = cura_stubs.CuraSceneNode(name = "Part")
+    node.addDecorator(cura_stubs.SliceableObjectDecorator())
+    node.setMeshData(cura_stubs.cylinder(8.0, 10.0, 32))
+    node.setParent(application.getController().getScene().getRoot())
+    tool = TabPlusModule.TabPlus()
+    tool.addAutoSupportMesh()
+    application.processEvents(wait = True)
+
+    nb_tabs = tool._registry.getTabCount()
+    assert nb_tabs > 3
+    if not profiling:
+        assert tool.getSProfile() == ""
+        return
+    phases = tool._profiler.getPhases()
+    assert {"hull", "mesh", "settings", "push", "total"} <= set(phases)
+    assert phases["mesh"][1] == nb_tabs
+    counters = tool._profiler.getCounters()
+    assert counters["tabs"] == nb_tabs and "cached" not in counters
+    assert tool.getSProfile() == tool._profiler.summary()
+
+    # Switched off : the profile of the panel is cleared
+    application.getPreferences().setValue("tab_plus/profiling", False)
+    assert tool.getSProfile() == ""
@@ -0,0 +1,82 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Remove All : the tabs of every object are removed in one grouped operation, one undo puts
+# them all back. The support meshes which are not tabs of the tool are kept.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+
+def _supportMeshes(root) -> list:
+    return [node for node in cura_stubs.DepthFirstIterator(root)
+            if node.callDecoration("getStack") and node.callDecoration("getStack").getProperty("support_mesh", "value")]
+
+
+def _tabCount(root) -> int:
+    count = 0
+    for node in _supportMeshes(root):
+        count += node.callDecoration("getTabCount") or 1
+    return count
+
+
+@pytest.fixture(params = (False, True), ids = ("tabs", "merged"))
+def tool(request):
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    application.getPreferences().setValue("tab_plus/merged_tabs", request.param)
+    root = application.getController().getScene().getRoot()
+    for x in (-30.0, 30.0):
+        node = cura_stubs.CuraSceneNode(name = "Part")
+        node.addDecorator(cura_stubs.SliceableObjectDecorator())
+        node.setMeshData(cura_stubs.cylinder(8.0, 10.0, 32))
+        node.setPosition(cura_stubs.Vector(x, 0, 0))
+        node.setParent(root)
+    return TabPlusModule.TabPlus()
+
+
+def test_remove_all_one_undo_step(tool):
+    application = cura_stubs.CuraApplication.getInstance()
+    root = application.getController().getScene().getRoot()
+    stack = application.getOperationStack()
+    tool.addAutoSupportMesh()
+    application.processEvents(wait = True)
+    nb_tabs = _tabCount(root)
+    assert nb_tabs > 4
+
+    # Remove Last, undone : the tabs are back and the next click is Remove All
+    tool.removeAllSupportMesh()
+    assert _tabCount(root) == 0
+    stack.undo()
+    assert _tabCount(root) == nb_tabs
+
+    nb_operations = len(stack.getOperations())
+    tool.removeAllSupportMesh()
+    assert _tabCount(root) == 0
+    assert len(stack.getOperations()) == nb_operations + 1
+    stack.undo()
+    assert _tabCount(root) == nb_tabs
+    stack.redo()
+    assert _tabCount(root) == 0
+
+
+def test_remove_all_keeps_other_support_meshes(tool):
+    application = cura_stubs.CuraApplication.getInstance()
+    root = application.getController().getScene().getRoot()
+    blocker = cura_stubs.CuraSceneNode(name = "Support")
+    blocker.setMeshData(cura_stubs.cylinder(2.0, 10.0, 8))
+    blocker.callDecoration("getStack").setProperty("support_mesh", "value", True)
+    blocker.setParent(root)
+
+    tool.addAutoSupportMesh()
+    application.processEvents(wait = True)
+    tool.removeAllSupportMesh()
+    tool.removeAllSupportMesh()
+    assert _supportMeshes(root) == [blocker]
@@ -0,0 +1,149 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Stroke of tabs : the press adds a tab, the moves of the drag add the tabs along the object,
+# the release pushes all the tabs of the stroke in one operation. The stroke is also closed
+# when the tool is deactivated and when a move fails.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+import types
+
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+
+class _Events:
+    """ Event types compared by name """
+
+    def __getattr__(self, name: str) -> str:
+        return name
+
+
+class _MouseEvent:
+    LeftButton = "left"
+
+
+class _Camera:
+    def getViewportWidth(self) -> int:
+        return 800
+
+    def getViewportHeight(self) -> int:
+        return 600
+
+    def getProjectionMatrix(self):
+        return cura_stubs.Matrix()
+
+
+class _PickingPass:
+    """ The mouse position is the X / Z position of the build plate """
+    fail = False
+
+    def __init__(self, width: int, height: int) -> None:
+        pass
+
+    def render(self) -> None:
+        pass
+
+    def getPickedPosition(self, x: float, y: float):
+        if _PickingPass.fail:
+            raise RuntimeError("picking")
+        return cura_stubs.Vector(x, 0, y)
+
+
+class _SelectionPass:
+    """ The object is under the mouse up to 20 mm of the origin """
+
+    def __init__(self, node) -> None:
+        self._node = node
+
+    def getIdAtPosition(self, x: float, y: float):
+        return self._node if abs(x) <= 20 and abs(y) <= 20 else None
+
+
+@pytest.fixture(params = (False, True), ids = ("tabs", "merged"))
+def tool(request, monkeypatch):
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    application.getPreferences().setValue("tab_plus/merged_tabs", request.param)
+    monkeypatch.setattr(TabPlusModule, "Event", _Events())
+    monkeypatch.setattr(TabPlusModule, "MouseEvent", _MouseEvent)
+    monkeypatch.setattr(TabPlusModule, "PickingPass", _PickingPass)
+    camera = _Camera()
+    monkeypatch.setattr(cura_stubs.Scene, "getActiveCamera", lambda scene: camera)
+    monkeypatch.setattr(cura_stubs.Scene, "findObject", lambda scene, node: node)
+    _PickingPass.fail = False
+    node = cura_stubs.CuraSceneNode(name = "Part")
+    node.addDecorator(cura_stubs.SliceableObjectDecorator())
+    node.setMeshData(cura_stubs.cylinder(20.0, 10.0, 64))
+    node.setParent(application.getController().getScene().getRoot())
+    tool = TabPlusModule.TabPlus()
+    tool._selection_pass = _SelectionPass(node)
+    # Every move is picked
+    tool._PAINT_INTERVAL = 0.0
+    return tool
+
+
+def _mouse(tool, name: str, x: float = 0.0, y: float = 0.0) -> None:
+    tool.event(types.SimpleNamespace(type = name, x = x, y = y, buttons = ["left"]))
+
+
+def _tabCount(tool) -> int:
+    return sum(len(tool._getTabCentres(node)) for node in tool._registry.getTabs())
+
+
+def _operations() -> list:
+    return cura_stubs.CuraApplication.getInstance().getOperationStack().getOperations()
+
+
+def test_stroke_one_operation(tool):
+    _mouse(tool, "MousePressEvent", 0, -10)
+    # Nothing pushed during the drag
+    assert tool._stroke_batch is not None and _operations() == []
+    # Too close of the previous tab, then far enough, then out of the object
+    for x in (3, 8, 16, 30):
+        _mouse(tool, "MouseMoveEvent", x, -10)
+    assert _operations() == []
+    assert tool._stroke_count == 3
+
+    _mouse(tool, "MouseReleaseEvent", 30, -10)
+    assert tool._stroke_batch is None and tool._batch_depth == 0
+    assert len(_operations()) == 1
+    assert _tabCount(tool) == 3
+    centres = [centre for node in tool._registry.getTabs() for centre in tool._getTabCentres(node)]
+    assert sorted((round(x), round(z)) for x, z in centres) == [(0, -10), (8, -10), (16, -10)]
+
+    cura_stubs.CuraApplication.getInstance().getOperationStack().undo()
+    assert _tabCount(tool) == 0
+
+
+def test_moves_limited_by_the_interval(tool):
+    tool._PAINT_INTERVAL = 3600.0
+    _mouse(tool, "MousePressEvent", 0, -10)
+    for x in (8, 16):
+        _mouse(tool, "MouseMoveEvent", x, -10)
+    _mouse(tool, "MouseReleaseEvent", 16, -10)
+    assert _tabCount(tool) == 1
+
+
+def test_stroke_closed_on_deactivation(tool):
+    _mouse(tool, "MousePressEvent", 0, -10)
+    _mouse(tool, "MouseMoveEvent", 8, -10)
+    tool.event(types.SimpleNamespace(type = "ToolDeactivateEvent"))
+    assert tool._stroke_batch is None and tool._batch_depth == 0
+    assert len(_operations()) == 1 and _tabCount(tool) == 2
+
+
+def test_stroke_closed_on_error(tool):
+    _mouse(tool, "MousePressEvent", 0, -10)
+    _PickingPass.fail = True
+    with pytest.raises(RuntimeError):
+        _mouse(tool, "MouseMoveEvent", 8, -10)
+    # The tab of the press is kept
+    assert tool._stroke_batch is None and tool._batch_depth == 0
+    assert len(_operations()) == 1 and _tabCount(tool) == 1
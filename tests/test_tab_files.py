@@ -0,0 +1,102 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Batch mode : STL files (binary and ASCII) and 3MF files read and written by TabCore.TabFiles,
+# tabs added to the files by TabCore.TabBatch.
+#--------------------------------------------------------------------------------------------
+
+import numpy
+import pytest
+
+from TabPlus.TabCore import TabBatch, TabFiles
+
+
+def _box(size: float = 20.0, height: float = 10.0) -> numpy.ndarray:
+    """ Triangle soup of a box on Z = 0, centered on the origin """
+    half = size / 2
+    corners = numpy.array([[x, y, z] for z in (0, height) for y in (-half, half) for x in (-half, half)])
+    faces = [(0, 2, 1), (1, 2, 3), (4, 5, 6), (5, 7, 6), (0, 1, 4), (1, 5, 4),
+             (2, 6, 3), (3, 6, 7), (0, 4, 2), (2, 4, 6), (1, 3, 5), (3, 7, 5)]
+    return corners[numpy.array(faces).reshape(-1)]
+
+
+def _binaryStl(vertices: numpy.ndarray, header: bytes = b"binary") -> bytes:
+    record = numpy.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+    facets = numpy.zeros(len(vertices) // 3, dtype = record)
+    facets["vertices"] = vertices.reshape(-1, 3, 3)
+    return header.ljust(80, b" ") + numpy.array([len(facets)], dtype = "<u4").tobytes() + facets.tobytes()
+
+
+def _asciiStl(vertices: numpy.ndarray) -> bytes:
+    lines = ["solid box"]
+    for facet in vertices.reshape(-1, 3, 3):
+        lines += ["facet normal 0 0 0", "outer loop"]
+        lines += ["vertex {} {} {}".format(*vertex) for vertex in facet]
+        lines += ["endloop", "endfacet"]
+    lines.append("endsolid box")
+    return "\n".join(lines).encode("ascii")
+
+
+@pytest.mark.parametrize("content", [
+    lambda box: _binaryStl(box),
+    lambda box: _binaryStl(box) + b"\0" * 7,
+    lambda box: _binaryStl(box, b"solid box exported as binary"),
+    lambda box: _binaryStl(box, b"solid box exported as binary") + b"\0" * 7,
+    lambda box: _asciiStl(box),
+], ids = ["binary", "binary-extra-bytes", "binary-solid-header", "binary-solid-header-extra-bytes", "ascii"])
+def test_read_stl(tmp_path, content):
+    box = _box()
+    path = tmp_path / "box.stl"
+    path.write_bytes(content(box))
+    objects = TabFiles.readStl(str(path))
+    assert len(objects) == 1 and objects[0].name == "box"
+    numpy.testing.assert_allclose(objects[0].vertices, box)
+
+
+@pytest.mark.parametrize("content", [b"", b"not a model", b"\0" * 80 + b"\5\0\0\0" + b"\1" * 30, b"solid box\nfacet normal 0 0 0\n"])
+def test_read_stl_error(tmp_path, content):
+    path = tmp_path / "broken.stl"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        TabFiles.readStl(str(path))
+
+
+@pytest.mark.parametrize("merged", (False, True))
+def test_stl_to_3mf(tmp_path, merged):
+    path = tmp_path / "box.stl"
+    path.write_bytes(_binaryStl(_box()))
+    options = TabBatch.parseArguments([str(path), "--size", "5", "--output", str(tmp_path / "out")] + (["--merged"] if merged else []))
+    (tmp_path / "out").mkdir()
+    source, output, nb_objects, nb_tabs = TabBatch.processFile(str(path), options)
+    # One tab on every corner of the box
+    assert (nb_objects, nb_tabs) == (1, 4)
+
+    objects = TabFiles.read3mf(output)
+    part = [model_object for model_object in objects if not model_object.isSupportMesh()]
+    tabs = [model_object for model_object in objects if model_object.isSupportMesh()]
+    assert len(part) == 1
+    numpy.testing.assert_allclose(part[0].vertices, _box(), atol = 1e-4)
+    assert len(tabs) == (1 if merged else 4)
+    assert all(tab.settings["support_xy_distance"] == "0.16" for tab in tabs)
+    # Tabs on the build plate, centered on the corners
+    tab_vertices = numpy.concatenate([tab.vertices for tab in tabs])
+    assert tab_vertices[:, 2].min() == pytest.approx(0.0, abs = 1e-4)
+    assert numpy.abs(tab_vertices[:, :2]).max() == pytest.approx(12.5, abs = 0.01)
+
+    # Second run on the 3MF : the tabs of the file are kept, no tab is added on top of them
+    source, output, nb_objects, nb_tabs = TabBatch.processFile(output, options)
+    assert nb_tabs == 0
+    assert len(TabFiles.read3mf(output)) == len(objects)
+
+
+def test_batch_command_line(tmp_path, capsys):
+    for name in ("a", "b"):
+        (tmp_path / (name + ".stl")).write_bytes(_asciiStl(_box()))
+    (tmp_path / "broken.stl").write_bytes(b"not a model")
+    files = [str(tmp_path / name) for name in ("a.stl", "broken.stl", "b.stl")]
+
+    assert TabBatch.main(files + ["--output", str(tmp_path / "out"), "--jobs", "1"]) == 1
+    out, err = capsys.readouterr()
+    assert "broken.stl" in err
+    assert out.count("1 objects, 4 tabs") == 2
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == ["a_tabs.3mf", "b_tabs.3mf"]
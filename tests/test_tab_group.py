@@ -0,0 +1,80 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Merged tabs : the tabs of an operation are added to / removed from the merged support mesh
+# at once, the mesh of the node is set once per operation.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+
+@pytest.fixture
+def tool():
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    application.getPreferences().setValue("tab_plus/merged_tabs", True)
+    node = cura_stubs.CuraSceneNode(name = "Part")
+    node.addDecorator(cura_stubs.SliceableObjectDecorator())
+    node.setMeshData(cura_stubs.cylinder(20.0, 10.0, 64))
+    node.setParent(application.getController().getScene().getRoot())
+    return TabPlusModule.TabPlus()
+
+
+@pytest.fixture
+def mesh_updates(monkeypatch):
+    """ Number of setMeshData calls of the merged tab nodes """
+    updates = []
+    set_mesh_data = cura_stubs.SceneNode.setMeshData
+
+    def setMeshData(node, mesh_data) -> None:
+        if node.callDecoration("isTabGroup"):
+            updates.append(node)
+        set_mesh_data(node, mesh_data)
+
+    monkeypatch.setattr(cura_stubs.SceneNode, "setMeshData", setMeshData)
+    return updates
+
+
+def _group():
+    part = cura_stubs.CuraApplication.getInstance().getController().getScene().getRoot().getChildren()[0]
+    groups = [child for child in part.getChildren() if child.callDecoration("isTabGroup")]
+    assert len(groups) == 1
+    return groups[0]
+
+
+def test_auto_tabs_merged_once(tool, mesh_updates):
+    tool.addAutoSupportMesh()
+    cura_stubs.CuraApplication.getInstance().processEvents(wait = True)
+    group = _group()
+    nb_tabs = group.callDecoration("getTabCount")
+    assert nb_tabs > 3
+    assert mesh_updates == [group]
+    # One copy of the tab mesh per tab in the merged buffers
+    tab = group.callDecoration("getTabs")[0]
+    assert group.getMeshData().getVertices().shape[0] == nb_tabs * tab.vertices.shape[0]
+
+
+def test_remove_tabs_merged_once(tool, mesh_updates):
+    tool.addAutoSupportMesh()
+    cura_stubs.CuraApplication.getInstance().processEvents(wait = True)
+    group = _group()
+    tabs = group.callDecoration("getTabs")
+    del mesh_updates[:]
+
+    tool._removeSupportMeshes([], [(group, tab) for tab in tabs[:3]])
+    assert mesh_updates == [group]
+    assert group.callDecoration("getTabs") == tabs[3:]
+
+    operation = TabPlusModule.RemoveTabOperation(group, tabs[3:])
+    operation.redo()
+    assert group.getMeshData() is None
+    operation.undo()
+    assert group.callDecoration("getTabs") == tabs[3:]
+    assert group.getMeshData().getVertices().shape[0] == len(tabs[3:]) * tabs[0].vertices.shape[0]
@@ -0,0 +1,57 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# The hull of TabCore.TabHull is the hull of a monotone chain : same points, clockwise from
+# the smallest X.
+#--------------------------------------------------------------------------------------------
+
+import math
+
+import numpy
+import pytest
+
+from TabPlus.TabCore import TabHull
+
+
+def _cross(o, a, b) -> float:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def referenceHull(points: numpy.ndarray) -> numpy.ndarray:
+    """ Monotone chain, clockwise starting on the smallest X """
+    points = numpy.unique(numpy.asarray(points, dtype=numpy.float64).reshape(-1, 2), axis=0)
+    if points.shape[0] < 3:
+        return points
+
+    def halfHull(points):
+        hull = []
+        for p in points:
+            while len(hull) >= 2 and _cross(hull[-2], hull[-1], p) <= 0:
+                hull.pop()
+            hull.append(p)
+        return hull
+
+    hull = numpy.array(halfHull(points)[:-1] + halfHull(points[::-1])[:-1])
+    if hull.shape[0] < 3:
+        return hull
+    return numpy.concatenate((hull[:1], hull[:0:-1]))
+
+
+def _randomPoints(seed: int) -> numpy.ndarray:
+    """ Points rounded to 0.1 mm as the build plate hulls : duplicates and collinear points """
+    rng = numpy.random.default_rng(seed)
+    count = int(rng.integers(1, 400))
+    if seed % 3 == 0:
+        angles = rng.uniform(0, 2 * math.pi, count)
+        points = numpy.stack((numpy.cos(angles), numpy.sin(angles)), axis=1) * rng.uniform(1, 50)
+    elif seed % 3 == 1:
+        points = rng.normal(0, rng.uniform(0.1, 30), (count, 2))
+    else:
+        points = rng.integers(-3, 4, (count, 2)).astype(numpy.float64)
+    return numpy.round(points + rng.uniform(-100, 100, 2), 1)
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_hull_same_as_monotone_chain(seed):
+    points = _randomPoints(seed)
+    numpy.testing.assert_array_equal(TabHull.convexHull(points), referenceHull(points))
@@ -0,0 +1,44 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# The indexed tab meshes of TabCore.TabMesh describe the same triangles, with the same
+# orientation, as the triangle soup builders up to V1.1.5 (benchmarks/bench_tab_mesh).
+#--------------------------------------------------------------------------------------------
+
+import os
+import sys
+
+import numpy
+import pytest
+
+from conftest import PLUGIN_DIR
+
+from TabPlus.TabCore import TabMesh
+
+sys.path.insert(0, os.path.join(PLUGIN_DIR, "benchmarks"))
+
+from bench_tab_mesh import legacyCapsule, legacyPastille  # noqa: E402
+
+
+def _triangles(vertices: numpy.ndarray, indices: numpy.ndarray) -> list:
+    """ Triangles as a sorted list of rounded coordinates, every triangle starting on its smallest vertex """
+    triangles = []
+    for face in numpy.round(vertices[indices], 4).tolist():
+        start = face.index(min(face))
+        triangles.append(tuple(map(tuple, face[start:] + face[:start])))
+    return sorted(triangles)
+
+
+@pytest.mark.parametrize("nb", (10, 15, 30))
+@pytest.mark.parametrize("nb_layer", (1, 3))
+def test_capsule_same_as_triangle_soup(nb, nb_layer):
+    vertices, indices = legacyCapsule(10.0, nb, 2.5, 0.24, 0.48, nb_layer)
+    new_vertices, _, new_indices = TabMesh.capsuleMesh(10.0, int(360 / nb), 2.5, 0.24, 0.48, nb_layer)
+    assert _triangles(new_vertices, new_indices) == _triangles(vertices, indices)
+
+
+@pytest.mark.parametrize("nb", (10, 15, 30))
+def test_pastille_same_as_triangle_soup(nb):
+    vertices, indices = legacyPastille(6.0, nb, 2.5, 0.24)
+    new_vertices, _, new_indices = TabMesh.pastilleMesh(6.0, int(360 / nb), 2.5, 0.24)
+    assert _triangles(new_vertices, new_indices) == _triangles(vertices, indices)
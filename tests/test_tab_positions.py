@@ -0,0 +1,49 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# The tab positions selected by TabCore.TabPlacement are the positions of the loop of
+# addAutoSupportMesh up to V1.1.5 for one object.
+#--------------------------------------------------------------------------------------------
+
+import math
+
+import numpy
+import pytest
+
+from TabPlus.TabCore import TabPlacement
+
+
+def referencePositions(points: numpy.ndarray, size: float) -> numpy.ndarray:
+    """ Tab positions of the automatic addition up to V1.1.5 for one object """
+    positions = []
+    act_position = numpy.array([99999.99, 99999.99])
+    first_pt = points[0]
+    nb_pt = points.shape[0]
+    for nb_tab, new_position in enumerate(points, 1):
+        lght = numpy.linalg.norm(act_position - new_position)
+        if nb_tab == nb_pt:
+            lgfl = numpy.linalg.norm(first_pt - new_position)
+            if lght >= (size * 0.7) and lgfl >= (size * 0.7):
+                positions.append(new_position)
+                act_position = new_position
+        elif lght >= (size * 0.7):
+            positions.append(new_position)
+            act_position = new_position
+    return numpy.array(positions).reshape(-1, 2)
+
+
+def _outline(seed: int) -> numpy.ndarray:
+    """ Clockwise outline rounded to 0.1 mm as the build plate hulls : close and repeated points """
+    rng = numpy.random.default_rng(seed)
+    count = int(rng.integers(1, 400))
+    angles = numpy.sort(rng.uniform(0, 2 * math.pi, count))[::-1]
+    radius = rng.uniform(1, 50) * rng.uniform(0.8, 1.0, count)
+    points = numpy.stack((numpy.cos(angles), numpy.sin(angles)), axis=1) * radius[:, None]
+    return numpy.round(points + rng.uniform(-100, 100, 2), 1)
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("size", (3.0, 10.0))
+def test_tab_positions_same_as_loop(seed, size):
+    outline = _outline(seed)
+    numpy.testing.assert_array_equal(TabPlacement.selectTabPositions(outline, size * 0.7), referencePositions(outline, size))
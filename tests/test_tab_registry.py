@@ -0,0 +1,84 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# The tabs copied with their object (Multiply, copy / paste) are indexed by the registry :
+# Remove All removes them and the automatic addition does not add tabs on top of them.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+from copy import deepcopy
+
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+
+def _supportMeshes(root) -> list:
+    return [node for node in cura_stubs.DepthFirstIterator(root)
+            if node.callDecoration("getStack") and node.callDecoration("getStack").getProperty("support_mesh", "value")]
+
+
+@pytest.fixture
+def tool():
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    node = cura_stubs.CuraSceneNode(name = "Part")
+    node.addDecorator(cura_stubs.SliceableObjectDecorator())
+    node.setMeshData(cura_stubs.cylinder(8.0, 10.0, 32))
+    node.setParent(application.getController().getScene().getRoot())
+    return TabPlusModule.TabPlus()
+
+
+def _addAutoTabs(tool) -> None:
+    tool.addAutoSupportMesh()
+    cura_stubs.CuraApplication.getInstance().processEvents(wait = True)
+
+
+def _copyPart(root, x: float):
+    """ Copy of the first part with its tabs, as Multiply : deep copy added to the scene """
+    copy = deepcopy(root.getChildren()[0])
+    copy.setPosition(cura_stubs.Vector(x, 0, 0))
+    cura_stubs.AddSceneNodeOperation(copy, root).push()
+    return copy
+
+
+def test_remove_all_removes_copied_tabs(tool):
+    root = cura_stubs.CuraApplication.getInstance().getController().getScene().getRoot()
+    _addAutoTabs(tool)
+    nb_tabs = len(_supportMeshes(root))
+    assert nb_tabs > 0
+
+    copy = _copyPart(root, 40.0)
+    assert len(_supportMeshes(copy)) == nb_tabs
+    assert len(tool._registry.getTabs(copy)) == nb_tabs
+
+    # Remove Last : the tabs of the automatic addition, then Remove All : the copied tabs
+    tool.removeAllSupportMesh()
+    assert len(_supportMeshes(root)) == nb_tabs
+    tool.removeAllSupportMesh()
+    assert _supportMeshes(root) == []
+
+
+def test_copy_not_in_scene_is_skipped(tool):
+    root = cura_stubs.CuraApplication.getInstance().getController().getScene().getRoot()
+    _addAutoTabs(tool)
+    # Copy kept in the clipboard, not in the scene
+    clipboard = deepcopy(root.getChildren()[0])
+    tool.removeAllSupportMesh()
+    tool.removeAllSupportMesh()
+    assert len(_supportMeshes(clipboard)) > 0
+    assert tool._registry.getTabs() == []
+
+
+def test_auto_placement_skips_copied_tabs(tool):
+    root = cura_stubs.CuraApplication.getInstance().getController().getScene().getRoot()
+    _addAutoTabs(tool)
+    nb_tabs = len(_supportMeshes(root))
+    _copyPart(root, 40.0)
+
+    _addAutoTabs(tool)
+    assert len(_supportMeshes(root)) == 2 * nb_tabs
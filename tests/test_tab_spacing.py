@@ -0,0 +1,83 @@
+#--------------------------------------------------------------------------------------------
+# Copyright (c) 2022 5axes
+#--------------------------------------------------------------------------------------------
+# Spacing of the automatic tabs : TabSpatialIndex finds the same neighbours as a comparison
+# with every tab of the plate, and the automatic addition keeps the tabs of two objects
+# apart.
+# The tool runs against the stand-ins of benchmarks/cura_stubs.
+#--------------------------------------------------------------------------------------------
+
+import itertools
+import math
+
+import numpy
+import pytest
+
+from conftest import importTool
+
+TabPlusModule = importTool()
+
+import cura_stubs  # noqa: E402
+
+from TabPlus.TabCore.TabPlacement import TabSpatialIndex  # noqa: E402
+
+
+def referenceFilter(tabs: numpy.ndarray, positions: numpy.ndarray, distance: float) -> numpy.ndarray:
+    """ Positions kept by a comparison with all the tabs and with the positions already kept """
+    kept = list(tabs)
+    result = []
+    for position in positions:
+        if all(math.hypot(*(position - tab)) >= distance for tab in kept):
+            kept.append(position)
+            result.append(position)
+    return numpy.array(result).reshape(-1, 2)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_filter_same_as_all_pairs(seed):
+    rng = numpy.random.default_rng(seed)
+    distance = float(rng.uniform(0.5, 10))
+    # Coordinates on the cell borders and around 0 (negative cells)
+    tabs = numpy.round(rng.uniform(-40, 40, (int(rng.integers(0, 60)), 2)) / distance) * distance
+    positions = numpy.round(rng.uniform(-40, 40, (int(rng.integers(1, 200)), 2)), 1)
+
+    index = TabSpatialIndex(distance)
+    for x, z in tabs:
+        index.insert(x, z)
+    assert len(index) == len(tabs)
+    kept = index.filterPositions(positions)
+    numpy.testing.assert_array_equal(kept, referenceFilter(tabs, positions, distance))
+    assert len(index) == len(tabs) + len(kept)
+
+
+def test_neighbour_at_the_distance():
+    index = TabSpatialIndex(5.0)
+    index.insert(0.0, 0.0)
+    assert index.hasNeighbour(4.9, 0.0)
+    assert index.hasNeighbour(-3.0, -3.0)
+    # Closer than the distance only
+    assert not index.hasNeighbour(5.0, 0.0)
+    assert not index.hasNeighbour(0.0, -7.0)
+    assert not TabSpatialIndex(0.0).hasNeighbour(0.0, 0.0)
+
+
+def test_auto_tabs_spaced_between_objects():
+    application = cura_stubs.CuraApplication.reset()
+    cura_stubs.Selection.clear()
+    root = application.getController().getScene().getRoot()
+    # Two objects 1 mm apart : their hull positions face each other
+    for x in (-8.5, 8.5):
+        node = cura_stubs.CuraSceneNode(name = "Part")
+        node.addDecorator(cura_stubs.SliceableObjectDecorator())
+        node.setMeshData(cura_stubs.cylinder(8.0, 10.0, 32))
+        node.setPosition(cura_stubs.Vector(x, 0, 0))
+        node.setParent(root)
+    tool = TabPlusModule.TabPlus()
+    tool.addAutoSupportMesh()
+    application.processEvents(wait = True)
+
+    centres = [centre for node in tool._registry.getTabs() for centre in tool._getTabCentres(node)]
+    assert min(x for x, z in centres) < 0 < max(x for x, z in centres)
+    distance = tool._UseSize * 0.7
+    for a, b in itertools.combinations(centres, 2):
+        assert math.hypot(a[0] - b[0], a[1] - b[1]) >= distance